@@ -0,0 +1,85 @@
+"""Compare the sync and async database paths of the task router under concurrent load.
+
+Seeds a temporary SQLite file, then drives the app in-process through httpx with
+CONCURRENCY concurrent clients, once per path, and prints throughput and latency
+percentiles as JSON.
+
+Usage (from the api folder):
+    python -m benchmarks.db_paths --tasks 10000 --requests 2000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import tempfile
+
+from benchmarks.load import SendRequest, drive
+
+
+def _read_mostly(task_ids: list[int]) -> SendRequest:
+    """Build a read-mostly request mix: creates, lists and gets of seeded tasks."""
+
+    async def send(client, i: int):
+        if i % 10 == 0:
+            return await client.post("/tasks/", json={"title": f"Bench {i}"})
+        if i % 2 == 0:
+            return await client.get("/tasks/?limit=20")
+        return await client.get(f"/tasks/{random.choice(task_ids)}")
+
+    return send
+
+
+async def _dispose_async_engines() -> None:
+    """Close the aiosqlite engines, whose worker threads keep the process alive."""
+    from db import engine as db_engine  # pylint: disable=import-outside-toplevel
+
+    writer, reader = db_engine.get_async_engine(), db_engine.get_async_read_engine()
+    await writer.dispose()
+    if reader is not writer:
+        await reader.dispose()
+
+
+def main() -> None:
+    """Seed a temporary database and benchmark both database paths."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        # pylint: disable=import-outside-toplevel
+        from sqlmodel import Session
+
+        from crud.bulk import create_tasks
+        from db import engine as db_engine
+        from db import session as db_session
+        from db.migrations import run_migrations
+        from main import app
+        from schemas.task import TaskCreate
+
+        with db_engine.get_engine().begin() as connection:
+            run_migrations(connection)
+        with Session(db_engine.get_engine()) as session:
+            tasks, _ = create_tasks(
+                session, [TaskCreate(title=f"Task {i}") for i in range(args.tasks)]
+            )
+            task_ids = [task.id for task in tasks]
+
+        results = {}
+        for path, is_async in (("sync", False), ("async", True)):
+            db_session.DATABASE_ASYNC = is_async
+            results[path] = asyncio.run(
+                drive(app, _read_mostly(task_ids), args.requests, args.concurrency)
+            )
+        asyncio.run(_dispose_async_engines())
+        print(json.dumps({"params": vars(args), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Measure the CPU time to build one task list page, before and after the fast path.
+
+before: ORM objects, item.model_dump() then TaskRead.model_validate(), then the
+        response model is validated and dumped again and encoded with json.
+after:  column rows from crud.get_tasks, plain dicts encoded with orjson.
+
+Usage (from the api folder):
+    python -m benchmarks.list_serialization --iterations 500
+"""
+
+import argparse
+import json
+import time
+
+import orjson
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from crud.task import get_tasks
+from models.task import Priority, Task
+from schemas.task import TaskListResponse, TaskRead, task_row_payload
+
+PAGE_SIZES = (10, 20, 50, 100)
+
+
+def _before(session: Session, limit: int) -> bytes:
+    """Build a page the way list_tasks did before the fast path."""
+    items = session.exec(
+        select(Task).order_by(Task.priority.desc(), Task.id.desc()).limit(limit)
+    ).all()
+    response = TaskListResponse(
+        items=[TaskRead.model_validate(item.model_dump()) for item in items],
+        total=1000,
+        page=1,
+        page_size=limit,
+    )
+    # FastAPI validates the returned model against response_model, then dumps it
+    validated = TaskListResponse.model_validate(response.model_dump())
+    return json.dumps(validated.model_dump(mode="json")).encode()
+
+
+def _after(session: Session, limit: int) -> bytes:
+    """Build a page with the fast path of list_tasks."""
+    items, _, next_cursor = get_tasks(session, limit=limit, include_total=False)
+    return orjson.dumps(  # pylint: disable=no-member
+        {
+            "items": [task_row_payload(row) for row in items],
+            "total": 1000,
+            "page": 1,
+            "page_size": limit,
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+def _cpu_time_per_page(build, session: Session, limit: int, iterations: int) -> float:
+    """Return the mean CPU time of build(session, limit), in microseconds."""
+    build(session, limit)
+    started = time.process_time()
+    for _ in range(iterations):
+        build(session, limit)
+    return (time.process_time() - started) / iterations * 1_000_000
+
+
+def main() -> None:
+    """Seed an in-memory database and time both paths for each page size."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(
+            Task(title=f"Task {i}", description="x" * 80, priority=Priority(1 + i % 3))
+            for i in range(1000)
+        )
+        session.commit()
+        results = {}
+        for limit in PAGE_SIZES:
+            before = _cpu_time_per_page(_before, session, limit, args.iterations)
+            after = _cpu_time_per_page(_after, session, limit, args.iterations)
+            results[limit] = {
+                "before_us": round(before, 1),
+                "after_us": round(after, 1),
+                "speedup": round(before / after, 2),
+            }
+    print(json.dumps({"params": vars(args), "page_cpu_time": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
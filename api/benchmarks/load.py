@@ -0,0 +1,52 @@
+"""Concurrent load helpers shared by the database path benchmarks.
+
+drive() runs a request mix against the app in-process, through httpx's ASGI transport,
+from concurrent clients, and returns the throughput and latency percentiles.
+"""
+
+import asyncio
+import statistics
+import time
+from typing import Any, Awaitable, Callable
+
+# send(client, i) sends the i-th request of the mix and returns its response
+SendRequest = Callable[[Any, int], Awaitable[Any]]
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Return the pct percentile of samples, in milliseconds."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1000
+
+
+async def drive(app, send: SendRequest, requests: int, concurrency: int) -> dict:
+    """Send requests from concurrent clients with send and measure their latencies."""
+    import httpx  # pylint: disable=import-outside-toplevel
+
+    latencies: list[float] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(i)
+    transport = httpx.ASGITransport(app=app)
+
+    async def worker(client):
+        while not queue.empty():
+            i = queue.get_nowait()
+            started = time.perf_counter()
+            resp = await send(client, i)
+            latencies.append(time.perf_counter() - started)
+            assert resp.status_code < 300, resp.text
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+    }
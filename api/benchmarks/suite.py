@@ -0,0 +1,376 @@
+"""Benchmark suite: latency and throughput of every task endpoint by table size.
+
+For each table size, a temporary SQLite file is seeded with that many tasks, then each
+scenario sends REQUESTS requests from CONCURRENCY concurrent clients and records the
+p50/p99/mean latency and the throughput. Scenarios cover the list (shallow pages, deep
+offset pages and deep cursor pages, for each sort field), get, create (LOW and HIGH),
+update and delete. They run in-process (httpx over ASGI, no network) and/or against a
+local uvicorn server started on the seeded file.
+
+Sizes are seeded incrementally in one file, smallest first, so 1M tasks cost one seed.
+Results are printed (or written to --output) as JSON, with the git commit, to compare
+runs across commits.
+
+Usage (from the api folder):
+    python -m benchmarks.suite --sizes 10000,100000,1000000 --requests 500 \\
+        --concurrency 16 --mode both --output bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+SORT_FIELDS = ("priority", "created_at", "updated_at", "title", "id")
+SEED_BATCH_SIZE = 50_000
+PAGE_SIZE = 20
+
+# A scenario builds the (method, url, json body) of its i-th request
+RequestFactory = Callable[[int], tuple[str, str, Optional[dict]]]
+
+
+def _summarize(latencies: list[float], elapsed: float, errors: int) -> dict:
+    """Return the throughput and latency percentiles (in milliseconds) of a scenario."""
+    ordered = sorted(latencies)
+
+    def percentile(pct: float) -> float:
+        return round(
+            ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1000, 3
+        )
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": percentile(50),
+        "p99_ms": percentile(99),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 3),
+    }
+
+
+async def _run_scenario(
+    client,
+    make_request: RequestFactory,
+    expected: set[int],
+    requests: int,
+    concurrency: int,
+) -> dict:
+    """Send the requests of a scenario from concurrent clients and measure them."""
+    latencies: list[float] = []
+    errors = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(i)
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            method, url, body = make_request(queue.get_nowait())
+            started = time.perf_counter()
+            resp = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - started)
+            errors += resp.status_code not in expected
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return _summarize(latencies, time.perf_counter() - started, errors)
+
+
+def _scenarios(size: int, requests: int, deep_cursors: dict[str, str]) -> dict:
+    """Build the scenarios for a table of size tasks: name -> (requests, statuses).
+
+    Deletes take the last seeded ids; gets and updates pick from the other ones.
+    """
+    live_ids = range(1, size - requests + 1)
+    deleted_ids = range(size - requests + 1, size + 1)
+    deep_offset = max(0, size - 2 * PAGE_SIZE)
+    scenarios: dict[str, tuple[RequestFactory, set[int]]] = {}
+    for sort_by in SORT_FIELDS:
+        base = f"/tasks/?sort_by={sort_by}&limit={PAGE_SIZE}"
+        scenarios[f"list_shallow_{sort_by}"] = (
+            lambda i, b=base: ("GET", b, None),
+            {200},
+        )
+        scenarios[f"list_deep_offset_{sort_by}"] = (
+            lambda i, b=base: ("GET", f"{b}&offset={deep_offset}", None),
+            {200},
+        )
+        scenarios[f"list_deep_cursor_{sort_by}"] = (
+            lambda i, b=base, c=deep_cursors[sort_by]: ("GET", f"{b}&cursor={c}", None),
+            {200},
+        )
+    scenarios["get"] = (
+        lambda i: ("GET", f"/tasks/{random.choice(live_ids)}", None),
+        {200},
+    )
+    scenarios["create"] = (
+        lambda i: ("POST", "/tasks/", {"title": f"Bench {i}"}),
+        {201},
+    )
+    # Past the high priority limit this measures the rejected path (flush, count, rollback)
+    scenarios["create_high"] = (
+        lambda i: ("POST", "/tasks/", {"title": f"High {i}", "priority": 3}),
+        {201, 400},
+    )
+    scenarios["update"] = (
+        lambda i: (
+            "PATCH",
+            f"/tasks/{random.choice(live_ids)}",
+            {"title": f"Edit {i}"},
+        ),
+        {200},
+    )
+    scenarios["delete"] = (
+        lambda i: ("DELETE", f"/tasks/{deleted_ids[i]}", None),
+        {204},
+    )
+    return scenarios
+
+
+def _seed(start: int, stop: int) -> None:
+    """Insert tasks start+1..stop, with mixed priorities (no HIGH) and deadlines."""
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import insert
+
+    from db.engine import get_engine
+    from models.task import Task
+
+    now = datetime.now(timezone.utc)
+    with get_engine().begin() as connection:
+        for batch_start in range(start, stop, SEED_BATCH_SIZE):
+            rows = []
+            for i in range(batch_start, min(stop, batch_start + SEED_BATCH_SIZE)):
+                created = now - timedelta(minutes=stop - i)
+                verb = random.choice(("buy", "call", "fix"))
+                rows.append(
+                    {
+                        "id": i + 1,
+                        "title": f"Task {i:07d} {verb}",
+                        "description": f"Seeded task {i}",
+                        "priority": 1 + i % 2,
+                        "created_at": created,
+                        "updated_at": created,
+                        "deadline": created if i % 3 == 0 else None,
+                    }
+                )
+            connection.execute(insert(Task), rows)
+
+
+def _deep_cursors(size: int) -> dict[str, str]:
+    """Return, for each sort field, the cursor of a page near the end of the list."""
+    # pylint: disable=import-outside-toplevel
+    from sqlmodel import Session
+
+    from crud.task import get_tasks
+    from db.engine import get_engine
+
+    cursors = {}
+    with Session(get_engine()) as session:
+        for sort_by in SORT_FIELDS:
+            _, _, cursor = get_tasks(
+                session,
+                limit=PAGE_SIZE,
+                offset=max(0, size - 3 * PAGE_SIZE),
+                sort_by=sort_by,
+                include_total=False,
+            )
+            cursors[sort_by] = cursor
+    return cursors
+
+
+def _reset_caches() -> None:
+    """Forget the in-process state derived from the task table after a raw seed."""
+    # pylint: disable=import-outside-toplevel
+    from crud.cache import invalidate_task_cache
+    from crud.counts import invalidate_total_count
+
+    invalidate_total_count()
+    invalidate_task_cache()
+
+
+def _free_port() -> int:
+    """Return a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_uvicorn(database_url: str) -> tuple[subprocess.Popen, str]:
+    """Start the app under uvicorn on database_url, and wait until it answers."""
+    import httpx  # pylint: disable=import-outside-toplevel
+
+    port = _free_port()
+    process = subprocess.Popen(  # pylint: disable=consider-using-with
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env={**os.environ, "DATABASE_URL": database_url},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/").status_code == 200:
+                return process, base_url
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("uvicorn did not start within 30 seconds")
+
+
+async def _run_all(client, scenarios: dict, requests: int, concurrency: int) -> dict:
+    """Run every scenario with the given client."""
+    results = {}
+    for name, (make_request, expected) in scenarios.items():
+        results[name] = await _run_scenario(
+            client, make_request, expected, requests, concurrency
+        )
+        logging.info("%s: %s", name, results[name])
+    return results
+
+
+async def _run_in_process(scenarios: dict, requests: int, concurrency: int) -> dict:
+    """Run the scenarios against the app in-process, through httpx's ASGI transport."""
+    # pylint: disable=import-outside-toplevel
+    import httpx
+
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        return await _run_all(client, scenarios, requests, concurrency)
+
+
+async def _run_uvicorn(
+    base_url: str, scenarios: dict, requests: int, concurrency: int
+) -> dict:
+    """Run the scenarios against a uvicorn server over local HTTP."""
+    import httpx  # pylint: disable=import-outside-toplevel
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60
+    ) as client:
+        return await _run_all(client, scenarios, requests, concurrency)
+
+
+def _git_commit() -> Optional[str]:
+    """Return the current git commit, if run from a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _restore(size: int, requests: int) -> None:
+    """Bring the table back to the seeded tasks 1..size after a run.
+
+    Drops the tasks created by the scenarios and re-seeds the ones they deleted.
+    """
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import text
+
+    from db.engine import get_engine
+
+    start = size - requests
+    with get_engine().begin() as connection:
+        connection.execute(text("DELETE FROM task WHERE id > :start"), {"start": start})
+    _seed(start, size)
+
+
+def main() -> None:
+    """Seed each table size and run every scenario on it, then print the results."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--mode", choices=("in-process", "uvicorn", "both"), default="both"
+    )
+    parser.add_argument("--output", help="Write the JSON results to this file.")
+    args = parser.parse_args()
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    if sizes[0] <= 2 * args.requests:
+        parser.error("every size must be larger than twice the number of requests")
+    modes = ("in-process", "uvicorn") if args.mode == "both" else (args.mode,)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    results: dict = {mode: {} for mode in modes}
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{tmp}/bench.db"
+        os.environ["DATABASE_URL"] = database_url
+        # pylint: disable=import-outside-toplevel
+        from db.engine import get_engine
+        from db.migrations import run_migrations
+
+        with get_engine().begin() as connection:
+            run_migrations(connection)
+        seeded = 0
+        for size in sizes:
+            _seed(seeded, size)
+            seeded = size
+            logging.info("Seeded %s tasks", size)
+            for mode in modes:
+                _reset_caches()
+                scenarios = _scenarios(size, args.requests, _deep_cursors(size))
+                logging.info("Running %s scenarios on %s tasks", mode, size)
+                if mode == "in-process":
+                    results[mode][size] = asyncio.run(
+                        _run_in_process(scenarios, args.requests, args.concurrency)
+                    )
+                else:
+                    process, base_url = _start_uvicorn(database_url)
+                    try:
+                        results[mode][size] = asyncio.run(
+                            _run_uvicorn(
+                                base_url, scenarios, args.requests, args.concurrency
+                            )
+                        )
+                    finally:
+                        process.terminate()
+                        process.wait()
+                _restore(size, args.requests)
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "params": vars(args),
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
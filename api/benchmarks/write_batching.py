@@ -0,0 +1,108 @@
+"""Compare one commit per request with group commit (WRITE_BATCHING) under write load.
+
+Seeds a temporary SQLite file, then drives the app in-process through httpx with
+CONCURRENCY concurrent clients sending a write mix (creates, updates, deletes), once
+with one commit per request and once per batching window, and prints throughput and
+latency percentiles as JSON. SQLITE_SYNCHRONOUS=FULL makes every commit fsync, which
+is where group commit helps most.
+
+Usage (from the api folder):
+    SQLITE_SYNCHRONOUS=FULL python -m benchmarks.write_batching --requests 3000 \\
+        --concurrency 32 --windows 0,2,5
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import tempfile
+
+from benchmarks.load import SendRequest, drive
+
+
+def _write_mix(task_ids: list[int]) -> SendRequest:
+    """Build a write mix from the seeded task_ids.
+
+    Half the requests create a task, 3 in 10 update a random seeded task and 1 in 5
+    delete a seeded task (each one once), from the end of task_ids.
+    """
+    live_ids = task_ids[: len(task_ids) // 2]
+    deleted_ids = iter(task_ids[len(task_ids) // 2 :])
+
+    async def send(client, i: int):
+        if i % 10 < 5:
+            return await client.post("/tasks/", json={"title": f"Bench {i}"})
+        if i % 10 < 8:
+            task_id = random.choice(live_ids)
+            return await client.patch(f"/tasks/{task_id}", json={"title": f"E{i}"})
+        return await client.delete(f"/tasks/{next(deleted_ids)}")
+
+    return send
+
+
+def main() -> None:
+    """Seed a temporary database and benchmark each commit mode on it."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--windows", default="0,2", help="Batching windows to try, in milliseconds."
+    )
+    parser.add_argument("--max-size", type=int, default=64)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+        # Writers waiting for the lock would flood the slow query log
+        os.environ.setdefault("SLOW_QUERY_THRESHOLD_MS", "-1")
+        # pylint: disable=import-outside-toplevel
+        from sqlmodel import Session
+
+        from crud import group_commit
+        from crud.bulk import create_tasks
+        from db import engine as db_engine
+        from db.migrations import run_migrations
+        from db.session import get_session_factory
+        from main import app
+        from schemas.task import TaskCreate
+
+        with db_engine.get_engine().begin() as connection:
+            run_migrations(connection)
+
+        results = {}
+        modes = [("per_request", None)] + [
+            (f"batched_{window}ms", float(window)) for window in args.windows.split(",")
+        ]
+        for mode, window in modes:
+            # Fresh rows to update and delete for every mode
+            with Session(db_engine.get_engine()) as session:
+                tasks, _ = create_tasks(
+                    session,
+                    [TaskCreate(title=f"Task {i}") for i in range(args.requests)],
+                )
+                task_ids = [task.id for task in tasks]
+            if window is not None:
+                group_commit.start_write_batcher(
+                    get_session_factory(), window_ms=window, max_size=args.max_size
+                )
+            try:
+                results[mode] = asyncio.run(
+                    drive(app, _write_mix(task_ids), args.requests, args.concurrency)
+                )
+                batcher = group_commit.get_write_batcher()
+                if batcher is not None:
+                    results[mode]["batches"] = batcher.batches
+            finally:
+                group_commit.stop_write_batcher()
+            logging.info("%s: %s", mode, results[mode])
+        params = {**vars(args), "synchronous": db_engine.SQLITE_SYNCHRONOUS}
+        print(json.dumps({"params": params, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
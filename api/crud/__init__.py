@@ -0,0 +1,8 @@
+"""CRUD layer of the Spirited Todo List API.
+
+Importing the package registers the commit listeners that keep state derived from the
+task table (cached total count, task cache, table version) in sync with the committed
+writes, and that publish them to the change feed.
+"""
+
+from crud import cache, counts, events, versions
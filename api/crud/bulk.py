@@ -0,0 +1,219 @@
+"""Bulk CRUD operations for Task model in the Spirited Todo List API.
+
+Each bulk operation runs in a single transaction with executemany-style statements, and
+checks the high priority limits of the task lists once for the whole batch. Items that
+cannot be applied are reported as per-item errors; the other items are still applied.
+"""
+
+import os
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import delete, insert, text, update
+from sqlmodel import Session, select
+
+from crud.changes import ChangeKind, record_change
+from crud.task import (
+    HIGH_PRIORITY_LIMIT_MESSAGE,
+    MAX_HIGH_PRIORITY_TASK,
+    count_high_priority_tasks_by_list,
+    lock_for_write,
+)
+from models.error import ErrorCode
+from models.task import Priority, Task
+from schemas.task import BulkItemError, TaskBulkUpdate, TaskCreate
+
+MAX_BULK_ITEMS = int(os.getenv("MAX_BULK_ITEMS", "10000"))
+
+
+def _high_priority_slots(session: Session, list_ids: set[str]) -> dict[str, int]:
+    """Return how many more HIGH tasks each of the given task lists allows.
+
+    The database must be locked for writing (see lock_for_write), so that the counts
+    hold until the commit.
+    """
+    counts = count_high_priority_tasks_by_list(session, list_ids)
+    return {
+        list_id: MAX_HIGH_PRIORITY_TASK - counts.get(list_id, 0) for list_id in list_ids
+    }
+
+
+def _limit_error(index: int, task_id: Optional[int] = None) -> BulkItemError:
+    """Build the error of an item rejected by the high priority limit."""
+    return BulkItemError(
+        index=index,
+        id=task_id,
+        msg=HIGH_PRIORITY_LIMIT_MESSAGE,
+        error_code=ErrorCode.HIGH_PRIORITY_LIMIT,
+    )
+
+
+def _reload(session: Session, task_ids: list[int]) -> list[Task]:
+    """Load the given tasks with one query, in the given order."""
+    if not task_ids:
+        return []
+    tasks = session.exec(select(Task).where(Task.id.in_(task_ids))).all()
+    by_id = {task.id: task for task in tasks}
+    return [by_id[task_id] for task_id in task_ids]
+
+
+def insert_tasks(
+    session: Session, tasks_in: list[TaskCreate]
+) -> tuple[list[int], list[BulkItemError]]:
+    """Insert tasks in one transaction, and return the new task IDs and per-item errors.
+
+    HIGH tasks are accepted in order while the limit of their list allows it.
+    """
+    high_lists = {
+        task_in.list_id for task_in in tasks_in if task_in.priority == Priority.HIGH
+    }
+    if high_lists:
+        lock_for_write(session)
+    slots = _high_priority_slots(session, high_lists)
+    rows, errors = [], []
+    for index, task_in in enumerate(tasks_in):
+        if task_in.priority == Priority.HIGH:
+            if slots[task_in.list_id] <= 0:
+                errors.append(_limit_error(index))
+                continue
+            slots[task_in.list_id] -= 1
+        rows.append(Task(**task_in.model_dump()).model_dump(exclude={"id"}))
+    if not rows:
+        session.rollback()
+        return [], errors
+    # One executemany INSERT: an ordered RETURNING would run one INSERT per row. The
+    # first row takes the write lock and each row gets max(id) + 1, so the new IDs are
+    # the len(rows) IDs up to the last inserted one.
+    session.exec(insert(Task), params=rows)
+    last_id = session.scalar(text("SELECT last_insert_rowid()"))
+    task_ids = list(range(last_id - len(rows) + 1, last_id + 1))
+    for task_id in task_ids:
+        record_change(session, ChangeKind.CREATED, task_id)
+    session.commit()
+    return task_ids, errors
+
+
+def create_tasks(
+    session: Session, tasks_in: list[TaskCreate]
+) -> tuple[list[Task], list[BulkItemError]]:
+    """Create tasks in one transaction, and return the created tasks and per-item errors.
+
+    HIGH tasks are accepted in request order while the limit of their list allows it.
+    """
+    task_ids, errors = insert_tasks(session, tasks_in)
+    return _reload(session, task_ids), errors
+
+
+def update_tasks(
+    session: Session, tasks_in: list[TaskBulkUpdate]
+) -> tuple[list[Task], list[BulkItemError]]:
+    """Update tasks in one transaction, and return the updated tasks and per-item errors.
+
+    Demotions from HIGH in the batch free their slot for promotions to HIGH in the same
+    task list, which are then accepted in request order while the limit allows it.
+    """
+    has_high = any(task_in.priority == Priority.HIGH for task_in in tasks_in)
+    if has_high:
+        lock_for_write(session)
+    requested_ids = {task_in.id for task_in in tasks_in}
+    current = {
+        task_id: (priority, list_id)
+        for task_id, priority, list_id in session.exec(
+            select(Task.id, Task.priority, Task.list_id).where(
+                Task.id.in_(requested_ids)
+            )
+        ).all()
+    }
+    priorities = {task_id: priority for task_id, (priority, _) in current.items()}
+    lists = {task_id: list_id for task_id, (_, list_id) in current.items()}
+    errors, valid, seen = [], [], set()
+    for index, task_in in enumerate(tasks_in):
+        if task_in.id not in priorities:
+            errors.append(
+                BulkItemError(
+                    index=index,
+                    id=task_in.id,
+                    msg="Task not found",
+                    error_code=ErrorCode.TASK_NOT_FOUND,
+                )
+            )
+            continue
+        if task_in.id in seen:
+            errors.append(
+                BulkItemError(
+                    index=index,
+                    id=task_in.id,
+                    msg="Task appears more than once in the batch.",
+                    error_code=ErrorCode.INVALID_INPUT,
+                )
+            )
+            continue
+        seen.add(task_in.id)
+        valid.append((index, task_in, task_in.model_dump(exclude_unset=True)))
+    slots = _high_priority_slots(
+        session,
+        {
+            lists[task_in.id]
+            for _, task_in, data in valid
+            if data.get("priority") == Priority.HIGH
+        },
+    )
+    for _, task_in, data in valid:
+        is_demoted = (
+            priorities[task_in.id] == Priority.HIGH
+            and "priority" in data
+            and data["priority"] != Priority.HIGH
+        )
+        if is_demoted and lists[task_in.id] in slots:
+            slots[lists[task_in.id]] += 1
+    now = datetime.now(timezone.utc)
+    rows = []
+    for index, task_in, data in valid:
+        is_promoted = (
+            data.get("priority") == Priority.HIGH
+            and priorities[task_in.id] != Priority.HIGH
+        )
+        if is_promoted:
+            if slots[lists[task_in.id]] <= 0:
+                errors.append(_limit_error(index, task_in.id))
+                continue
+            slots[lists[task_in.id]] -= 1
+        rows.append({**data, "id": task_in.id, "updated_at": now})
+    errors.sort(key=lambda error: error.index)
+    if not rows:
+        session.rollback()
+        return [], errors
+    session.exec(update(Task), params=rows)
+    task_ids = [row["id"] for row in rows]
+    for task_id in task_ids:
+        record_change(session, ChangeKind.UPDATED, task_id)
+    session.commit()
+    return _reload(session, task_ids), errors
+
+
+def delete_tasks(
+    session: Session, task_ids: list[int]
+) -> tuple[list[int], list[BulkItemError]]:
+    """Delete tasks in one transaction, and return the deleted IDs and per-item errors."""
+    existing = set(session.exec(select(Task.id).where(Task.id.in_(task_ids))).all())
+    deleted_ids, errors = [], []
+    for index, task_id in enumerate(task_ids):
+        if task_id not in existing:
+            errors.append(
+                BulkItemError(
+                    index=index,
+                    id=task_id,
+                    msg="Task not found",
+                    error_code=ErrorCode.TASK_NOT_FOUND,
+                )
+            )
+            continue
+        existing.discard(task_id)
+        deleted_ids.append(task_id)
+    if not deleted_ids:
+        return [], errors
+    session.exec(delete(Task).where(Task.id.in_(deleted_ids)))
+    for task_id in deleted_ids:
+        record_change(session, ChangeKind.DELETED, task_id)
+    session.commit()
+    return deleted_ids, errors
@@ -0,0 +1,185 @@
+"""Read cache of single tasks for the Spirited Todo List API.
+
+Each GET /tasks/{id} opens a new session, so the identity map never serves a task twice.
+The TaskRead payloads of read tasks are kept in a bounded LRU cache with a TTL, keyed by
+task id. Entries are dropped when a transaction that changed the task commits.
+
+The cache lives behind the CacheBackend protocol. The default backend is in-process:
+with several workers each one has its own cache, and TASK_CACHE_TTL seconds bounds how
+stale it can get from writes committed by another worker. set_cache_backend() installs
+a shared backend instead; it receives JSON-compatible dicts and must return them as is.
+Payloads hold JSON values only (datetimes as ISO strings, priorities as ints), so a
+backend may store them as JSON: they are served as they come back.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Iterable, NamedTuple, Optional, Protocol
+
+from sqlmodel import Session
+
+from crud.changes import TaskChange, add_change_listener, commit_generation
+from models.task import Task
+from schemas.task import TASK_READ_FIELDS
+
+TASK_CACHE_SIZE = int(os.getenv("TASK_CACHE_SIZE", "1024"))
+TASK_CACHE_TTL = float(os.getenv("TASK_CACHE_TTL", "30"))
+
+TaskPayload = dict[str, Any]
+
+
+class CacheStats(NamedTuple):
+    """Counters of a task cache backend."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+class CacheBackend(Protocol):
+    """Storage of task payloads keyed by task id."""
+
+    def get(self, task_id: int) -> Optional[TaskPayload]:
+        """Return the cached payload of a task, or None."""
+
+    def set(self, task_id: int, payload: TaskPayload) -> None:
+        """Cache the payload of a task."""
+
+    def delete(self, task_ids: Iterable[int]) -> None:
+        """Drop the payloads of the given tasks."""
+
+    def clear(self) -> None:
+        """Drop every payload."""
+
+    def stats(self) -> CacheStats:
+        """Return the hit, miss and eviction counters and the number of entries."""
+
+
+class LRUCache:
+    """In-process CacheBackend: least recently used entries are evicted past max_size.
+
+    Entries older than ttl seconds count as misses. A max_size of 0 disables caching.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[int, tuple[float, TaskPayload]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = 0
+
+    def get(self, task_id: int) -> Optional[TaskPayload]:
+        """Return the cached payload of a task, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is None or time.monotonic() - entry[0] >= self.ttl:
+                if entry is not None:
+                    del self._entries[task_id]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(task_id)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, task_id: int, payload: TaskPayload) -> None:
+        """Cache the payload of a task, evicting the least recently used entries."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[task_id] = (time.monotonic(), payload)
+            self._entries.move_to_end(task_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def delete(self, task_ids: Iterable[int]) -> None:
+        """Drop the payloads of the given tasks."""
+        with self._lock:
+            for task_id in task_ids:
+                self._entries.pop(task_id, None)
+
+    def clear(self) -> None:
+        """Drop every payload. The counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """Return the hit, miss and eviction counters and the number of entries."""
+        with self._lock:
+            return CacheStats(
+                self._hits, self._misses, self._evictions, len(self._entries)
+            )
+
+
+_backend: CacheBackend = LRUCache(TASK_CACHE_SIZE, TASK_CACHE_TTL)
+_lock = threading.Lock()
+
+
+def get_cache_backend() -> CacheBackend:
+    """Return the backend of the task cache."""
+    return _backend
+
+
+def set_cache_backend(backend: CacheBackend) -> None:
+    """Replace the backend of the task cache, e.g. with one shared by every worker."""
+    global _backend  # pylint: disable=global-statement
+    _backend = backend
+
+
+def invalidate_task_cache() -> None:
+    """Forget every cached task, e.g. after rows were written outside of crud."""
+    _backend.clear()
+
+
+def get_cached_task(task_id: int) -> Optional[TaskPayload]:
+    """Return the cached TaskRead payload of a task, without touching the database."""
+    return _backend.get(task_id)
+
+
+def _json_value(value: Any) -> Any:
+    """Convert a task field value to its JSON value, as served in the response."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, int):
+        return int(value)
+    return value
+
+
+def load_task_payload(session: Session, task_id: int) -> Optional[TaskPayload]:
+    """Load the TaskRead payload of a task from the database and cache it.
+
+    A task loaded while a commit that changed tasks was in flight is returned but not
+    cached: the commit may have invalidated the entry before the stale row got stored.
+    """
+    generation, is_commit_in_flight = commit_generation()
+    task = session.get(Task, task_id)
+    if task is None:
+        return None
+    payload = {field: _json_value(getattr(task, field)) for field in TASK_READ_FIELDS}
+    # Checked and stored under the lock of _apply_changes, so a commit that starts after
+    # the check drops the entry after it is stored
+    with _lock:
+        if not is_commit_in_flight and commit_generation() == (generation, False):
+            _backend.set(task_id, payload)
+    return payload
+
+
+def get_task_payload(session: Session, task_id: int) -> Optional[TaskPayload]:
+    """Return the TaskRead payload of a task, from the cache when possible."""
+    payload = get_cached_task(task_id)
+    if payload is None:
+        payload = load_task_payload(session, task_id)
+    return payload
+
+
+def _apply_changes(changes: list[TaskChange]) -> None:
+    """Drop the cached tasks changed by a committed transaction."""
+    with _lock:
+        _backend.delete({change.task_id for change in changes})
+
+
+add_change_listener(_apply_changes)
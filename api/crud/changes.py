@@ -0,0 +1,120 @@
+"""Post-commit change notifications for the Spirited Todo List API.
+
+The write paths in crud record what they changed on the session. The changes are handed
+to the registered listeners only once the transaction commits, and dropped if it rolls
+back, so in-process state derived from the task table (caches, counters) never sees a
+write that did not happen.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from enum import Enum
+from typing import Callable, Iterator, NamedTuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "task_changes"
+_COMMITTING_KEY = "task_changes_committing"
+
+
+class ChangeKind(str, Enum):
+    """Kinds of change made to a task."""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
+class TaskChange(NamedTuple):
+    """A committed change to one task."""
+
+    kind: ChangeKind
+    task_id: int
+
+
+ChangeListener = Callable[[list[TaskChange]], None]
+
+_listeners: list[ChangeListener] = []
+_lock = threading.Lock()
+_generation = 0
+_commits_in_flight = 0
+
+
+def add_change_listener(listener: ChangeListener) -> None:
+    """Register a function called with the list of changes of every committed transaction."""
+    _listeners.append(listener)
+
+
+def record_change(session: Session, kind: ChangeKind, task_id: int) -> None:
+    """Record a change made in the session's current transaction."""
+    session.info.setdefault(_PENDING_KEY, []).append(TaskChange(kind, task_id))
+
+
+@contextmanager
+def change_savepoint(session: Session) -> Iterator[None]:
+    """Run the block in a SAVEPOINT; if it raises, the changes it recorded are dropped too."""
+    pending = session.info.setdefault(_PENDING_KEY, [])
+    recorded = len(pending)
+    try:
+        with session.begin_nested():
+            yield
+    except Exception:
+        del pending[recorded:]
+        raise
+
+
+def has_pending_changes(session: Session) -> bool:
+    """Return whether the session's current transaction recorded task changes."""
+    return bool(session.info.get(_PENDING_KEY))
+
+
+def commit_generation() -> tuple[int, bool]:
+    """Return the number of task-changing commits so far, and whether one is in flight.
+
+    Code that derives state from a query can compare the generation before and after the
+    query to detect a commit that raced with it.
+    """
+    with _lock:
+        return _generation, _commits_in_flight > 0
+
+
+@event.listens_for(Session, "before_commit")
+def _before_commit(session: Session) -> None:
+    """Mark the commit as in flight when the transaction changed tasks."""
+    if not session.info.get(_PENDING_KEY) or session.info.get(_COMMITTING_KEY):
+        return
+    global _commits_in_flight  # pylint: disable=global-statement
+    with _lock:
+        _commits_in_flight += 1
+    session.info[_COMMITTING_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    """Hand the committed changes to the listeners."""
+    changes = session.info.pop(_PENDING_KEY, None)
+    if not changes:
+        return
+    for listener in _listeners:
+        try:
+            listener(changes)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("Task change listener %r failed", listener)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _after_transaction_end(session: Session, transaction: SessionTransaction) -> None:
+    """Drop the changes of a rolled back transaction and close the in-flight commit."""
+    if transaction.parent is not None:
+        return
+    session.info.pop(_PENDING_KEY, None)
+    if not session.info.pop(_COMMITTING_KEY, False):
+        return
+    global _commits_in_flight, _generation  # pylint: disable=global-statement
+    with _lock:
+        _commits_in_flight -= 1
+        _generation += 1
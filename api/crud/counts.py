@@ -0,0 +1,75 @@
+"""Cached total task count for the task list in the Spirited Todo List API.
+
+Counting every row of the task table on each list request is a full scan. The total is
+counted once, then kept up to date from the committed creates and deletes. The cache is
+per process, so it also expires after TOTAL_COUNT_CACHE_TTL seconds to pick up writes
+made by other workers or outside the API.
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from crud.changes import ChangeKind, TaskChange, add_change_listener, commit_generation
+from models.task import Task
+
+TOTAL_COUNT_CACHE_TTL = float(os.getenv("TOTAL_COUNT_CACHE_TTL", "60"))
+
+_lock = threading.Lock()
+_total: Optional[int] = None
+_counted_at = 0.0
+
+
+def invalidate_total_count() -> None:
+    """Forget the cached total, e.g. after rows were written outside of crud."""
+    global _total  # pylint: disable=global-statement
+    with _lock:
+        _total = None
+
+
+def get_total_count(session: Session) -> int:
+    """Return the number of tasks, from the cache when it is fresh."""
+    with _lock:
+        if (
+            _total is not None
+            and time.monotonic() - _counted_at < TOTAL_COUNT_CACHE_TTL
+        ):
+            return _total
+    generation, is_commit_in_flight = commit_generation()
+    total = session.exec(
+        select(func.count()).select_from(Task)  # pylint: disable=not-callable
+    ).one()
+    _store(total, generation, is_commit_in_flight)
+    return total
+
+
+def _store(total: int, generation: int, is_commit_in_flight: bool) -> None:
+    """Cache a count unless a commit that changed tasks raced with it.
+
+    The check and the store happen under the lock that _apply_changes takes, so a commit
+    that starts after the check is applied on top of the stored total.
+    """
+    global _total, _counted_at  # pylint: disable=global-statement
+    with _lock:
+        if is_commit_in_flight or commit_generation() != (generation, False):
+            return
+        _total, _counted_at = total, time.monotonic()
+
+
+def _apply_changes(changes: list[TaskChange]) -> None:
+    """Adjust the cached total with the creates and deletes of a committed transaction."""
+    global _total  # pylint: disable=global-statement
+    delta = sum(
+        (change.kind == ChangeKind.CREATED) - (change.kind == ChangeKind.DELETED)
+        for change in changes
+    )
+    with _lock:
+        if _total is not None:
+            _total += delta
+
+
+add_change_listener(_apply_changes)
@@ -0,0 +1,150 @@
+"""Real-time feed of the committed task changes for the Spirited Todo List API.
+
+A change listener fans the changes of every committed transaction out to the
+subscribers of the feed (GET /tasks/events). Each subscriber is a bounded asyncio queue
+on the event loop serving it, so an idle subscriber costs no thread. A subscriber too
+slow to keep up loses its backlog and gets a single resync event instead, telling it to
+refetch, so one slow consumer holds no memory and delays nobody else.
+
+Transactions commit in threadpool workers as well as on the event loop, so events are
+handed to each event loop through call_soon_threadsafe, once per loop and commit.
+"""
+
+import asyncio
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, NamedTuple, Optional
+
+import orjson
+
+from crud.changes import TaskChange, add_change_listener
+
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "256"))
+EVENTS_KEEPALIVE_SECONDS = float(os.getenv("EVENTS_KEEPALIVE_SECONDS", "15"))
+EVENTS_RETRY_MS = int(os.getenv("EVENTS_RETRY_MS", "3000"))
+
+RESYNC = "resync"
+
+
+class TaskEvent(NamedTuple):
+    """An event of the feed: a task change, or a resync request without a task."""
+
+    seq: int
+    kind: str
+    task_id: Optional[int]
+
+
+class Subscription:
+    """The bounded queue of events of one subscriber of the feed."""
+
+    def __init__(self, max_size: int):
+        self.queue: asyncio.Queue[TaskEvent] = asyncio.Queue(max_size)
+        self.resyncs = 0
+
+    def push(self, events: list[TaskEvent]) -> None:
+        """Queue events, replacing the backlog by a resync event if the queue is full.
+
+        Must run on the subscriber's event loop.
+        """
+        for event in events:
+            if self.queue.full():
+                while not self.queue.empty():
+                    self.queue.get_nowait()
+                self.queue.put_nowait(TaskEvent(event.seq, RESYNC, None))
+                self.resyncs += 1
+            else:
+                self.queue.put_nowait(event)
+
+    async def get(self, timeout: float) -> Optional[TaskEvent]:
+        """Wait for the next event, or return None after timeout seconds without one."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+_lock = threading.Lock()
+_subscribers: dict[asyncio.AbstractEventLoop, set[Subscription]] = {}
+_sequence = 0
+
+
+@asynccontextmanager
+async def subscribe(max_size: int = EVENTS_QUEUE_SIZE) -> AsyncIterator[Subscription]:
+    """Subscribe to the feed for the duration of the block."""
+    loop = asyncio.get_running_loop()
+    subscription = Subscription(max_size)
+    with _lock:
+        _subscribers.setdefault(loop, set()).add(subscription)
+    try:
+        yield subscription
+    finally:
+        with _lock:
+            subscriptions = _subscribers[loop]
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del _subscribers[loop]
+
+
+def subscriber_count() -> int:
+    """Return the number of subscribers of the feed, on every event loop."""
+    with _lock:
+        return sum(len(subscriptions) for subscriptions in _subscribers.values())
+
+
+def _deliver(subscriptions: list[Subscription], events: list[TaskEvent]) -> None:
+    for subscription in subscriptions:
+        subscription.push(events)
+
+
+def publish(changes: list[TaskChange]) -> None:
+    """Hand committed changes to every subscriber. Safe to call from any thread."""
+    global _sequence  # pylint: disable=global-statement
+    with _lock:
+        if not _subscribers:
+            return
+        events = []
+        for change in changes:
+            _sequence += 1
+            events.append(TaskEvent(_sequence, change.kind.value, change.task_id))
+        targets = [(loop, list(subs)) for loop, subs in _subscribers.items()]
+    for loop, subscriptions in targets:
+        try:
+            loop.call_soon_threadsafe(_deliver, subscriptions, events)
+        except RuntimeError:  # the loop closed; its subscribers are gone
+            pass
+
+
+def format_event(event: TaskEvent) -> bytes:
+    """Format an event as a Server-Sent Events message."""
+    data = {} if event.task_id is None else {"id": event.task_id}
+    return (
+        f"id: {event.seq}\nevent: {event.kind}\ndata: ".encode()
+        + orjson.dumps(data)  # pylint: disable=no-member
+        + b"\n\n"
+    )
+
+
+async def stream_events(
+    resync: bool = False,
+    keepalive: float = EVENTS_KEEPALIVE_SECONDS,
+    max_size: int = EVENTS_QUEUE_SIZE,
+) -> AsyncIterator[bytes]:
+    """Yield the feed as Server-Sent Events until the client goes away.
+
+    The first message (the reconnection delay) is sent once subscribed: changes
+    committed after it are all in the stream. A reconnecting client (resync) missed
+    the changes made while it was away, so the stream starts with a resync event.
+    A comment is sent after keepalive seconds without an event to keep proxies from
+    closing the connection.
+    """
+    async with subscribe(max_size) as subscription:
+        yield f"retry: {EVENTS_RETRY_MS}\n\n".encode()
+        if resync:
+            yield format_event(TaskEvent(_sequence, RESYNC, None))
+        while True:
+            event = await subscription.get(keepalive)
+            yield b": keepalive\n\n" if event is None else format_event(event)
+
+
+add_change_listener(publish)
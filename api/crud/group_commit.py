@@ -0,0 +1,166 @@
+"""Group commit of single task writes for the Spirited Todo List API.
+
+With WRITE_BATCHING on, single creates, updates and deletes are not committed by the
+request that makes them. They are queued to one background writer, which gathers the
+writes arriving within WRITE_BATCH_WINDOW_MS of the first one (up to
+WRITE_BATCH_MAX_SIZE) and applies them in one transaction: one write lock, one commit
+(and fsync) for the batch instead of one per request, and no writer waiting on another.
+
+Each write runs in its own SAVEPOINT, in arrival order, so a write that fails (high
+priority limit, database error) is rolled back alone and reported to its own caller, and
+the high priority count of each write sees the writes before it in the batch. If the
+commit itself fails, every write of the batch gets the error.
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, NamedTuple, Optional
+
+from sqlmodel import Session, select
+
+from crud.changes import change_savepoint
+from crud.task import lock_for_write
+from models.task import Task
+
+logger = logging.getLogger(__name__)
+
+WRITE_BATCHING = os.getenv("WRITE_BATCHING", "false").lower() == "true"
+WRITE_BATCH_WINDOW_MS = float(os.getenv("WRITE_BATCH_WINDOW_MS", "2"))
+WRITE_BATCH_MAX_SIZE = int(os.getenv("WRITE_BATCH_MAX_SIZE", "64"))
+
+
+class _Write(NamedTuple):
+    stage: Callable[..., Any]
+    args: tuple
+    future: Future
+
+
+_STOP = object()
+
+
+class WriteBatcher:
+    """A background thread committing the queued writes in batches (see module doc)."""
+
+    def __init__(
+        self,
+        open_session: Callable[[], Session],
+        window_ms: float = WRITE_BATCH_WINDOW_MS,
+        max_size: int = WRITE_BATCH_MAX_SIZE,
+    ):
+        self.open_session = open_session
+        self.window = window_ms / 1000
+        self.max_size = max_size
+        self.batches = 0
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="write-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, stage: Callable[..., Any], *args: Any) -> Future:
+        """Queue a crud.task stage_* function, to run as stage(session, *args)."""
+        future: Future = Future()
+        self._queue.put(_Write(stage, args, future))
+        return future
+
+    async def run(self, stage: Callable[..., Any], *args: Any) -> Any:
+        """Queue a stage_* function and wait for its result, once its batch committed."""
+        return await asyncio.wrap_future(self.submit(stage, *args))
+
+    def close(self) -> None:
+        """Commit the queued writes and stop the writer."""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _next_batch(self) -> tuple[list[_Write], bool]:
+        """Wait for a write, then gather the writes of the window; tell if stopping."""
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_size:
+            try:
+                write = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if write is _STOP:
+                return batch, True
+            batch.append(write)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            # Writes whose caller went away (cancelled future) are not applied
+            batch = [w for w in batch if w.future.set_running_or_notify_cancel()]
+            if batch:
+                try:
+                    self._commit(batch)
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    logger.exception("Write batch of %s writes failed", len(batch))
+                    for write in batch:
+                        if not write.future.done():
+                            write.future.set_exception(e)
+
+    def _commit(self, batch: list[_Write]) -> None:
+        """Apply the batch in one transaction and resolve the future of each write."""
+        outcomes: list[tuple[Future, Any, Optional[Exception]]] = []
+        with self.open_session() as session:
+            # Tasks deleted later in the batch cannot be reloaded: keep their state
+            session.expire_on_commit = False
+            # BEGIN and the write lock up front, so the savepoints nest in the transaction
+            lock_for_write(session)
+            for write in batch:
+                try:
+                    with change_savepoint(session):
+                        result = write.stage(session, *write.args)
+                    outcomes.append((write.future, result, None))
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    outcomes.append((write.future, None, e))
+            session.commit()
+            self.batches += 1
+            # Reload the written tasks with one query, as a refresh would, then detach them
+            task_ids = [
+                result.id for _, result, _ in outcomes if isinstance(result, Task)
+            ]
+            if task_ids:
+                session.exec(
+                    select(Task)
+                    .where(Task.id.in_(task_ids))
+                    .execution_options(populate_existing=True)
+                ).all()
+            session.expunge_all()
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+_batcher: Optional[WriteBatcher] = None
+
+
+def get_write_batcher() -> Optional[WriteBatcher]:
+    """Return the running write batcher, or None when writes commit per request."""
+    return _batcher
+
+
+def start_write_batcher(open_session: Callable[[], Session], **kwargs: Any) -> None:
+    """Start batching the single task writes (see WriteBatcher for the options)."""
+    global _batcher  # pylint: disable=global-statement
+    _batcher = WriteBatcher(open_session, **kwargs)
+
+
+def stop_write_batcher() -> None:
+    """Commit the queued writes and go back to one commit per request."""
+    global _batcher  # pylint: disable=global-statement
+    batcher, _batcher = _batcher, None
+    if batcher is not None:
+        batcher.close()
@@ -0,0 +1,64 @@
+"""Keyset (cursor) pagination helpers for the Spirited Todo List API.
+
+A cursor is an opaque, URL-safe token that records the sort key and ``id`` of the
+last item of a page. The next page is fetched by seeking past that position
+instead of skipping ``offset`` rows, so the cost of a page does not depend on its depth.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any
+
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, last_id: int) -> str:
+    """Encode the position after (value, last_id) for the given sort into an opaque cursor."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = {"s": sort_by, "o": sort_order, "v": value, "id": last_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+# Bounds of a SQLite INTEGER (signed 64-bit)
+MIN_INTEGER, MAX_INTEGER = -(2**63), 2**63 - 1
+
+
+def _is_integer(value: Any) -> bool:
+    """Return whether a decoded JSON value is an int that SQLite can bind."""
+    return (
+        isinstance(value, int)
+        and not isinstance(value, bool)
+        and MIN_INTEGER <= value <= MAX_INTEGER
+    )
+
+
+def decode_cursor(
+    cursor: str, sort_by: str, sort_order: str, value_type: type = int
+) -> tuple[Any, int]:
+    """Decode a cursor and return (value, last_id), validating it against the requested sort.
+
+    value_type is the type of the sort column: int, str or datetime (an ISO string in the
+    cursor). Raises ValueError if the cursor is malformed, holds a value of another type
+    or an id out of the INTEGER range, or was issued for a different sort.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        cursor_sort, cursor_order = payload["s"], payload["o"]
+        value, last_id = payload["v"], payload["id"]
+        if value_type is datetime:
+            value = datetime.fromisoformat(value)
+        elif value_type is int and not _is_integer(value):
+            raise TypeError(value)
+        elif not isinstance(value, value_type):
+            raise TypeError(value)
+        if not _is_integer(last_id):
+            raise TypeError(last_id)
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid pagination cursor.") from e
+    if (cursor_sort, cursor_order) != (sort_by, sort_order):
+        raise ValueError(
+            "Pagination cursor does not match the requested sort_by/sort_order."
+        )
+    return value, last_id
@@ -0,0 +1,69 @@
+"""Full-text search of tasks for the Spirited Todo List API.
+
+Queries the task_fts index (see db.search) and returns task rows ranked by BM25, with
+matches in the title weighing more than matches in the description.
+"""
+
+import re
+from typing import Optional
+
+from sqlalchemy import Row, column, func, literal_column
+from sqlalchemy import select as sa_select
+from sqlalchemy import table
+from sqlmodel import Session
+
+from crud.task import TASK_TABLE
+from db.search import TASK_FTS_TABLE
+
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+TASK_FTS = table(TASK_FTS_TABLE, column("rowid"))
+# FTS5 functions and MATCH take the table itself as their first operand
+_FTS = literal_column(TASK_FTS_TABLE)
+
+
+def build_match_query(q: str) -> str:
+    """Turn free text into an FTS5 query: every word must match, as a prefix.
+
+    Words are quoted, so FTS5 operators and punctuation in q are searched as text
+    instead of raising a syntax error. Raises ValueError if q has no word.
+    """
+    words = re.findall(r"\w+", q)
+    if not words:
+        raise ValueError("Search query must contain at least one word.")
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search_tasks(
+    session: Session,
+    q: str,
+    limit: int = 20,
+    offset: int = 0,
+    include_total: bool = True,
+) -> tuple[list[Row], Optional[int]]:
+    """Return a page of the tasks matching q, best match first, and the number of matches.
+
+    Items are plain column rows, like the pages of crud.task.get_tasks. The number of
+    matches is None when include_total is False.
+    """
+    match = _FTS.op("MATCH")(build_match_query(q))
+    rank = func.bm25(_FTS, TITLE_WEIGHT, DESCRIPTION_WEIGHT)
+    query = (
+        sa_select(*TASK_TABLE.c)
+        .select_from(TASK_FTS)
+        .join(TASK_TABLE, TASK_TABLE.c.id == TASK_FTS.c.rowid)
+        .where(match)
+        .order_by(rank, TASK_TABLE.c.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    items = session.exec(query).all()
+    total = None
+    if include_total:
+        total = session.exec(
+            sa_select(func.count())  # pylint: disable=not-callable
+            .select_from(TASK_FTS)
+            .where(match)
+        ).one()[0]
+    return items, total
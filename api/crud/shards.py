@@ -0,0 +1,180 @@
+"""Task CRUD operations across the shards of the Spirited Todo List API (see db.shards).
+
+An operation on one task runs the crud.task function on the shard of the task's list
+(create) or of its ID (read, update, delete), in a session of that shard: the high
+priority limit of a list is checked where all its tasks are.
+
+The task list is scattered to every shard concurrently, or only to the shard of the list
+filter, and gathered by merging the shard pages in the list order. Each shard reads up
+to offset + limit rows in (sort field, id) order, so the merged rows hold the first
+offset + limit of the whole list; deep offset pages are thus costlier than cursor pages,
+which seek past the cursor on every shard. Totals are counted on each shard and summed,
+without the total count cache, which holds the count of a single database.
+"""
+
+import asyncio
+import heapq
+from typing import Any, Callable, Optional, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Row
+from sqlmodel import Session
+
+from crud import cache, task, versions
+from crud.pagination import encode_cursor
+from db.shards import ShardSet
+from models.task import Task
+from schemas.task import TaskCreate, TaskFilter, TaskUpdate
+
+T = TypeVar("T")
+
+
+async def _on_shard(
+    shards: ShardSet,
+    index: int,
+    crud_fn: Callable[..., T],
+    *args: Any,
+    read: bool = False,
+    **kwargs: Any,
+) -> T:
+    """Run a sync CRUD function in a session of a shard, in the threadpool."""
+
+    def run() -> T:
+        open_session = shards.read_session if read else shards.session
+        with open_session(index) as session:
+            return crud_fn(session, *args, **kwargs)
+
+    return await run_in_threadpool(run)
+
+
+async def create_task(shards: ShardSet, task_in: TaskCreate) -> Task:
+    """Create a task on the shard of its list, enforcing the list's high priority limit."""
+    index = shards.shard_for_list(task_in.list_id)
+    return await _on_shard(shards, index, task.create_task, task_in)
+
+
+async def get_task_payload(
+    shards: ShardSet, task_id: int
+) -> Optional[cache.TaskPayload]:
+    """Return the TaskRead payload of a task, from the task cache or from its shard."""
+    payload = cache.get_cached_task(task_id)
+    index = shards.shard_for_task(task_id)
+    if payload is None and index is not None:
+        payload = await _on_shard(
+            shards, index, cache.load_task_payload, task_id, read=True
+        )
+    return payload
+
+
+async def update_task(
+    shards: ShardSet, task_id: int, task_in: TaskUpdate
+) -> Optional[Task]:
+    """Update a task on its shard, enforcing the high priority limit of its list."""
+    index = shards.shard_for_task(task_id)
+    if index is None:
+        return None
+    return await _on_shard(shards, index, task.update_task, task_id, task_in)
+
+
+async def delete_task(shards: ShardSet, task_id: int) -> bool:
+    """Delete a task on its shard."""
+    index = shards.shard_for_task(task_id)
+    if index is None:
+        return False
+    return await _on_shard(shards, index, task.delete_task, task_id)
+
+
+def _shard_indexes(shards: ShardSet, filters: Optional[TaskFilter]) -> list[int]:
+    """Return the shards holding the tasks of the list: one when filtered by list."""
+    if filters is not None and filters.list_id is not None:
+        return [shards.shard_for_list(filters.list_id)]
+    return list(range(len(shards)))
+
+
+async def get_table_versions(
+    shards: ShardSet, filters: Optional[TaskFilter] = None
+) -> list[int]:
+    """Return the task table version of each shard of the list."""
+    return await asyncio.gather(
+        *(
+            _on_shard(shards, index, versions.get_table_version, read=True)
+            for index in _shard_indexes(shards, filters)
+        )
+    )
+
+
+def _read_shard_page(
+    session: Session,
+    size: int,
+    sort_by: str,
+    sort_order: str,
+    cursor: Optional[str],
+    include_total: bool,
+    filters: Optional[TaskFilter],
+) -> tuple[list[Row], bool, Optional[int]]:
+    """Read the first size rows of a shard's list, whether it has more, and its total."""
+    rows, _, next_cursor = task.get_tasks(
+        session,
+        limit=size,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        cursor=cursor,
+        include_total=False,
+        filters=filters,
+    )
+    total = task.count_tasks(session, filters) if include_total else None
+    return rows, next_cursor is not None, total
+
+
+async def get_tasks(
+    shards: ShardSet,
+    limit: int = 20,
+    offset: int = 0,
+    sort_by: str = "priority",
+    sort_order: str = "desc",
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    filters: Optional[TaskFilter] = None,
+) -> tuple[list[Row], Optional[int], Optional[str]]:
+    """Retrieve a page of the task list of every shard (see crud.task.get_tasks).
+
+    Task IDs are unique across shards, so (sort field, id) orders the merged rows like
+    the list of a single database, and cursors work the same way.
+    """
+    sort_by, sort_order = task.normalize_sort(sort_by, sort_order)
+    if cursor is not None:
+        offset = 0
+    pages = await asyncio.gather(
+        *(
+            _on_shard(
+                shards,
+                index,
+                _read_shard_page,
+                offset + limit,
+                sort_by,
+                sort_order,
+                cursor,
+                include_total,
+                filters,
+                read=True,
+            )
+            for index in _shard_indexes(shards, filters)
+        )
+    )
+    merged = list(
+        heapq.merge(
+            *(rows for rows, _, _ in pages),
+            key=lambda row: (getattr(row, sort_by), row.id),
+            reverse=sort_order == "desc",
+        )
+    )
+    items = merged[offset : offset + limit]
+    has_more = len(merged) > offset + limit or any(more for _, more, _ in pages)
+    next_cursor = None
+    if has_more and items:
+        last = items[-1]
+        next_cursor = encode_cursor(
+            sort_by, sort_order, getattr(last, sort_by), last.id
+        )
+    total = sum(count for _, _, count in pages) if include_total else None
+    return items, total, next_cursor
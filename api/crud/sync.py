@@ -0,0 +1,105 @@
+"""Delta sync of tasks for the Spirited Todo List API.
+
+A sync token is the position, in (change_version, id) order, of the last change a client
+has seen. Changes after it are the tasks written since (their latest version) and the
+tombstones of the tasks deleted since, both read by seeking the (change_version, id)
+indexes. Both reads stop at the table version read first, so they see the same set of
+committed transactions, and a transaction committed during a sync is left whole to the
+next one.
+"""
+
+from typing import NamedTuple, Optional
+
+from sqlalchemy import Row
+from sqlalchemy import select as sa_select
+from sqlalchemy import tuple_
+from sqlmodel import Session, select
+
+from crud.pagination import decode_cursor, encode_cursor
+from crud.task import TASK_TABLE
+from models.task import TaskTableVersion, TaskTombstone
+
+SYNC_ORDER = ("change_version", "asc")
+
+
+class TaskChanges(NamedTuple):
+    """A page of changes: written task rows, deleted task IDs and the token after them."""
+
+    items: list[Row]
+    deleted: list[int]
+    token: str
+    has_more: bool
+
+
+def encode_sync_token(change_version: int, task_id: int) -> str:
+    """Encode the position after the change (change_version, task_id) as a sync token."""
+    return encode_cursor(*SYNC_ORDER, change_version, task_id)
+
+
+def decode_sync_token(token: str) -> tuple[int, int]:
+    """Decode a sync token into its (change_version, task_id) position.
+
+    Raises ValueError if the token is malformed.
+    """
+    try:
+        change_version, task_id = decode_cursor(token, *SYNC_ORDER)
+        return int(change_version), task_id
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid sync token.") from e
+
+
+def get_changes(
+    session: Session, since: Optional[str] = None, limit: int = 500
+) -> Optional[TaskChanges]:
+    """Return up to limit changes after the since token, oldest first.
+
+    Without a token every task is returned, and no tombstone. Returns None if the token
+    is older than the tombstone horizon, as the deletes it missed may be compacted: the
+    client must sync again from scratch. Raises ValueError for a malformed token.
+    """
+    state = session.exec(
+        select(TaskTableVersion.version, TaskTableVersion.tombstone_horizon)
+    ).first()
+    version, horizon = state or (0, 0)
+    position = (0, 0) if since is None else decode_sync_token(since)
+    if since is not None and position[0] < horizon:
+        return None
+
+    columns = TASK_TABLE.c
+    task_key = tuple_(columns.change_version, columns.id)
+    rows = session.exec(
+        sa_select(*columns)
+        .where(task_key > tuple_(*position), columns.change_version <= version)
+        .order_by(columns.change_version, columns.id)
+        .limit(limit + 1)
+    ).all()
+    changes = [(row.change_version, row.id, row) for row in rows]
+    if since is not None:
+        tombstone_key = tuple_(TaskTombstone.change_version, TaskTombstone.id)
+        tombstones = session.exec(
+            select(TaskTombstone.change_version, TaskTombstone.id)
+            .where(
+                tombstone_key > tuple_(*position),
+                TaskTombstone.change_version <= version,
+            )
+            .order_by(TaskTombstone.change_version, TaskTombstone.id)
+            .limit(limit + 1)
+        ).all()
+        changes.extend(
+            (change_version, task_id, None) for change_version, task_id in tombstones
+        )
+        changes.sort(key=lambda change: change[:2])
+
+    has_more = len(changes) > limit
+    page = changes[:limit]
+    if has_more:
+        token = encode_sync_token(*page[-1][:2])
+    else:
+        # Every change up to the version read above was seen: resume after it
+        token = encode_sync_token(version + 1, 0)
+    return TaskChanges(
+        items=[row for _, _, row in page if row is not None],
+        deleted=[task_id for _, task_id, row in page if row is None],
+        token=token,
+        has_more=has_more,
+    )
@@ -4,13 +4,42 @@ import os
 from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import func
+from sqlalchemy import Row, false, func
+from sqlalchemy import select as sa_select
+from sqlalchemy import union_all, update
 from sqlmodel import Session, select
 
+from crud.changes import ChangeKind, record_change
+from crud.counts import get_total_count
+from crud.pagination import decode_cursor, encode_cursor
+from db.shards import SHARD_ID_STRIDE, SHARD_INFO_KEY
 from models.task import Priority, Task
-from schemas.task import TaskCreate, TaskUpdate
+from schemas.task import TaskCreate, TaskFilter, TaskUpdate
 
 MAX_HIGH_PRIORITY_TASK = int(os.getenv("MAX_HIGH_PRIORITY_TASK", "5"))
+HIGH_PRIORITY_LIMIT_MESSAGE = (
+    f"Cannot create more than {MAX_HIGH_PRIORITY_TASK} high priority tasks"
+    " in a task list."
+)
+
+TASK_TABLE = Task.__table__
+
+VALID_SORT_FIELDS = {
+    "priority": Task.priority,
+    "created_at": Task.created_at,
+    "updated_at": Task.updated_at,
+    "title": Task.title,
+    "id": Task.id,
+}
+
+# Type of the value of each sort field in a pagination cursor
+SORT_VALUE_TYPES = {
+    "priority": int,
+    "created_at": datetime,
+    "updated_at": datetime,
+    "title": str,
+    "id": int,
+}
 
 
 def get_task(session: Session, task_id: int) -> Optional[Task]:
@@ -18,82 +47,322 @@ def get_task(session: Session, task_id: int) -> Optional[Task]:
     return session.get(Task, task_id)
 
 
+def _as_utc(value: datetime) -> datetime:
+    """Return value as a naive UTC datetime, the way the task table stores datetimes."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _filter_clauses(filters: Optional[TaskFilter]) -> list:
+    """Build the WHERE clauses of the task list filters."""
+    if filters is None:
+        return []
+    columns = TASK_TABLE.c
+    clauses = []
+    if filters.priority:
+        clauses.append(columns.priority.in_(sorted(set(filters.priority))))
+    if filters.deadline_before is not None:
+        clauses.append(columns.deadline < _as_utc(filters.deadline_before))
+    if filters.deadline_after is not None:
+        clauses.append(columns.deadline > _as_utc(filters.deadline_after))
+    if filters.created_since is not None:
+        clauses.append(columns.created_at >= _as_utc(filters.created_since))
+    if filters.updated_since is not None:
+        clauses.append(columns.updated_at >= _as_utc(filters.updated_since))
+    if filters.has_deadline is not None:
+        clauses.append(
+            columns.deadline.is_not(None)
+            if filters.has_deadline
+            else columns.deadline.is_(None)
+        )
+    if filters.list_id is not None:
+        clauses.append(columns.list_id == filters.list_id)
+    return clauses
+
+
+def _ordered(query, columns, sort_by: str, sort_order: str):
+    """Order a query by the sort column, then by the id column as a tiebreaker."""
+    sort_col, id_col = columns[sort_by], columns["id"]
+    if sort_order == "desc":
+        return query.order_by(sort_col.desc(), id_col.desc())
+    return query.order_by(sort_col.asc(), id_col.asc())
+
+
+def _seek_query(
+    sort_by: str, sort_order: str, value, last_id: int, size: int, clauses: list
+):
+    """Build a query for the filtered rows after (value, last_id) in (sort_by, id) order.
+
+    SQLite only seeks on the first column of a row-value comparison like
+    (priority, id) < (?, ?), so deep pages over a low-cardinality column would still scan.
+    The seek is split into "same value, next ids" and "next values": each branch is a
+    full index seek limited to size rows, and only those rows are merged.
+    """
+    columns = TASK_TABLE.c
+    is_desc = sort_order == "desc"
+    after_id = columns.id < last_id if is_desc else columns.id > last_id
+    if sort_by == "id":
+        return _ordered(
+            sa_select(*columns).where(after_id, *clauses),
+            columns,
+            sort_by,
+            sort_order,
+        )
+    sort_col = columns[sort_by]
+    same_value = sa_select(*columns).where(sort_col == value, after_id, *clauses)
+    next_values = sa_select(*columns).where(
+        sort_col < value if is_desc else sort_col > value, *clauses
+    )
+    page = union_all(
+        *(
+            _ordered(branch, columns, sort_by, sort_order)
+            .limit(size)
+            .subquery()
+            .select()
+            for branch in (same_value, next_values)
+        )
+    ).subquery()
+    return _ordered(sa_select(*page.c), page.c, sort_by, sort_order)
+
+
+def normalize_sort(sort_by: str, sort_order: str) -> tuple[str, str]:
+    """Fall back to the default sort for unknown sort fields and orders."""
+    if sort_by not in VALID_SORT_FIELDS:
+        sort_by = "priority"
+    return sort_by, "desc" if sort_order == "desc" else "asc"
+
+
+def list_query(
+    sort_by: str = "priority",
+    sort_order: str = "desc",
+    filters: Optional[TaskFilter] = None,
+):
+    """Build the filtered and ordered query of every task row of the list, unpaginated."""
+    sort_by, sort_order = normalize_sort(sort_by, sort_order)
+    columns = TASK_TABLE.c
+    query = sa_select(*columns).where(*_filter_clauses(filters))
+    return _ordered(query, columns, sort_by, sort_order)
+
+
+def count_tasks(session: Session, filters: Optional[TaskFilter] = None) -> int:
+    """Count the tasks matching the list filters, without the total count cache."""
+    return session.exec(
+        sa_select(func.count())  # pylint: disable=not-callable
+        .select_from(TASK_TABLE)
+        .where(*_filter_clauses(filters))
+    ).one()[0]
+
+
 def get_tasks(
     session: Session,
     limit: int = 20,
     offset: int = 0,
     sort_by: str = "priority",
     sort_order: str = "desc",
-) -> tuple[list[Task], int]:
-    """Retrieve all tasks with pagination and sorting, and return items and total count.
-    The total count is calculated with a separate query to provide the total number of tasks in the database (for pagination),
-    not just the number of items in the current page (which would be len(items)).
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    filters: Optional[TaskFilter] = None,
+) -> tuple[list[Row], Optional[int], Optional[str]]:
+    """Retrieve all tasks with pagination and sorting, and return items, total count and next cursor.
+    The total count is the total number of tasks in the database (for pagination), not just the number
+    of items in the current page (which would be len(items)). It comes from the total count cache and
+    is None when include_total is False.
+    When a cursor is given, the page starts right after the cursor position (keyset pagination)
+    and offset is ignored, so the cost of a page does not depend on its depth.
+    Results are always ordered by the sort field then by id, so that every row has a unique
+    position. next_cursor is None when there are no more items.
+    Items are plain column rows (with attribute access, like Task), not ORM objects: a page
+    is read-only, and skipping the ORM identity map makes it much cheaper to load.
+    Filters are applied in the WHERE clause of the page query, cursor pages included, and
+    the total then counts the matching tasks (without the total count cache).
     """
-    valid_sort_fields = {
-        "priority": Task.priority,
-        "created_at": Task.created_at,
-        "updated_at": Task.updated_at,
-        "title": Task.title,
-        "id": Task.id,
-    }
-    order_col = valid_sort_fields.get(sort_by, Task.priority)
-    if sort_order == "desc":
-        order_col = order_col.desc()
-    total = session.exec(
-        select(func.count()).select_from(Task)  # pylint: disable=not-callable
-    ).one()  # pylint: disable=not-callable
-    query = select(Task).order_by(order_col).offset(offset).limit(limit)
-    items = session.exec(query).all()
-    return items, total
+    sort_by, sort_order = normalize_sort(sort_by, sort_order)
+    clauses = _filter_clauses(filters)
+    if cursor is not None:
+        value, last_id = decode_cursor(
+            cursor, sort_by, sort_order, SORT_VALUE_TYPES[sort_by]
+        )
+        query = _seek_query(sort_by, sort_order, value, last_id, limit + 1, clauses)
+    else:
+        query = list_query(sort_by, sort_order, filters).offset(offset)
+    total = None
+    if include_total and clauses:
+        total = count_tasks(session, filters)
+    elif include_total:
+        total = get_total_count(session)
+    # Fetch one extra row to know whether a next page exists
+    rows = session.exec(query.limit(limit + 1)).all()
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(
+            sort_by, sort_order, getattr(last, sort_by), last.id
+        )
+    return items, total, next_cursor
 
 
-def create_task(session: Session, task_in: TaskCreate) -> Task:
-    """Create a new task from TaskCreate schema, enforcing high priority limit."""
-    if task_in.priority == Priority.HIGH:
-        high_count = len(
-            session.exec(select(Task).where(Task.priority == Priority.HIGH)).all()
-        )
-        if high_count >= MAX_HIGH_PRIORITY_TASK:
-            raise ValueError(
-                f"Cannot create more than {MAX_HIGH_PRIORITY_TASK} high priority tasks."
-            )
+def lock_for_write(session: Session) -> None:
+    """Take the SQLite write lock for the rest of the session's transaction.
+
+    The first write statement of a SQLite transaction takes the database write lock, even
+    when it matches no row. Reads made after this one see every committed write, and no
+    other writer can commit until this transaction ends.
+    """
+    session.exec(
+        update(Task)
+        .where(false())
+        .values(id=Task.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def count_high_priority_tasks(session: Session, list_id: str) -> int:
+    """Count the HIGH tasks of a task list, up to MAX_HIGH_PRIORITY_TASK + 1.
+
+    The count is served by the (list_id, priority) index and stops past the limit, so
+    its cost does not grow with the table.
+    """
+    high_ids = (
+        select(Task.id)
+        .where(Task.list_id == list_id, Task.priority == Priority.HIGH)
+        .limit(MAX_HIGH_PRIORITY_TASK + 1)
+        .subquery()
+    )
+    return session.exec(
+        select(func.count()).select_from(high_ids)  # pylint: disable=not-callable
+    ).one()
+
+
+def count_high_priority_tasks_by_list(
+    session: Session, list_ids: set[str]
+) -> dict[str, int]:
+    """Count the HIGH tasks of each of the given task lists, with one query.
+
+    The limit keeps every count at most MAX_HIGH_PRIORITY_TASK, so each list reads
+    a bounded range of the (list_id, priority) index.
+    """
+    if not list_ids:
+        return {}
+    return dict(
+        session.exec(
+            select(Task.list_id, func.count())  # pylint: disable=not-callable
+            .where(Task.list_id.in_(sorted(list_ids)), Task.priority == Priority.HIGH)
+            .group_by(Task.list_id)
+        ).all()
+    )
+
+
+def _enforce_high_priority_limit(session: Session, list_id: str) -> None:
+    """Raise ValueError if the pending changes exceed the high priority limit of a list.
+
+    The pending INSERT/UPDATE is flushed first: in SQLite the first write of a transaction
+    takes the database write lock, so concurrent writers are serialized and the count below
+    sees every committed HIGH task plus this one.
+    """
+    session.flush()
+    if count_high_priority_tasks(session, list_id) > MAX_HIGH_PRIORITY_TASK:
+        raise ValueError(HIGH_PRIORITY_LIMIT_MESSAGE)
+
+
+def _next_shard_task_id(session: Session, shard: int) -> int:
+    """Return the next task ID of a shard, after locking it for writing.
+
+    The IDs of shard i are i + 1 modulo SHARD_ID_STRIDE (see db.shards), so the shard of
+    a task is known from its ID.
+    """
+    lock_for_write(session)
+    last_id = session.exec(
+        sa_select(func.max(TASK_TABLE.c.id))  # pylint: disable=not-callable
+    ).one()[0]
+    return (last_id or shard + 1 - SHARD_ID_STRIDE) + SHARD_ID_STRIDE
+
+
+def stage_create_task(session: Session, task_in: TaskCreate) -> Task:
+    """Insert a new task in the session's transaction, without committing it.
+
+    In a session of a shard (see db.shards), the task gets the next ID of the shard.
+    Raises ValueError if the high priority limit would be exceeded; the caller must
+    then roll back.
+    """
     task = Task(**task_in.model_dump())
+    shard = session.info.get(SHARD_INFO_KEY)
+    if shard is not None:
+        task.id = _next_shard_task_id(session, shard)
     session.add(task)
-    session.commit()
-    session.refresh(task)
+    if task.priority == Priority.HIGH:
+        _enforce_high_priority_limit(session, task.list_id)
+    session.flush()
+    record_change(session, ChangeKind.CREATED, task.id)
     return task
 
 
-def update_task(session: Session, task_id: int, task_in: TaskUpdate) -> Optional[Task]:
-    """Update an existing task by ID with TaskUpdate schema, enforcing high priority limit."""
+def stage_update_task(
+    session: Session, task_id: int, task_in: TaskUpdate
+) -> Optional[Task]:
+    """Update a task in the session's transaction, without committing it.
+
+    Returns None if the task does not exist. Raises ValueError if the high priority
+    limit would be exceeded; the caller must then roll back.
+    """
     task = session.get(Task, task_id)
     if not task:
         return None
     update_data = task_in.model_dump(exclude_unset=True)
     # Check if updating to high priority
     new_priority = update_data.get("priority", task.priority)
-    if new_priority == Priority.HIGH and task.priority != Priority.HIGH:
-        high_count = len(
-            session.exec(select(Task).where(Task.priority == Priority.HIGH)).all()
-        )
-        if high_count >= MAX_HIGH_PRIORITY_TASK:
-            raise ValueError(
-                f"Cannot create more than {MAX_HIGH_PRIORITY_TASK} high priority tasks."
-            )
+    is_promoted = new_priority == Priority.HIGH and task.priority != Priority.HIGH
     for field, value in update_data.items():
         setattr(task, field, value)
     task.updated_at = datetime.now(timezone.utc)
     session.add(task)
-    session.commit()
-    session.refresh(task)
+    if is_promoted:
+        _enforce_high_priority_limit(session, task.list_id)
+    record_change(session, ChangeKind.UPDATED, task.id)
     return task
 
 
-def delete_task(session: Session, task_id: int) -> bool:
-    """Delete a task by its ID."""
+def stage_delete_task(session: Session, task_id: int) -> bool:
+    """Delete a task in the session's transaction, without committing it.
+
+    Returns False if the task does not exist.
+    """
     task = session.get(Task, task_id)
     if not task:
         return False
     session.delete(task)
-    session.commit()
+    record_change(session, ChangeKind.DELETED, task_id)
     return True
+
+
+def _commit_staged(session: Session, stage, *args):
+    """Run a stage_* function and commit its transaction, or roll it back if it raises."""
+    try:
+        result = stage(session, *args)
+    except ValueError:
+        session.rollback()
+        raise
+    if result:
+        session.commit()
+    return result
+
+
+def create_task(session: Session, task_in: TaskCreate) -> Task:
+    """Create a new task from TaskCreate schema, enforcing high priority limit."""
+    task = _commit_staged(session, stage_create_task, task_in)
+    session.refresh(task)
+    return task
+
+
+def update_task(session: Session, task_id: int, task_in: TaskUpdate) -> Optional[Task]:
+    """Update an existing task by ID with TaskUpdate schema, enforcing high priority limit."""
+    task = _commit_staged(session, stage_update_task, task_id, task_in)
+    if task:
+        session.refresh(task)
+    return task
+
+
+def delete_task(session: Session, task_id: int) -> bool:
+    """Delete a task by its ID."""
+    return _commit_staged(session, stage_delete_task, task_id)
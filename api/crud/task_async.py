@@ -0,0 +1,122 @@
+"""Async versions of the Task CRUD operations in the Spirited Todo List API.
+
+The business rules are written once, in crud.task and crud.bulk. With an AsyncSession the
+sync implementation runs on its underlying sync session through run_sync: SQLAlchemy
+drives it from a greenlet and every database round-trip is awaited through aiosqlite.
+With a sync Session it runs in the threadpool, like a sync FastAPI handler would.
+"""
+
+from typing import Any, Callable, Optional, TypeVar, Union
+
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from crud import bulk, cache, group_commit, search, sync, task, versions
+from models.task import Task
+from schemas.task import BulkItemError, TaskBulkUpdate, TaskCreate, TaskUpdate
+
+AnySession = Union[Session, AsyncSession]
+T = TypeVar("T")
+
+
+async def run_crud(
+    session: AnySession, crud_fn: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Run a sync CRUD function without blocking the event loop."""
+    if isinstance(session, AsyncSession):
+        return await session.run_sync(crud_fn, *args, **kwargs)
+    return await run_in_threadpool(crud_fn, session, *args, **kwargs)
+
+
+async def get_task(session: AnySession, task_id: int) -> Optional[Task]:
+    """Retrieve a task by its ID."""
+    return await run_crud(session, task.get_task, task_id)
+
+
+async def get_task_payload(
+    session: AnySession, task_id: int
+) -> Optional[cache.TaskPayload]:
+    """Return the TaskRead payload of a task (see crud.cache).
+
+    A cache hit is answered without a database round-trip or a trip to the threadpool.
+    """
+    payload = cache.get_cached_task(task_id)
+    if payload is None:
+        payload = await run_crud(session, cache.load_task_payload, task_id)
+    return payload
+
+
+async def get_tasks(
+    session: AnySession, **kwargs: Any
+) -> tuple[list[Task], Optional[int], Optional[str]]:
+    """Retrieve tasks with pagination and sorting (see crud.task.get_tasks)."""
+    return await run_crud(session, task.get_tasks, **kwargs)
+
+
+async def search_tasks(
+    session: AnySession, **kwargs: Any
+) -> tuple[list[Task], Optional[int]]:
+    """Search tasks by title and description (see crud.search.search_tasks)."""
+    return await run_crud(session, search.search_tasks, **kwargs)
+
+
+async def get_changes(session: AnySession, **kwargs: Any) -> Optional[sync.TaskChanges]:
+    """Return the task changes after a sync token (see crud.sync.get_changes)."""
+    return await run_crud(session, sync.get_changes, **kwargs)
+
+
+async def get_table_version(session: AnySession) -> int:
+    """Return the current version of the task table."""
+    return await run_crud(session, versions.get_table_version)
+
+
+async def create_task(session: AnySession, task_in: TaskCreate) -> Task:
+    """Create a new task, enforcing high priority limit.
+
+    With write batching on, the write is committed by the write batcher instead (see
+    crud.group_commit), and so are single updates and deletes.
+    """
+    batcher = group_commit.get_write_batcher()
+    if batcher is not None:
+        return await batcher.run(task.stage_create_task, task_in)
+    return await run_crud(session, task.create_task, task_in)
+
+
+async def update_task(
+    session: AnySession, task_id: int, task_in: TaskUpdate
+) -> Optional[Task]:
+    """Update an existing task by ID, enforcing high priority limit."""
+    batcher = group_commit.get_write_batcher()
+    if batcher is not None:
+        return await batcher.run(task.stage_update_task, task_id, task_in)
+    return await run_crud(session, task.update_task, task_id, task_in)
+
+
+async def delete_task(session: AnySession, task_id: int) -> bool:
+    """Delete a task by its ID."""
+    batcher = group_commit.get_write_batcher()
+    if batcher is not None:
+        return await batcher.run(task.stage_delete_task, task_id)
+    return await run_crud(session, task.delete_task, task_id)
+
+
+async def create_tasks(
+    session: AnySession, tasks_in: list[TaskCreate]
+) -> tuple[list[Task], list[BulkItemError]]:
+    """Create tasks in one transaction (see crud.bulk.create_tasks)."""
+    return await run_crud(session, bulk.create_tasks, tasks_in)
+
+
+async def update_tasks(
+    session: AnySession, tasks_in: list[TaskBulkUpdate]
+) -> tuple[list[Task], list[BulkItemError]]:
+    """Update tasks in one transaction (see crud.bulk.update_tasks)."""
+    return await run_crud(session, bulk.update_tasks, tasks_in)
+
+
+async def delete_tasks(
+    session: AnySession, task_ids: list[int]
+) -> tuple[list[int], list[BulkItemError]]:
+    """Delete tasks in one transaction (see crud.bulk.delete_tasks)."""
+    return await run_crud(session, bulk.delete_tasks, task_ids)
@@ -0,0 +1,112 @@
+"""Streaming NDJSON import of tasks for the Spirited Todo List API.
+
+The request body is read chunk by chunk and split into lines; each line is validated
+against TaskCreate, and valid tasks are inserted in batches with crud.bulk.insert_tasks,
+one transaction per batch. Memory is bounded by the batch size, the maximum line length
+and the number of reported errors, whatever the size of the upload.
+
+The high priority limit is checked by each batch against the committed HIGH tasks, so
+it holds across the whole import, and against concurrent writers. Batches committed
+before a failure (or a client disconnect) stay committed.
+"""
+
+import os
+from typing import AsyncIterator, Optional
+
+from pydantic import ValidationError
+
+from crud import bulk
+from crud.task_async import AnySession, run_crud
+from models.error import ErrorCode
+from schemas.task import TaskCreate, TaskImportError, TaskImportResponse
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+MAX_IMPORT_LINE_BYTES = int(os.getenv("MAX_IMPORT_LINE_BYTES", str(64 * 1024)))
+MAX_IMPORT_ERRORS = int(os.getenv("MAX_IMPORT_ERRORS", "100"))
+
+
+async def _ndjson_lines(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[tuple[int, Optional[bytes]]]:
+    """Yield (line number, line) for every line of the body, and None for too long lines.
+
+    At most MAX_IMPORT_LINE_BYTES of a line are buffered: the rest of a longer line is
+    skipped up to the next newline.
+    """
+    buffer = bytearray()
+    line_number = 0
+    is_too_long = False
+    async for chunk in chunks:
+        buffer += chunk
+        while (end := buffer.find(b"\n")) >= 0:
+            line_number += 1
+            is_too_long = is_too_long or end > MAX_IMPORT_LINE_BYTES
+            yield line_number, None if is_too_long else bytes(buffer[:end])
+            del buffer[: end + 1]
+            is_too_long = False
+        if len(buffer) > MAX_IMPORT_LINE_BYTES:
+            buffer.clear()
+            is_too_long = True
+    if buffer or is_too_long:
+        is_too_long = is_too_long or len(buffer) > MAX_IMPORT_LINE_BYTES
+        yield line_number + 1, None if is_too_long else bytes(buffer)
+
+
+def _validation_message(error: ValidationError) -> str:
+    """Summarize the errors of a line that does not validate against TaskCreate."""
+    return "; ".join(
+        f"{'.'.join(map(str, err['loc'])) or 'line'}: {err['msg']}"
+        for err in error.errors(include_url=False)
+    )
+
+
+async def import_tasks(
+    session: AnySession,
+    chunks: AsyncIterator[bytes],
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> TaskImportResponse:
+    """Import the tasks of an NDJSON body, one TaskCreate object per line.
+
+    Blank lines are skipped. Invalid lines and tasks rejected by the high priority limit
+    are counted as rejected, and the first MAX_IMPORT_ERRORS of them are reported.
+    """
+    summary = TaskImportResponse()
+    batch: list[tuple[int, TaskCreate]] = []
+
+    def reject(line: int, msg: str, error_code: ErrorCode) -> None:
+        summary.rejected += 1
+        if len(summary.errors) < MAX_IMPORT_ERRORS:
+            summary.errors.append(
+                TaskImportError(line=line, msg=msg, error_code=error_code)
+            )
+
+    async def flush() -> None:
+        task_ids, errors = await run_crud(
+            session, bulk.insert_tasks, [task_in for _, task_in in batch]
+        )
+        summary.inserted += len(task_ids)
+        summary.batches += 1
+        for error in errors:
+            reject(batch[error.index][0], error.msg, error.error_code)
+        batch.clear()
+
+    async for line_number, line in _ndjson_lines(chunks):
+        if line is None:
+            reject(
+                line_number,
+                f"Line is longer than {MAX_IMPORT_LINE_BYTES} bytes.",
+                ErrorCode.INVALID_INPUT,
+            )
+            continue
+        if not line.strip():
+            continue
+        try:
+            batch.append((line_number, TaskCreate.model_validate_json(line)))
+        except ValidationError as e:
+            reject(line_number, _validation_message(e), ErrorCode.INVALID_INPUT)
+            continue
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+    return summary
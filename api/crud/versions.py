@@ -0,0 +1,49 @@
+"""Task table version for conditional requests in the Spirited Todo List API.
+
+Every transaction that records task changes bumps the version stored in the database
+right before it commits, so the new version becomes visible atomically with the changes
+and is shared by every worker. Reading it is a primary key lookup, much cheaper than
+running and serializing a list query.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from sqlmodel import select
+
+from crud.changes import has_pending_changes
+from models.task import TaskTableVersion
+
+_VERSION_ROW_ID = 1
+
+
+def get_table_version(session: Session) -> int:
+    """Return the current version of the task table (0 before the first write)."""
+    version = session.scalar(
+        select(TaskTableVersion.version).where(TaskTableVersion.id == _VERSION_ROW_ID)
+    )
+    return version or 0
+
+
+def bump_table_version(session: Session) -> None:
+    """Increment the task table version in the session's current transaction."""
+    session.execute(
+        insert(TaskTableVersion)
+        .values(id=_VERSION_ROW_ID, version=1)
+        .on_conflict_do_update(
+            index_elements=[TaskTableVersion.id],
+            set_={"version": TaskTableVersion.version + 1},
+        )
+    )
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_on_commit(session: Session) -> None:
+    """Bump the version once per committed transaction that changed tasks.
+
+    Pending writes are flushed first: they read the version they stamp on the tasks
+    (Task.change_version) before it is bumped.
+    """
+    if has_pending_changes(session):
+        session.flush()
+        bump_table_version(session)
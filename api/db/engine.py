@@ -0,0 +1,218 @@
+"""Database engines and connection settings for the Spirited Todo List API.
+
+The app shares a writer engine and a read engine (and, on the async path, their
+aiosqlite twins) configured from the environment. Each is created on first use, so
+importing the app opens no pool and a process that never touches one does not build
+it. SQLite takes one writer at a time, so the writer pool is small
+(DATABASE_WRITE_POOL_SIZE) and writers queue for it instead of for the database lock,
+while reads get their own, larger pool. Read connections are read-only (PRAGMA
+query_only), and READ_DATABASE_URL can point them to a replica.
+SQL echo is off by default: logging every statement is expensive.
+Every new SQLite connection gets the performance pragmas below; WAL lets readers run
+while a writer commits, and synchronous=NORMAL is durable across crashes of the app in
+WAL mode, only a power loss can drop the last commits.
+"""
+
+import os
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import create_engine
+
+from observability.metrics import (
+    METRICS_ENABLED,
+    TimedAsyncAdaptedQueuePool,
+    TimedQueuePool,
+)
+
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///data/todo.db")
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL",
+    make_url(DATABASE_URL)
+    .set(drivername="sqlite+aiosqlite")
+    .render_as_string(hide_password=False),
+)
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL", DATABASE_URL)
+ASYNC_READ_DATABASE_URL = os.getenv(
+    "ASYNC_READ_DATABASE_URL",
+    make_url(READ_DATABASE_URL)
+    .set(drivername="sqlite+aiosqlite")
+    .render_as_string(hide_password=False),
+)
+DATABASE_ECHO = os.getenv("DATABASE_ECHO", "false").lower() == "true"
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "5"))
+DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "10"))
+DATABASE_WRITE_POOL_SIZE = int(os.getenv("DATABASE_WRITE_POOL_SIZE", "2"))
+DATABASE_WRITE_MAX_OVERFLOW = int(os.getenv("DATABASE_WRITE_MAX_OVERFLOW", "0"))
+DATABASE_POOL_TIMEOUT = float(os.getenv("DATABASE_POOL_TIMEOUT", "30"))
+
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL").upper()
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+# Negative values are in KiB: -64000 is a 64 MB page cache per connection
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-64000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_TEMP_STORE = os.getenv("SQLITE_TEMP_STORE", "MEMORY").upper()
+
+_PRAGMA_CHOICES = {
+    "journal_mode": (
+        SQLITE_JOURNAL_MODE,
+        {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    ),
+    "synchronous": (SQLITE_SYNCHRONOUS, {"OFF", "NORMAL", "FULL", "EXTRA"}),
+    "temp_store": (SQLITE_TEMP_STORE, {"DEFAULT", "FILE", "MEMORY"}),
+}
+for _pragma, (_value, _choices) in _PRAGMA_CHOICES.items():
+    if _value not in _choices:
+        raise ValueError(
+            f"Invalid SQLite {_pragma} {_value!r}, expected one of {sorted(_choices)}."
+        )
+
+SQLITE_PRAGMAS = {
+    "journal_mode": SQLITE_JOURNAL_MODE,
+    "synchronous": SQLITE_SYNCHRONOUS,
+    "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+    "cache_size": SQLITE_CACHE_SIZE,
+    "mmap_size": SQLITE_MMAP_SIZE,
+    "temp_store": SQLITE_TEMP_STORE,
+}
+
+
+def apply_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    """Apply SQLITE_PRAGMAS to a new DBAPI connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+    finally:
+        cursor.close()
+
+
+def apply_read_only_pragma(dbapi_connection, _connection_record) -> None:
+    """Make a new SQLite DBAPI connection reject every write (PRAGMA query_only)."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA query_only = ON")
+    finally:
+        cursor.close()
+
+
+def is_in_memory(url: URL) -> bool:
+    """Tell whether url is an in-memory SQLite database."""
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _engine_options(
+    url: URL,
+    is_async: bool = False,
+    pool_size: int = DATABASE_POOL_SIZE,
+    max_overflow: int = DATABASE_MAX_OVERFLOW,
+) -> dict[str, Any]:
+    """Return the create_engine options for url.
+
+    In-memory SQLite databases use a single connection, so they take no pool settings.
+    Other databases get a queue pool that times the wait for a connection (see
+    observability.metrics) unless metrics are disabled.
+    """
+    options: dict[str, Any] = {"echo": DATABASE_ECHO}
+    if is_in_memory(url):
+        return options
+    options.update(
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=DATABASE_POOL_TIMEOUT,
+    )
+    if METRICS_ENABLED:
+        options["poolclass"] = (
+            TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool
+        )
+    return options
+
+
+def _listen_connect(db_engine: Engine, url: URL, read_only: bool) -> None:
+    """Apply the SQLite pragmas, then the read-only one, to each new connection."""
+    if url.get_backend_name() != "sqlite":
+        return
+    event.listen(db_engine, "connect", apply_sqlite_pragmas)
+    if read_only:
+        event.listen(db_engine, "connect", apply_read_only_pragma)
+
+
+def create_db_engine(
+    url: str = DATABASE_URL,
+    read_only: bool = False,
+    pool_size: int = DATABASE_POOL_SIZE,
+    max_overflow: int = DATABASE_MAX_OVERFLOW,
+) -> Engine:
+    """Create a sync engine for url with the given pool and the SQLite pragmas.
+
+    Connections of a read_only engine reject writes.
+    """
+    parsed = make_url(url)
+    db_engine = create_engine(
+        parsed, **_engine_options(parsed, False, pool_size, max_overflow)
+    )
+    _listen_connect(db_engine, parsed, read_only)
+    return db_engine
+
+
+def create_async_db_engine(
+    url: str = ASYNC_DATABASE_URL,
+    read_only: bool = False,
+    pool_size: int = DATABASE_POOL_SIZE,
+    max_overflow: int = DATABASE_MAX_OVERFLOW,
+) -> AsyncEngine:
+    """Create an async engine for url with the given pool and the SQLite pragmas.
+
+    Connections of a read_only engine reject writes.
+    """
+    parsed = make_url(url)
+    db_engine = create_async_engine(
+        parsed, **_engine_options(parsed, True, pool_size, max_overflow)
+    )
+    _listen_connect(db_engine.sync_engine, parsed, read_only)
+    return db_engine
+
+
+def _shares_writer(read_url: str, write_url: str) -> bool:
+    """Tell whether reads must go to the writer engine.
+
+    An in-memory database only exists in its own connection: a second engine would
+    open another, empty, database.
+    """
+    return read_url == write_url and is_in_memory(make_url(write_url))
+
+
+@lru_cache(maxsize=None)
+def get_engine() -> Engine:
+    """Return the shared writer engine, created on first use."""
+    return create_db_engine(
+        pool_size=DATABASE_WRITE_POOL_SIZE, max_overflow=DATABASE_WRITE_MAX_OVERFLOW
+    )
+
+
+@lru_cache(maxsize=None)
+def get_read_engine() -> Engine:
+    """Return the shared read-only engine, created on first use."""
+    if _shares_writer(READ_DATABASE_URL, DATABASE_URL):
+        return get_engine()
+    return create_db_engine(READ_DATABASE_URL, read_only=True)
+
+
+@lru_cache(maxsize=None)
+def get_async_engine() -> AsyncEngine:
+    """Return the shared aiosqlite writer engine, created on first use."""
+    return create_async_db_engine(
+        pool_size=DATABASE_WRITE_POOL_SIZE, max_overflow=DATABASE_WRITE_MAX_OVERFLOW
+    )
+
+
+@lru_cache(maxsize=None)
+def get_async_read_engine() -> AsyncEngine:
+    """Return the shared aiosqlite read engine, created on first use."""
+    if _shares_writer(ASYNC_READ_DATABASE_URL, ASYNC_DATABASE_URL):
+        return get_async_engine()
+    return create_async_db_engine(ASYNC_READ_DATABASE_URL, read_only=True)
@@ -0,0 +1,136 @@
+"""Versioned schema migrations for the Spirited Todo List API.
+
+SQLModel.metadata.create_all only creates missing tables, it never adds indexes or
+columns to tables that already exist. Each migration below is applied once, in order,
+and the schema version is stored in the SQLite user_version pragma. At startup the
+stored version is read first (see ensure_schema): once it is current, starting the app
+runs no DDL at all. Otherwise the migrations run under the database write lock, so
+workers starting together on an old database migrate it one at a time.
+Migrations must be idempotent, because a fresh database gets the latest tables from
+the first migration and then runs the following ones on top of them.
+"""
+
+import logging
+from typing import Callable
+
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import SQLModel
+
+from db.search import create_search_index, rebuild_search_index
+from db.tombstones import create_tombstone_triggers
+from models.task import DEFAULT_TASK_LIST, Task
+
+logger = logging.getLogger(__name__)
+
+
+def _create_tables(connection: Connection) -> None:
+    """Create all the tables that do not exist yet."""
+    SQLModel.metadata.create_all(connection)
+
+
+def _column_names(connection: Connection, table: str) -> set[str]:
+    """Return the names of the columns of a table in the database."""
+    rows = connection.exec_driver_sql(f"PRAGMA table_info({table})").all()
+    return {row[1] for row in rows}
+
+
+def _create_task_indexes(connection: Connection) -> None:
+    """Add the missing indexes to an existing task table.
+
+    Indexes on columns that a later migration adds are left to that migration.
+    """
+    columns = _column_names(connection, "task")
+    for index in Task.__table__.indexes:
+        if {column.name for column in index.columns} <= columns:
+            index.create(connection, checkfirst=True)
+
+
+def _create_search_index(connection: Connection) -> None:
+    """Add the full-text index to an existing task table and backfill it."""
+    create_search_index(connection)
+    rebuild_search_index(connection)
+
+
+def _add_missing_column(connection: Connection, table: str, column_ddl: str) -> None:
+    """Add a column to an existing table, unless it already has it."""
+    if column_ddl.split()[0] not in _column_names(connection, table):
+        connection.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column_ddl}")
+
+
+def _add_change_tracking(connection: Connection) -> None:
+    """Add the task change versions and the tombstones of deleted tasks.
+
+    Existing tasks get change version 0, so a first sync returns all of them.
+    """
+    _add_missing_column(connection, "task", "change_version INTEGER NOT NULL DEFAULT 0")
+    _add_missing_column(
+        connection,
+        "task_table_version",
+        "tombstone_horizon INTEGER NOT NULL DEFAULT 0",
+    )
+    _create_tables(connection)
+    _create_task_indexes(connection)
+    create_tombstone_triggers(connection)
+
+
+def _add_task_lists(connection: Connection) -> None:
+    """Add the task list of each task; existing tasks go to the default list."""
+    _add_missing_column(
+        connection,
+        "task",
+        f"list_id VARCHAR(64) NOT NULL DEFAULT '{DEFAULT_TASK_LIST}'",
+    )
+    _create_task_indexes(connection)
+
+
+MIGRATIONS: list[tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "create tables", _create_tables),
+    (2, "add task sort and priority indexes", _create_task_indexes),
+    (3, "add task table version", _create_tables),
+    (4, "add task full-text search", _create_search_index),
+    (5, "add task deadline index", _create_task_indexes),
+    (6, "add task change versions and tombstones", _add_change_tracking),
+    (7, "add task lists", _add_task_lists),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(connection: Connection) -> int:
+    """Return the schema version stored in the database (0 for a new or legacy database)."""
+    return connection.exec_driver_sql("PRAGMA user_version").scalar_one()
+
+
+def run_migrations(connection: Connection) -> int:
+    """Apply the pending migrations in order and return the resulting schema version."""
+    version = get_schema_version(connection)
+    for target, description, migrate in MIGRATIONS:
+        if target <= version:
+            continue
+        logger.info("Applying migration %s: %s", target, description)
+        migrate(connection)
+        connection.exec_driver_sql(f"PRAGMA user_version = {target}")
+        version = target
+    return version
+
+
+def ensure_schema(engine: Engine) -> tuple[int, bool]:
+    """Bring the schema of engine's database up to date.
+
+    Returns the schema version and whether migrations ran. The stored version is read
+    on a plain connection first, so an up-to-date database (every start but the first
+    after an upgrade) opens no write transaction and runs no DDL.
+    Otherwise the write lock is taken first and the version read again under it: another
+    worker may have migrated the database in the meantime.
+    """
+    with engine.connect() as connection:
+        version = get_schema_version(connection)
+    if version >= SCHEMA_VERSION:
+        return version, False
+    with engine.connect() as connection:
+        # pysqlite sends no BEGIN before DDL or PRAGMA statements: begin explicitly
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+        migrated = get_schema_version(connection) < SCHEMA_VERSION
+        version = run_migrations(connection)
+        connection.commit()
+    return version, migrated
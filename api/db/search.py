@@ -0,0 +1,81 @@
+"""Full-text search index of the task table for the Spirited Todo List API.
+
+task_fts is an external content FTS5 table over task.title and task.description: it
+stores only the index and reads the text back from the task table. Triggers on the task
+table keep it in sync with every write, including bulk writes and SQL run outside crud.
+The index is created with the task table, and by a migration on existing databases.
+
+Rebuild the index of an existing database (from the api folder):
+    python -m db.search
+"""
+
+import logging
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+
+from models.task import Task
+
+logger = logging.getLogger(__name__)
+
+TASK_FTS_TABLE = "task_fts"
+
+_SEARCH_INDEX_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TASK_FTS_TABLE} USING fts5("
+    "title, description, content='task', content_rowid='id', "
+    "tokenize='porter unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_insert AFTER INSERT ON task BEGIN "
+    f"INSERT INTO {TASK_FTS_TABLE} (rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS task_fts_delete AFTER DELETE ON task BEGIN "
+    f"INSERT INTO {TASK_FTS_TABLE} ({TASK_FTS_TABLE}, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    # Only a change of the indexed columns touches the index
+    "CREATE TRIGGER IF NOT EXISTS task_fts_update "
+    "AFTER UPDATE OF title, description ON task BEGIN "
+    f"INSERT INTO {TASK_FTS_TABLE} ({TASK_FTS_TABLE}, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    f"INSERT INTO {TASK_FTS_TABLE} (rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+)
+
+
+def create_search_index(connection: Connection) -> None:
+    """Create the full-text index of the task table and its triggers if missing."""
+    for statement in _SEARCH_INDEX_DDL:
+        connection.exec_driver_sql(statement)
+
+
+def rebuild_search_index(connection: Connection) -> None:
+    """Rebuild the full-text index from the current content of the task table."""
+    connection.exec_driver_sql(
+        f"INSERT INTO {TASK_FTS_TABLE} ({TASK_FTS_TABLE}) VALUES ('rebuild')"
+    )
+
+
+@event.listens_for(Task.__table__, "after_create")
+def _create_with_task_table(  # pylint: disable=unused-argument
+    target, connection: Connection, **kw
+) -> None:
+    """Create the index together with the task table."""
+    create_search_index(connection)
+
+
+def main() -> None:
+    """Create the full-text index if missing and backfill it from the task table."""
+    # pylint: disable=import-outside-toplevel
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    from db.engine import get_engine
+
+    logging.basicConfig(level=logging.INFO)
+    with get_engine().begin() as connection:
+        create_search_index(connection)
+        rebuild_search_index(connection)
+        count = connection.exec_driver_sql("SELECT count(*) FROM task").scalar_one()
+    logger.info("Rebuilt the full-text index of %s tasks", count)
+
+
+if __name__ == "__main__":
+    main()
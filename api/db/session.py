@@ -0,0 +1,104 @@
+"""Database sessions for the Spirited Todo List API.
+
+The task router runs on one of two database paths, selected by DATABASE_ASYNC:
+- sync (default): a sync Session, with the CRUD functions run in the threadpool;
+- async: an AsyncSession on an aiosqlite engine, awaited on the event loop.
+The sync engine and get_sync_session are always available for tests and scripts.
+
+Writes take a session on the writer pool (get_session) and reads a session on the
+read-only pool (get_read_session). When READ_DATABASE_URL is a replica, a read may miss
+the client's own last writes; clients that need them send X-Read-Your-Writes: true to
+read from the writer instead.
+"""
+
+import os
+from typing import Callable
+
+from fastapi import Header
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from db.engine import (
+    get_async_engine,
+    get_async_read_engine,
+    get_engine,
+    get_read_engine,
+)
+
+DATABASE_ASYNC = os.getenv("DATABASE_ASYNC", "false").lower() == "true"
+
+
+def get_sync_session():
+    """Yield a sync database session on the writer pool."""
+    with Session(get_engine()) as session:
+        yield session
+
+
+def get_sync_read_session():
+    """Yield a sync database session on the read-only pool."""
+    with Session(get_read_engine()) as session:
+        yield session
+
+
+async def get_async_session():
+    """Yield an async database session on the writer pool.
+
+    Objects are not expired on commit, so that a response can be built from them
+    without lazy loads, which an AsyncSession cannot do implicitly.
+    """
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
+
+
+async def get_async_read_session():
+    """Yield an async database session on the read-only pool."""
+    async with AsyncSession(get_async_read_engine(), expire_on_commit=False) as session:
+        yield session
+
+
+def get_session_factory() -> Callable[[], Session]:
+    """Return a function opening sync sessions, for responses that outlive the request.
+
+    Dependencies with yield are closed before the body of a StreamingResponse is sent,
+    so a streamed body opens and closes its own session. The sync engine serves it on
+    both database paths: the body is iterated in the threadpool.
+    """
+    return lambda: Session(get_engine())
+
+
+def get_read_session_factory() -> Callable[[], Session]:
+    """Return a function opening sync read-only sessions (see get_session_factory)."""
+    return lambda: Session(get_read_engine())
+
+
+async def get_session():
+    """Yield a writer database session for the configured path (see DATABASE_ASYNC)."""
+    if DATABASE_ASYNC:
+        async for session in get_async_session():
+            yield session
+        return
+    for session in get_sync_session():
+        yield session
+
+
+async def get_read_session(
+    read_your_writes: bool = Header(
+        False,
+        alias="X-Read-Your-Writes",
+        description="Read from the writer database, which has every committed write.",
+    ),
+):
+    """Yield a read-only database session for the configured path.
+
+    With read_your_writes, yield a writer session instead (see get_session).
+    """
+    if read_your_writes:
+        async for session in get_session():
+            yield session
+        return
+    if DATABASE_ASYNC:
+        async for session in get_async_read_session():
+            yield session
+        return
+    for session in get_sync_read_session():
+        yield session
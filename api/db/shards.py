@@ -0,0 +1,131 @@
+"""Horizontal sharding of tasks across SQLite databases for the Spirited Todo List API.
+
+SQLite takes one writer at a time per database. With SHARD_DATABASE_URLS set (a comma
+separated list of database URLs), tasks are partitioned by task list across these
+databases instead, and each shard has its own writer. A consistent-hash ring places
+every task list on a shard; each shard owns SHARD_VIRTUAL_NODES points of the ring, so
+appending a shard to the list moves about 1/N of the task lists, all to the new shard.
+Moving their rows is left to an offline job.
+
+Task IDs carry their shard: the tasks of shard i have IDs equal to i + 1 modulo
+SHARD_ID_STRIDE, so a task is found from its ID alone and IDs stay unique across shards.
+
+Every shard gets the schema migrations, a small writer pool and a read-only pool, like
+the single database (see db.engine).
+"""
+
+import bisect
+import hashlib
+import os
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from db.engine import (
+    DATABASE_WRITE_MAX_OVERFLOW,
+    DATABASE_WRITE_POOL_SIZE,
+    create_db_engine,
+)
+from db.migrations import ensure_schema
+from db.tombstones import compact_tombstones
+
+SHARD_DATABASE_URLS = [
+    url.strip()
+    for url in os.getenv("SHARD_DATABASE_URLS", "").split(",")
+    if url.strip()
+]
+SHARD_VIRTUAL_NODES = int(os.getenv("SHARD_VIRTUAL_NODES", "128"))
+# Upper bound of the number of shards, fixed once tasks exist: it is encoded in task IDs
+SHARD_ID_STRIDE = 1024
+
+# Key of the shard index in the info of a shard session (see ShardSet.session)
+SHARD_INFO_KEY = "task_shard"
+
+
+def _ring_hash(key: str) -> int:
+    """Hash a key to a point of the ring, the same way in every process."""
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent-hash ring of shard indexes, with virtual_nodes points per shard."""
+
+    def __init__(self, shard_count: int, virtual_nodes: int = SHARD_VIRTUAL_NODES):
+        points = sorted(
+            (_ring_hash(f"shard-{index}-{node}"), index)
+            for index in range(shard_count)
+            for node in range(virtual_nodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._shards = [index for _, index in points]
+
+    def shard_for(self, key: str) -> int:
+        """Return the shard of a key: the one owning the next point of the ring."""
+        position = bisect.bisect(self._hashes, _ring_hash(key))
+        return self._shards[position % len(self._shards)]
+
+
+class ShardSet:
+    """The shard databases, with a writer and a read-only engine for each one."""
+
+    def __init__(self, urls: list[str], virtual_nodes: int = SHARD_VIRTUAL_NODES):
+        if not 0 < len(urls) <= SHARD_ID_STRIDE:
+            raise ValueError(f"Expected 1 to {SHARD_ID_STRIDE} shard database URLs.")
+        self.urls = list(urls)
+        self.ring = HashRing(len(urls), virtual_nodes)
+        self.engines: list[Engine] = [
+            create_db_engine(
+                url,
+                pool_size=DATABASE_WRITE_POOL_SIZE,
+                max_overflow=DATABASE_WRITE_MAX_OVERFLOW,
+            )
+            for url in urls
+        ]
+        self.read_engines: list[Engine] = [
+            create_db_engine(url, read_only=True) for url in urls
+        ]
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def shard_for_list(self, list_id: str) -> int:
+        """Return the index of the shard holding a task list."""
+        return self.ring.shard_for(list_id)
+
+    def shard_for_task(self, task_id: int) -> Optional[int]:
+        """Return the index of the shard holding a task, or None for an ID of no shard."""
+        index = (task_id - 1) % SHARD_ID_STRIDE
+        return index if task_id > 0 and index < len(self.urls) else None
+
+    def session(self, index: int) -> Session:
+        """Open a session on the writer pool of a shard."""
+        return Session(self.engines[index], info={SHARD_INFO_KEY: index})
+
+    def read_session(self, index: int) -> Session:
+        """Open a session on the read-only pool of a shard."""
+        return Session(self.read_engines[index])
+
+    def migrate(self) -> None:
+        """Bring the schema of every shard up to date and compact its old tombstones."""
+        for engine in self.engines:
+            ensure_schema(engine)
+            with engine.begin() as connection:
+                compact_tombstones(connection)
+
+    def dispose(self) -> None:
+        """Close the connections of every shard."""
+        for engine in self.engines + self.read_engines:
+            engine.dispose()
+
+
+@lru_cache(maxsize=None)
+def get_shard_set() -> Optional[ShardSet]:
+    """Return the shards of SHARD_DATABASE_URLS, or None when sharding is off."""
+    return ShardSet(SHARD_DATABASE_URLS) if SHARD_DATABASE_URLS else None
+
+
+def get_task_shards() -> Optional[ShardSet]:
+    """Dependency returning the task shards, or None on a single database."""
+    return get_shard_set()
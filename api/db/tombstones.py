@@ -0,0 +1,99 @@
+"""Tombstones of deleted tasks for delta sync in the Spirited Todo List API.
+
+A trigger on the task table records a tombstone for every deleted task, including bulk
+deletes and SQL run outside crud, with the table version of the delete. A task created
+again with the ID of a deleted one (SQLite reuses the highest ID) drops its tombstone.
+
+Tombstones older than TOMBSTONE_RETENTION_DAYS are compacted at startup, or with
+(from the api folder):
+    python -m db.tombstones
+Compaction moves the tombstone horizon of the task table version past them: sync tokens
+from before the horizon may have missed deletes, so they are rejected.
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, event, func, select, update
+from sqlalchemy.engine import Connection
+
+from models.task import NEXT_TABLE_VERSION_SQL, Task, TaskTableVersion, TaskTombstone
+
+logger = logging.getLogger(__name__)
+
+TOMBSTONE_RETENTION_DAYS = float(os.getenv("TOMBSTONE_RETENTION_DAYS", "30"))
+
+_TOMBSTONE_DDL = (
+    "CREATE TRIGGER IF NOT EXISTS task_tombstone_delete AFTER DELETE ON task BEGIN "
+    "INSERT OR REPLACE INTO task_tombstone (id, change_version, deleted_at) "
+    f"VALUES (old.id, {NEXT_TABLE_VERSION_SQL}, "
+    # Stored like SQLAlchemy stores datetimes, so they compare with bound datetimes
+    "strftime('%Y-%m-%d %H:%M:%f000', 'now')); END",
+    "CREATE TRIGGER IF NOT EXISTS task_tombstone_insert AFTER INSERT ON task BEGIN "
+    "DELETE FROM task_tombstone WHERE id = new.id; END",
+)
+
+
+def create_tombstone_triggers(connection: Connection) -> None:
+    """Create the triggers writing the tombstones of the task table if missing."""
+    for statement in _TOMBSTONE_DDL:
+        connection.exec_driver_sql(statement)
+
+
+def compact_tombstones(
+    connection: Connection, retention_days: float = TOMBSTONE_RETENTION_DAYS
+) -> int:
+    """Delete the tombstones older than retention_days and return how many were deleted.
+
+    Every tombstone up to the version of the newest expired one is deleted, and the
+    tombstone horizon is moved past that version.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    newest: Optional[int] = connection.scalar(
+        select(func.max(TaskTombstone.change_version)).where(
+            TaskTombstone.deleted_at < cutoff
+        )
+    )
+    if newest is None:
+        return 0
+    deleted = connection.execute(
+        delete(TaskTombstone).where(TaskTombstone.change_version <= newest)
+    ).rowcount
+    connection.execute(
+        update(TaskTableVersion)
+        .where(TaskTableVersion.tombstone_horizon <= newest)
+        .values(tombstone_horizon=newest + 1)
+    )
+    return deleted
+
+
+@event.listens_for(Task.__table__, "after_create")
+def _create_with_task_table(  # pylint: disable=unused-argument
+    target, connection: Connection, **kw
+) -> None:
+    """Create the triggers together with the task table."""
+    create_tombstone_triggers(connection)
+
+
+def main() -> None:
+    """Compact the expired tombstones of the database."""
+    # pylint: disable=import-outside-toplevel
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    from db.engine import get_engine
+
+    # Read again: the module was imported before .env was loaded
+    retention_days = float(
+        os.getenv("TOMBSTONE_RETENTION_DAYS", str(TOMBSTONE_RETENTION_DAYS))
+    )
+    logging.basicConfig(level=logging.INFO)
+    with get_engine().begin() as connection:
+        deleted = compact_tombstones(connection, retention_days)
+    logger.info("Compacted %s task tombstones", deleted)
+
+
+if __name__ == "__main__":
+    main()
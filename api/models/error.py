@@ -1,6 +1,7 @@
 """Error handling for the API."""
 
 from enum import Enum
+from typing import Optional
 
 from fastapi import HTTPException
 
@@ -11,11 +12,21 @@ class ErrorCode(str, Enum):
     TASK_NOT_FOUND = "TASK_NOT_FOUND"
     HIGH_PRIORITY_LIMIT = "HIGH_PRIORITY_LIMIT"
     INVALID_INPUT = "INVALID_INPUT"
+    SYNC_TOKEN_EXPIRED = "SYNC_TOKEN_EXPIRED"
+    NOT_SUPPORTED_WITH_SHARDING = "NOT_SUPPORTED_WITH_SHARDING"
+    OVERLOADED = "OVERLOADED"
     # Add more as needed
 
 
-def error_response(status_code: int, code: ErrorCode, message: str) -> HTTPException:
+def error_response(
+    status_code: int,
+    code: ErrorCode,
+    message: str,
+    headers: Optional[dict[str, str]] = None,
+) -> HTTPException:
     """Helper to create a structured HTTPException with error code and message."""
     return HTTPException(
-        status_code=status_code, detail={"msg": message, "error_code": code}
+        status_code=status_code,
+        detail={"msg": message, "error_code": code},
+        headers=headers,
     )
@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 from enum import IntEnum
 from typing import Optional
 
-from sqlalchemy import Column, Integer
+from sqlalchemy import Column, Index, Integer, text
 from sqlmodel import Field, SQLModel
 
 
@@ -16,8 +16,40 @@ class Priority(IntEnum):
     HIGH = 3  # High priority
 
 
+# Task list of the tasks created without one
+DEFAULT_TASK_LIST = "default"
+
+# The version the task table gets when the current write transaction commits (see
+# crud.versions, which bumps it right before the commit, after the last write)
+NEXT_TABLE_VERSION_SQL = (
+    "(SELECT coalesce(max(version), 0) + 1 FROM task_table_version WHERE id = 1)"
+)
+
+
 class Task(SQLModel, table=True):
-    """Task model."""
+    """Task model.
+
+    Every sort option of the task list has a composite index ending with id, which
+    serves both sort directions, keyset seeks and the list filters. The deadline index
+    serves the deadline range filters, and the (list_id, priority) index the HIGH
+    priority limit check, which applies per task list.
+
+    list_id is the task list of the task. Lists are the partition key of sharding (see
+    db.shards): a list lives in a single database.
+
+    change_version is the table version of the transaction that last wrote the task,
+    set by the INSERT and UPDATE statements themselves. Its index serves delta sync.
+    """
+
+    __table_args__ = (
+        Index("ix_task_priority_id", "priority", "id"),
+        Index("ix_task_created_at_id", "created_at", "id"),
+        Index("ix_task_updated_at_id", "updated_at", "id"),
+        Index("ix_task_title_id", "title", "id"),
+        Index("ix_task_deadline_id", "deadline", "id"),
+        Index("ix_task_change_version_id", "change_version", "id"),
+        Index("ix_task_list_id_priority_id", "list_id", "priority", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     title: str
@@ -32,3 +64,52 @@ class Task(SQLModel, table=True):
     deadline: Optional[datetime] = Field(
         default=None, description="Optional deadline for the task (UTC ISO format)"
     )
+    list_id: str = Field(
+        default=DEFAULT_TASK_LIST,
+        max_length=64,
+        sa_column_kwargs={"server_default": DEFAULT_TASK_LIST},
+    )
+    change_version: Optional[int] = Field(
+        default=None,
+        sa_column=Column(
+            Integer,
+            nullable=False,
+            default=text(NEXT_TABLE_VERSION_SQL),
+            onupdate=text(NEXT_TABLE_VERSION_SQL),
+            server_default=text("0"),
+        ),
+    )
+
+
+class TaskTableVersion(SQLModel, table=True):
+    """Version of the task table, bumped in the transaction of every write to it.
+
+    Holds a single row. The version only grows, so it identifies a state of the
+    table across every worker sharing the database (used for list ETags).
+    """
+
+    __tablename__ = "task_table_version"
+
+    id: int = Field(default=1, primary_key=True)
+    version: int = 0
+    # Tombstones of versions below this one were compacted (see db.tombstones)
+    tombstone_horizon: int = Field(
+        default=0, sa_column_kwargs={"server_default": text("0")}
+    )
+
+
+class TaskTombstone(SQLModel, table=True):
+    """Tombstone of a deleted task, kept for delta sync until compacted.
+
+    Written by a trigger on every delete of a task, and removed when a task is created
+    again with the same ID. change_version is the table version of the delete.
+    """
+
+    __tablename__ = "task_tombstone"
+    __table_args__ = (
+        Index("ix_task_tombstone_change_version_id", "change_version", "id"),
+    )
+
+    id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    change_version: int
+    deleted_at: datetime
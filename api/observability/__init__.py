@@ -0,0 +1 @@
+"""Observability of the Spirited Todo List API: metrics and database instrumentation."""
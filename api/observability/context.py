@@ -0,0 +1,100 @@
+"""Request context of the Spirited Todo List API, for code that runs below the routes.
+
+RequestContextMiddleware makes the current request available through a context
+variable, which follows the request into the threadpool and into run_sync, so engine
+hooks can tell which route a statement was run for. It also counts the SQL statements
+of each request; with DEBUG_ENDPOINTS=true the count is sent in the X-Query-Count
+response header. The header goes out with the response head, so statements run while a
+streamed body is sent are not in it.
+"""
+
+import os
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from starlette.datastructures import MutableHeaders
+
+from observability.statements import add_statement_listener
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+
+
+class RequestContext:  # pylint: disable=too-few-public-methods
+    """The ASGI scope of a request and the number of SQL statements it ran so far."""
+
+    __slots__ = ("scope", "statements")
+
+    def __init__(self, scope: dict[str, Any]):
+        self.scope = scope
+        self.statements = 0
+
+
+_request_context: ContextVar[Optional[RequestContext]] = ContextVar(
+    "request_context", default=None
+)
+
+
+def debug_endpoints_enabled() -> bool:
+    """Tell whether debug routes and headers are served (DEBUG_ENDPOINTS=true)."""
+    return os.getenv("DEBUG_ENDPOINTS", "false").lower() == "true"
+
+
+def current_route() -> Optional[str]:
+    """Return "METHOD /route/{template}" of the current request, or None outside one.
+
+    Falls back to the request path before the request is routed.
+    """
+    context = _request_context.get()
+    if context is None:
+        return None
+    scope = context.scope
+    route = scope.get("route")
+    return f"{scope['method']} {getattr(route, 'path', scope['path'])}"
+
+
+def current_statement_count() -> Optional[int]:
+    """Return the number of SQL statements of the current request, or None outside one."""
+    context = _request_context.get()
+    return None if context is None else context.statements
+
+
+def _count_statement(
+    conn, cursor, statement, parameters, duration
+):  # pylint: disable=unused-argument,too-many-arguments
+    context = _request_context.get()
+    if context is not None:
+        context.statements += 1
+
+
+def _with_query_count(send, context: RequestContext):
+    """Wrap an ASGI send to add the statement count of the request to its headers."""
+
+    async def send_with_query_count(message):
+        if message["type"] == "http.response.start":
+            MutableHeaders(scope=message)[QUERY_COUNT_HEADER] = str(context.statements)
+        await send(message)
+
+    return send_with_query_count
+
+
+class RequestContextMiddleware:  # pylint: disable=too-few-public-methods
+    """ASGI middleware exposing the current HTTP request (see current_route)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        context = RequestContext(scope)
+        token = _request_context.set(context)
+        if debug_endpoints_enabled():
+            send = _with_query_count(send, context)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_context.reset(token)
+
+
+add_statement_listener(_count_statement)
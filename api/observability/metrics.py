@@ -0,0 +1,210 @@
+"""Prometheus metrics of the Spirited Todo List API.
+
+Collected in-process, always, at the cost of a few counter and histogram updates per
+request and per SQL statement; they are only rendered when GET /metrics is scraped.
+- HTTP: request latency by method, route template and status, in-flight requests;
+- database pool: checkouts, checked out connections, wait for a connection, timeouts;
+- SQL: execution time by statement kind (verb and main table), on every engine;
+- admission control: admitted and queued requests, wait for a slot and rejections, by
+  kind of route (see routers.admission).
+
+With several worker processes, set PROMETHEUS_MULTIPROC_DIR to an empty directory to
+aggregate the metrics of every worker (see prometheus_client's multiprocess mode).
+Set METRICS_ENABLED=false to skip collecting them altogether.
+"""
+
+import os
+import re
+import time
+from functools import lru_cache
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from observability.statements import add_statement_listener
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Latency buckets in seconds, from a cached read to a slow bulk write
+_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+_SQL_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1, 0.5, 1)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency.",
+    ["method", "route", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being served.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total", "Connections checked out of the database pool."
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the database pool.",
+    multiprocess_mode="livesum",
+)
+POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a connection from the database pool.",
+    buckets=_SQL_BUCKETS,
+)
+POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total", "Waits for a pool connection that timed out."
+)
+SQL_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "SQL statement execution time, by statement kind.",
+    ["statement"],
+    buckets=_SQL_BUCKETS,
+)
+
+ADMISSION_ACTIVE = Gauge(
+    "admission_active_requests",
+    "Requests admitted and being served, by kind of route.",
+    ["kind"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "admission_queue_depth",
+    "Requests waiting for an admission slot, by kind of route.",
+    ["kind"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_WAIT = Histogram(
+    "admission_wait_seconds",
+    "Time spent waiting for an admission slot, by kind of route.",
+    ["kind"],
+    buckets=_LATENCY_BUCKETS,
+)
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total",
+    "Requests shed with a 503, by kind of route and reason (timeout, queue_full).",
+    ["kind", "reason"],
+)
+
+_STATEMENT_TABLE = re.compile(
+    r"\b(?:FROM|INTO|UPDATE|TABLE)\s+[\"`]?(\w+)", re.IGNORECASE
+)
+
+
+def statement_kind(statement: str) -> str:
+    """Return a low-cardinality label for a SQL statement: its verb and main table.
+
+    Parameter values and IN list lengths would make every statement text unique.
+    """
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    match = _STATEMENT_TABLE.search(statement)
+    return f"{verb} {match.group(1)}" if match else verb
+
+
+@lru_cache(maxsize=1024)
+def _statement_histogram(statement: str):
+    """Return the SQL_DURATION series of a statement text, cached: apps reuse texts."""
+    return SQL_DURATION.labels(statement_kind(statement))
+
+
+def render_metrics() -> bytes:
+    """Render the metrics in the Prometheus text format, of every worker if configured."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+class _TimedGetMixin:  # pylint: disable=too-few-public-methods
+    """Pool mixin timing the wait for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - started)
+
+
+class TimedQueuePool(_TimedGetMixin, QueuePool):
+    """QueuePool recording the wait for a connection in the pool metrics."""
+
+
+class TimedAsyncAdaptedQueuePool(_TimedGetMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool recording the wait for a connection in the pool metrics."""
+
+
+class MetricsMiddleware:  # pylint: disable=too-few-public-methods
+    """ASGI middleware recording the latency and the number of in-flight requests.
+
+    Requests are labelled by route template (/tasks/{task_id}), not by path, so the
+    number of series stays bounded; requests matching no route share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                method, getattr(route, "path", "unmatched"), str(status)
+            ).observe(time.perf_counter() - started)
+
+
+def _observe_statement(
+    conn, cursor, statement, parameters, duration
+):  # pylint: disable=unused-argument,too-many-arguments
+    _statement_histogram(statement).observe(duration)
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    # pylint: disable=unused-argument
+    POOL_CHECKOUTS.inc()
+    POOL_CHECKED_OUT.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record):  # pylint: disable=unused-argument
+    POOL_CHECKED_OUT.dec()
+
+
+if METRICS_ENABLED:
+    add_statement_listener(_observe_statement)
+    event.listen(Pool, "checkout", _on_checkout)
+    event.listen(Pool, "checkin", _on_checkin)
@@ -0,0 +1,136 @@
+"""Slow query log of the Spirited Todo List API.
+
+Every SQL statement slower than SLOW_QUERY_THRESHOLD_MS is logged (logger
+"observability.slow_queries", at WARNING) with its parameters, duration, the route of
+the request that ran it, and, on SQLite, its EXPLAIN QUERY PLAN. The plan is read on
+the same connection right after the statement, so it is the plan that was used.
+
+Statistics are also kept per statement shape (the statement text, with IN lists
+collapsed) since startup, for the debug endpoint listing the slowest shapes. At most
+MAX_STATEMENT_SHAPES shapes are tracked. A negative threshold disables the log.
+"""
+
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Optional
+
+from sqlalchemy.engine import Connection
+
+from observability.context import current_route
+from observability.statements import add_statement_listener
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100"))
+MAX_STATEMENT_SHAPES = int(os.getenv("MAX_STATEMENT_SHAPES", "500"))
+_MAX_LOGGED_PARAMETERS = 1000
+
+_IN_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+@dataclass
+class StatementShapeStats:
+    """Execution statistics of one statement shape."""
+
+    statement: str
+    calls: int = 0
+    slow_calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_slow_route: Optional[str] = None
+    last_slow_plan: list[str] = field(default_factory=list)
+
+    @property
+    def mean_ms(self) -> float:
+        """Mean duration of the statement, in milliseconds."""
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+_lock = threading.Lock()
+_shapes: dict[str, StatementShapeStats] = {}
+
+
+@lru_cache(maxsize=1024)
+def statement_shape(statement: str) -> str:
+    """Return the shape of a statement: IN lists of any length and whitespace collapsed."""
+    return _WHITESPACE.sub(" ", _IN_LIST.sub("(?, ...)", statement)).strip()
+
+
+def explain_query_plan(conn: Connection, statement: str, parameters: Any) -> list[str]:
+    """Return the SQLite query plan of a statement, run on the DBAPI connection.
+
+    The DBAPI connection is used directly so that the EXPLAIN is not itself timed.
+    Returns an empty plan for statements that cannot be explained.
+    """
+    if conn.dialect.name != "sqlite" or not statement.lstrip().upper().startswith(
+        _EXPLAINABLE
+    ):
+        return []
+    if isinstance(parameters, list):  # executemany: explain with the first row
+        parameters = parameters[0] if parameters else ()
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[3] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def get_slowest_statements(limit: int = 10) -> list[StatementShapeStats]:
+    """Return the statistics of the limit statement shapes with the highest max duration."""
+    with _lock:
+        shapes = sorted(_shapes.values(), key=lambda stats: stats.max_ms, reverse=True)
+        return [StatementShapeStats(**vars(stats)) for stats in shapes[:limit]]
+
+
+def reset_statement_stats() -> None:
+    """Forget the statistics of every statement shape."""
+    with _lock:
+        _shapes.clear()
+
+
+def _record(
+    conn, cursor, statement, parameters, duration
+):  # pylint: disable=unused-argument,too-many-arguments
+    """Update the statistics of the statement's shape, and log it if it was slow."""
+    duration_ms = duration * 1000
+    is_slow = 0 <= SLOW_QUERY_THRESHOLD_MS <= duration_ms
+    route = plan = None
+    if is_slow:
+        route = current_route()
+        try:
+            plan = explain_query_plan(conn, statement, parameters)
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.debug("Could not explain a slow statement", exc_info=True)
+            plan = []
+        logger.warning(
+            "Slow query (%.1f ms, route %s): %s | parameters: %.*s | plan: %s",
+            duration_ms,
+            route or "-",
+            statement,
+            _MAX_LOGGED_PARAMETERS,
+            repr(parameters),
+            "; ".join(plan) or "-",
+        )
+    shape = statement_shape(statement)
+    with _lock:
+        stats = _shapes.get(shape)
+        if stats is None:
+            if len(_shapes) >= MAX_STATEMENT_SHAPES:
+                return
+            stats = _shapes[shape] = StatementShapeStats(shape)
+        stats.calls += 1
+        stats.total_ms += duration_ms
+        stats.max_ms = max(stats.max_ms, duration_ms)
+        if is_slow:
+            stats.slow_calls += 1
+            stats.last_slow_route, stats.last_slow_plan = route, plan
+
+
+add_statement_listener(_record)
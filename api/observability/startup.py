@@ -0,0 +1,43 @@
+"""Startup timing report of the Spirited Todo List API.
+
+The time a new worker takes to serve its first request is spent importing the app, then
+in the lifespan startup: creating the engine and opening its first connection, checking
+(and migrating) the schema, compacting tombstones. Each phase is timed once, the report
+is logged at INFO when the startup ends, and GET /debug/startup serves it with
+DEBUG_ENDPOINTS=true.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+_phases: dict[str, float] = {}
+
+
+def record_phase(name: str, seconds: float) -> None:
+    """Record the duration of a startup phase, in seconds."""
+    _phases[name] = seconds * 1000
+
+
+@contextmanager
+def startup_phase(name: str) -> Iterator[None]:
+    """Time the block as a startup phase."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - started)
+
+
+def startup_report() -> dict[str, float]:
+    """Return the duration of each startup phase so far, in milliseconds, in order."""
+    return dict(_phases)
+
+
+def log_startup_report() -> None:
+    """Log the duration of each startup phase and their total."""
+    phases = ", ".join(f"{name} {ms:.1f} ms" for name, ms in _phases.items())
+    logger.info("Startup took %.1f ms: %s", sum(_phases.values()), phases)
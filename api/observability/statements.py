@@ -0,0 +1,56 @@
+"""Timing of the SQL statements run by the Spirited Todo List API.
+
+Cursor events on every engine measure each statement once and hand the duration to the
+registered listeners (metrics, slow query log, per-request statement count). The events
+are registered with the first listener. The slow query log and the statement count
+register at import, so in the app every statement is timed, whatever METRICS_ENABLED
+and SLOW_QUERY_THRESHOLD_MS are: two perf_counter calls per statement.
+"""
+
+import time
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+# listener(connection, dbapi cursor, statement, parameters, duration in seconds)
+StatementListener = Callable[[Connection, Any, str, Any, float], None]
+
+_STARTED_KEY = "statement_started"
+
+_listeners: list[StatementListener] = []
+
+
+def add_statement_listener(listener: StatementListener) -> None:
+    """Register a function called with the duration of every SQL statement."""
+    if not _listeners:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _on_error)
+    _listeners.append(listener)
+
+
+def remove_statement_listener(listener: StatementListener) -> None:
+    """Unregister a function added with add_statement_listener."""
+    _listeners.remove(listener)
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):  # pylint: disable=unused-argument,too-many-arguments
+    conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):  # pylint: disable=unused-argument,too-many-arguments
+    duration = time.perf_counter() - conn.info[_STARTED_KEY].pop()
+    for listener in _listeners:
+        listener(conn, cursor, statement, parameters, duration)
+
+
+def _on_error(exception_context) -> None:
+    """Drop the start time of a statement that failed, as after_cursor_execute won't."""
+    conn = exception_context.connection
+    if conn is not None and conn.info.get(_STARTED_KEY):
+        conn.info[_STARTED_KEY].pop()
@@ -0,0 +1,161 @@
+"""Admission control of the task routes of the Spirited Todo List API.
+
+Under overload, requests would otherwise pile up without limit: in the threadpool, then
+on the SQLite write lock, and every request's latency would keep growing. Instead, the
+task routes are admitted through two limiters, one for the writes and one for the
+reads, each serving at most its limit of requests at once. A request past the limit
+waits in a bounded queue for up to ADMISSION_QUEUE_TIMEOUT_MS, then is shed with a fast
+503 and a Retry-After header, so clients back off and the admitted requests stay fast.
+
+Waiting requests hold no thread: each waits on a future of its own event loop, handed
+a slot by the request that releases it, first come first served. The NDJSON import
+holds a write slot for its whole upload, as it writes batch after batch. The streaming
+reads (export, events) are not limited: they would hold a slot for as long as the
+client reads. A limit of 0 turns admission control off for its kind of route.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from models.error import ErrorCode, error_response
+from observability.metrics import (
+    ADMISSION_ACTIVE,
+    ADMISSION_QUEUE_DEPTH,
+    ADMISSION_REJECTED,
+    ADMISSION_WAIT,
+    METRICS_ENABLED,
+)
+
+ADMISSION_WRITE_LIMIT = int(os.getenv("ADMISSION_WRITE_LIMIT", "4"))
+ADMISSION_READ_LIMIT = int(os.getenv("ADMISSION_READ_LIMIT", "32"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "256"))
+ADMISSION_QUEUE_TIMEOUT_MS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", "1000"))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+
+
+def _grant(waiter: asyncio.Future) -> None:
+    """Wake a waiter with its slot, unless it gave up in the meantime."""
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class AdmissionLimiter:
+    """Limit of the requests of one kind served at once, with a bounded wait queue."""
+
+    def __init__(
+        self,
+        kind: str,
+        limit: int,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT_MS / 1000,
+    ):
+        self.kind = kind
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of requests waiting for a slot."""
+        return len(self._waiters)
+
+    def _observe(self) -> None:
+        if METRICS_ENABLED:
+            ADMISSION_ACTIVE.labels(self.kind).set(self.active)
+            ADMISSION_QUEUE_DEPTH.labels(self.kind).set(len(self._waiters))
+
+    def _reject(self, reason: str) -> bool:
+        if METRICS_ENABLED:
+            ADMISSION_REJECTED.labels(self.kind, reason).inc()
+        return False
+
+    async def acquire(self) -> bool:
+        """Wait for a slot; return False if none freed up within the queue timeout."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.active < self.limit and not self._waiters:
+                self.active += 1
+                self._observe()
+                return True
+            if len(self._waiters) >= self.max_queue:
+                return self._reject("queue_full")
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+            self._observe()
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter[1], self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                is_queued = waiter in self._waiters
+                if is_queued:
+                    self._waiters.remove(waiter)
+                    self._observe()
+            if not is_queued:
+                # The slot was handed over as the wait ended: keep it, or pass it on
+                if isinstance(e, asyncio.CancelledError):
+                    self.release()
+                    raise
+            elif isinstance(e, asyncio.TimeoutError):
+                return self._reject("timeout")
+            else:
+                raise
+        finally:
+            if METRICS_ENABLED:
+                ADMISSION_WAIT.labels(self.kind).observe(time.perf_counter() - started)
+        return True
+
+    def release(self) -> None:
+        """Free a slot, handing it to the longest waiting request if there is one."""
+        with self._lock:
+            if self._waiters:
+                loop, waiter = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(_grant, waiter)
+                except RuntimeError:  # the loop closed; its request is gone
+                    self.active -= 1
+            else:
+                self.active -= 1
+            self._observe()
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """Serve the block within the limit, or raise a 503 if no slot freed up in time."""
+        if self.limit <= 0:
+            yield
+            return
+        if not await self.acquire():
+            raise error_response(
+                503,
+                ErrorCode.OVERLOADED,
+                f"Too many {self.kind} requests, retry later.",
+                headers={"Retry-After": str(ADMISSION_RETRY_AFTER_SECONDS)},
+            )
+        try:
+            yield
+        finally:
+            self.release()
+
+
+write_limiter = AdmissionLimiter("write", ADMISSION_WRITE_LIMIT)
+read_limiter = AdmissionLimiter("read", ADMISSION_READ_LIMIT)
+
+
+async def admit_write() -> AsyncIterator[None]:
+    """Dependency admitting a write request through the write limiter."""
+    async with write_limiter.admit():
+        yield
+
+
+async def admit_read() -> AsyncIterator[None]:
+    """Dependency admitting a read request through the read limiter."""
+    async with read_limiter.admit():
+        yield
@@ -0,0 +1,33 @@
+"""Debug routes of the Spirited Todo List API, only served when DEBUG_ENDPOINTS is on."""
+
+from fastapi import APIRouter, HTTPException, Query, status
+
+from observability import slow_queries
+from observability.context import debug_endpoints_enabled
+from observability.startup import startup_report
+from schemas.debug import SlowStatement, SlowStatementsResponse, StartupReport
+
+router = APIRouter(prefix="/debug", tags=["debug"], include_in_schema=False)
+
+
+@router.get("/slow-queries", response_model=SlowStatementsResponse)
+def read_slow_queries(limit: int = Query(10, ge=1, le=100)):
+    """List the statement shapes with the highest max duration since startup."""
+    if not debug_endpoints_enabled():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    return SlowStatementsResponse(
+        threshold_ms=slow_queries.SLOW_QUERY_THRESHOLD_MS,
+        items=[
+            SlowStatement(**vars(stats), mean_ms=stats.mean_ms)
+            for stats in slow_queries.get_slowest_statements(limit)
+        ],
+    )
+
+
+@router.get("/startup", response_model=StartupReport)
+def read_startup_report():
+    """Get the duration of each startup phase of this worker."""
+    if not debug_endpoints_enabled():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    phases = startup_report()
+    return StartupReport(phases=phases, total_ms=sum(phases.values()))
@@ -0,0 +1,13 @@
+"""Metrics route of the Spirited Todo List API."""
+
+from fastapi import APIRouter, Response
+
+from observability.metrics import METRICS_CONTENT_TYPE, render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def read_metrics():
+    """Expose the metrics in the Prometheus text format."""
+    return Response(render_metrics(), media_type=METRICS_CONTENT_TYPE)
@@ -1,72 +1,458 @@
 """API routes for Task operations in the Spirited Todo List API."""
 
-import os
+from datetime import datetime
+from typing import Callable, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, Query, status
-from sqlmodel import Session, create_engine
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlmodel import Session
 
-from crud.task import create_task, delete_task, get_task, get_tasks, update_task
+from crud import shards as sharded
+from crud.bulk import MAX_BULK_ITEMS
+from crud.cache import TaskPayload, get_cache_backend
+from crud.events import stream_events
+from crud.export import EXPORT_MEDIA_TYPES, export_tasks
+from crud.task_async import (
+    AnySession,
+    create_task,
+    create_tasks,
+    delete_task,
+    delete_tasks,
+    get_changes,
+    get_table_version,
+    get_task_payload,
+    get_tasks,
+    search_tasks,
+    update_task,
+    update_tasks,
+)
+from crud.task_import import IMPORT_BATCH_SIZE, import_tasks
+from db.session import get_read_session, get_read_session_factory, get_session
+from db.shards import ShardSet, get_task_shards
 from models.error import ErrorCode, error_response
-from schemas.task import TaskCreate, TaskListResponse, TaskRead, TaskUpdate
-
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///data/todo.db")
-engine = create_engine(DATABASE_URL, echo=True)
+from models.task import Priority
+from routers.admission import admit_read, admit_write
+from schemas.task import (
+    TaskBulkDeleteResponse,
+    TaskBulkResponse,
+    TaskBulkUpdate,
+    TaskCacheStats,
+    TaskChangesResponse,
+    TaskCreate,
+    TaskFilter,
+    TaskImportResponse,
+    TaskListResponse,
+    TaskRead,
+    TaskUpdate,
+    task_row_payload,
+)
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
-def get_session():
-    """Yield a database session."""
-    with Session(engine) as session:
-        yield session
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Return whether an If-None-Match header matches etag (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _cache_headers(etag: str) -> dict[str, str]:
+    """Build the validator headers: clients may cache, but must revalidate every time."""
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def _not_modified(etag: str) -> Response:
+    """Build an empty 304 Not Modified response for etag."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(etag)
+    )
+
+
+def _task_etag(task: TaskPayload) -> str:
+    """Build the ETag of a task from its id and last update time (an ISO string)."""
+    updated_at = datetime.fromisoformat(task["updated_at"])
+    task_id, version = task["id"], updated_at.strftime("%Y%m%d%H%M%S%f")
+    return f'"task-{task_id}-{version}"'
+
 
+def _task_filter(
+    priority: Optional[List[Priority]] = Query(
+        None, description="Only tasks with one of these priorities (repeatable)."
+    ),
+    deadline_before: Optional[datetime] = Query(None),
+    deadline_after: Optional[datetime] = Query(None),
+    created_since: Optional[datetime] = Query(None),
+    updated_since: Optional[datetime] = Query(None),
+    has_deadline: Optional[bool] = Query(None),
+    list_id: Optional[str] = Query(None, description="Only tasks of this task list."),
+) -> TaskFilter:
+    """Read the task list filters from the query string.
 
-@router.get("/", response_model=TaskListResponse)
-def list_tasks(
+    Filters are combined with AND; datetimes without a timezone are taken as UTC.
+    """
+    return TaskFilter(
+        priority=priority,
+        deadline_before=deadline_before,
+        deadline_after=deadline_after,
+        created_since=created_since,
+        updated_since=updated_since,
+        has_deadline=has_deadline,
+        list_id=list_id,
+    )
+
+
+def _single_database(shards: Optional[ShardSet] = Depends(get_task_shards)) -> None:
+    """Reject the routes that do not span shards yet when sharding is on (501)."""
+    if shards is not None:
+        raise error_response(
+            501,
+            ErrorCode.NOT_SUPPORTED_WITH_SHARDING,
+            "This route is not available when tasks are sharded.",
+        )
+
+
+@router.get(
+    "/",
+    response_model=TaskListResponse,
+    response_class=ORJSONResponse,
+    dependencies=[Depends(admit_read)],
+)
+async def list_tasks(
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
     sort_by: str = Query("priority"),
     sort_order: str = Query("desc"),
-    session: Session = Depends(get_session),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque next_cursor from a previous page. When set, offset is ignored.",
+    ),
+    include_total: bool = Query(
+        True, description="Set to false to skip counting the total number of tasks."
+    ),
+    filters: TaskFilter = Depends(_task_filter),
+    if_none_match: Optional[str] = Header(None),
+    session: AnySession = Depends(get_read_session),
+    shards: Optional[ShardSet] = Depends(get_task_shards),
 ):
-    """List all tasks with pagination and sorting."""
-    items, total = get_tasks(
-        session, limit=limit, offset=offset, sort_by=sort_by, sort_order=sort_order
-    )
+    """List tasks with filtering, pagination and sorting (offset or cursor based).
+
+    The ETag is the task table version, read before the page: a matching If-None-Match
+    gets a 304 without running the list query. With sharding, the list is gathered from
+    the shards and the ETag holds the version of each one.
+    """
+    if shards is not None:
+        table_versions = await sharded.get_table_versions(shards, filters)
+        etag = f'"tasks-{"-".join(map(str, table_versions))}"'
+    else:
+        etag = f'"tasks-{await get_table_version(session)}"'
+    if _etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    page_options = {
+        "limit": limit,
+        "offset": offset,
+        "sort_by": sort_by,
+        "sort_order": sort_order,
+        "cursor": cursor,
+        "include_total": include_total,
+        "filters": filters,
+    }
+    try:
+        if shards is not None:
+            items, total, next_cursor = await sharded.get_tasks(shards, **page_options)
+        else:
+            items, total, next_cursor = await get_tasks(session, **page_options)
+    except ValueError as e:
+        raise error_response(400, ErrorCode.INVALID_INPUT, str(e)) from e
     page = (offset // limit) + 1 if limit else 1
-    return TaskListResponse(
-        items=[TaskRead.model_validate(item.model_dump()) for item in items],
-        total=total,
-        page=page,
-        page_size=limit,
+    # Fast path: rows are serialized by orjson, skipping Pydantic validation of each item
+    return ORJSONResponse(
+        {
+            "items": [task_row_payload(row) for row in items],
+            "total": total,
+            "page": page,
+            "page_size": limit,
+            "next_cursor": next_cursor,
+        },
+        headers=_cache_headers(etag),
     )
 
 
-@router.post("/", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
-def create_new_task(task_in: TaskCreate, session: Session = Depends(get_session)):
-    """Create a new task."""
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}}
+    },
+    dependencies=[Depends(_single_database)],
+)
+def export_all_tasks(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    sort_by: str = Query("priority"),
+    sort_order: str = Query("desc"),
+    filters: TaskFilter = Depends(_task_filter),
+    open_session: Callable[[], Session] = Depends(get_read_session_factory),
+):
+    """Export every task, sorted and filtered like the list, as NDJSON or CSV.
+
+    The rows are streamed in batches from a single query, so memory use does not grow
+    with the number of tasks.
+    """
+    return StreamingResponse(
+        export_tasks(open_session, export_format, sort_by, sort_order, filters),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{export_format}"'
+        },
+    )
+
+
+@router.get(
+    "/search",
+    response_model=TaskListResponse,
+    response_class=ORJSONResponse,
+    dependencies=[Depends(_single_database), Depends(admit_read)],
+)
+async def search_tasks_by_text(
+    q: str = Query(
+        ..., min_length=1, max_length=200, description="Words to search for."
+    ),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    include_total: bool = Query(
+        True, description="Set to false to skip counting the matching tasks."
+    ),
+    session: AnySession = Depends(get_read_session),
+):
+    """Search tasks by title and description, best match first.
+
+    Every word of q must match the start of a word of the task (prefix search), and
+    matches in the title rank higher than matches in the description.
+    """
     try:
-        return create_task(session, task_in)
+        items, total = await search_tasks(
+            session, q=q, limit=limit, offset=offset, include_total=include_total
+        )
+    except ValueError as e:
+        raise error_response(400, ErrorCode.INVALID_INPUT, str(e)) from e
+    return ORJSONResponse(
+        {
+            "items": [task_row_payload(row) for row in items],
+            "total": total,
+            "page": (offset // limit) + 1,
+            "page_size": limit,
+            "next_cursor": None,
+        }
+    )
+
+
+@router.get(
+    "/changes",
+    response_model=TaskChangesResponse,
+    response_class=ORJSONResponse,
+    dependencies=[Depends(_single_database), Depends(admit_read)],
+)
+async def read_task_changes(
+    since: Optional[str] = Query(
+        None, description="Token of the previous sync; omit it for a full sync."
+    ),
+    limit: int = Query(500, ge=1, le=1000),
+    session: AnySession = Depends(get_read_session),
+):
+    """Get the tasks written and the IDs of the tasks deleted since a sync token.
+
+    Apply deleted before items. Pass the returned token to the next sync, and sync
+    again right away while has_more is true. 410 means the token is too old for the
+    kept tombstones: sync again without one.
+    """
+    try:
+        changes = await get_changes(session, since=since, limit=limit)
+    except ValueError as e:
+        raise error_response(400, ErrorCode.INVALID_INPUT, str(e)) from e
+    if changes is None:
+        raise error_response(
+            410,
+            ErrorCode.SYNC_TOKEN_EXPIRED,
+            "Sync token is older than the kept tombstones; sync again without it.",
+        )
+    return ORJSONResponse(
+        {
+            "items": [task_row_payload(row) for row in changes.items],
+            "deleted": changes.deleted,
+            "token": changes.token,
+            "has_more": changes.has_more,
+        }
+    )
+
+
+@router.post(
+    "/",
+    response_model=TaskRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(admit_write)],
+)
+async def create_new_task(
+    task_in: TaskCreate,
+    session: AnySession = Depends(get_session),
+    shards: Optional[ShardSet] = Depends(get_task_shards),
+):
+    """Create a new task, in the shard of its list when sharding is on."""
+    try:
+        if shards is not None:
+            return await sharded.create_task(shards, task_in)
+        return await create_task(session, task_in)
     except ValueError as e:
         raise error_response(400, ErrorCode.HIGH_PRIORITY_LIMIT, str(e)) from e
 
 
-@router.get("/{task_id}", response_model=TaskRead)
-def read_task(task_id: int, session: Session = Depends(get_session)):
-    """Get a task by ID."""
-    task = get_task(session, task_id)
+@router.post(
+    "/import",
+    response_model=TaskImportResponse,
+    dependencies=[Depends(_single_database), Depends(admit_write)],
+)
+async def import_tasks_from_ndjson(
+    request: Request,
+    batch_size: int = Query(
+        IMPORT_BATCH_SIZE,
+        ge=1,
+        le=MAX_BULK_ITEMS,
+        description="Number of tasks inserted and committed together.",
+    ),
+    session: AnySession = Depends(get_session),
+):
+    """Import tasks from an NDJSON body (one TaskCreate object per line).
+
+    The body is read and inserted incrementally, one transaction per batch, and the
+    response summarizes the inserted and rejected lines.
+    """
+    return await import_tasks(session, request.stream(), batch_size)
+
+
+@router.post(
+    "/bulk",
+    response_model=TaskBulkResponse,
+    dependencies=[Depends(_single_database), Depends(admit_write)],
+)
+async def create_tasks_in_bulk(
+    tasks_in: List[TaskCreate] = Body(..., min_length=1, max_length=MAX_BULK_ITEMS),
+    session: AnySession = Depends(get_session),
+):
+    """Create many tasks in one transaction, reporting errors per item."""
+    items, errors = await create_tasks(session, tasks_in)
+    return TaskBulkResponse(
+        items=[TaskRead.model_validate(item.model_dump()) for item in items],
+        errors=errors,
+    )
+
+
+@router.patch(
+    "/bulk",
+    response_model=TaskBulkResponse,
+    dependencies=[Depends(_single_database), Depends(admit_write)],
+)
+async def update_tasks_in_bulk(
+    tasks_in: List[TaskBulkUpdate] = Body(..., min_length=1, max_length=MAX_BULK_ITEMS),
+    session: AnySession = Depends(get_session),
+):
+    """Update many tasks in one transaction, reporting errors per item."""
+    items, errors = await update_tasks(session, tasks_in)
+    return TaskBulkResponse(
+        items=[TaskRead.model_validate(item.model_dump()) for item in items],
+        errors=errors,
+    )
+
+
+@router.delete(
+    "/bulk",
+    response_model=TaskBulkDeleteResponse,
+    dependencies=[Depends(_single_database), Depends(admit_write)],
+)
+async def delete_tasks_in_bulk(
+    task_ids: List[int] = Body(..., min_length=1, max_length=MAX_BULK_ITEMS),
+    session: AnySession = Depends(get_session),
+):
+    """Delete many tasks in one transaction, reporting errors per item."""
+    deleted_ids, errors = await delete_tasks(session, task_ids)
+    return TaskBulkDeleteResponse(deleted_ids=deleted_ids, errors=errors)
+
+
+@router.get("/cache", response_model=TaskCacheStats)
+async def read_task_cache_stats():
+    """Get the hit, miss and eviction counters of the single task read cache."""
+    return TaskCacheStats(**get_cache_backend().stats()._asdict())
+
+
+@router.get(
+    "/events",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_task_events(last_event_id: Optional[str] = Header(None)):
+    """Stream the created, updated and deleted tasks as Server-Sent Events.
+
+    Each event is named after the change and carries the task ID; a resync event asks
+    the client to refetch its lists, after it reconnected or fell too far behind.
+    """
+    return StreamingResponse(
+        stream_events(resync=last_event_id is not None),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get(
+    "/{task_id}",
+    response_model=TaskRead,
+    response_class=ORJSONResponse,
+    dependencies=[Depends(admit_read)],
+)
+async def read_task(
+    task_id: int,
+    if_none_match: Optional[str] = Header(None),
+    session: AnySession = Depends(get_read_session),
+    shards: Optional[ShardSet] = Depends(get_task_shards),
+):
+    """Get a task by ID, served from the task cache when possible.
+
+    A matching If-None-Match gets a 304 without a body.
+    """
+    if shards is not None:
+        task = await sharded.get_task_payload(shards, task_id)
+    else:
+        task = await get_task_payload(session, task_id)
     if not task:
         raise error_response(404, ErrorCode.TASK_NOT_FOUND, "Task not found")
-    return task
+    etag = _task_etag(task)
+    if _etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    return ORJSONResponse(task, headers=_cache_headers(etag))
 
 
-@router.patch("/{task_id}", response_model=TaskRead)
-def update_existing_task(
-    task_id: int, task_in: TaskUpdate, session: Session = Depends(get_session)
+@router.patch(
+    "/{task_id}", response_model=TaskRead, dependencies=[Depends(admit_write)]
+)
+async def update_existing_task(
+    task_id: int,
+    task_in: TaskUpdate,
+    session: AnySession = Depends(get_session),
+    shards: Optional[ShardSet] = Depends(get_task_shards),
 ):
     """Update a task by ID."""
     try:
-        task = update_task(session, task_id, task_in)
+        if shards is not None:
+            task = await sharded.update_task(shards, task_id, task_in)
+        else:
+            task = await update_task(session, task_id, task_in)
         if not task:
             raise error_response(404, ErrorCode.TASK_NOT_FOUND, "Task not found")
         return task
@@ -74,8 +460,20 @@ def update_existing_task(
         raise error_response(400, ErrorCode.HIGH_PRIORITY_LIMIT, str(e)) from e
 
 
-@router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_existing_task(task_id: int, session: Session = Depends(get_session)):
+@router.delete(
+    "/{task_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[Depends(admit_write)],
+)
+async def delete_existing_task(
+    task_id: int,
+    session: AnySession = Depends(get_session),
+    shards: Optional[ShardSet] = Depends(get_task_shards),
+):
     """Delete a task by ID."""
-    if not delete_task(session, task_id):
+    if shards is not None:
+        deleted = await sharded.delete_task(shards, task_id)
+    else:
+        deleted = await delete_task(session, task_id)
+    if not deleted:
         raise error_response(404, ErrorCode.TASK_NOT_FOUND, "Task not found")
@@ -0,0 +1,32 @@
+"""Schemas for the debug endpoints of the Spirited Todo List API."""
+
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class SlowStatement(BaseModel):
+    """Schema for the execution statistics of one SQL statement shape."""
+
+    statement: str
+    calls: int
+    slow_calls: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    last_slow_route: Optional[str] = None
+    last_slow_plan: List[str] = []
+
+
+class SlowStatementsResponse(BaseModel):
+    """Schema for the slowest statement shapes since startup."""
+
+    threshold_ms: float
+    items: List[SlowStatement]
+
+
+class StartupReport(BaseModel):
+    """Schema for the duration of each startup phase of the worker, in milliseconds."""
+
+    phases: Dict[str, float]
+    total_ms: float
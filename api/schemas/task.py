@@ -1,11 +1,13 @@
 """Schemas for Task model in the Spirited Todo List API."""
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, List, Optional
 
 from pydantic import BaseModel, Field
+from sqlalchemy import Row
 
-from models.task import Priority
+from models.error import ErrorCode
+from models.task import DEFAULT_TASK_LIST, Priority
 
 
 class TaskBase(BaseModel):
@@ -15,6 +17,12 @@ class TaskBase(BaseModel):
     description: Optional[str] = None
     priority: Priority = Priority.LOW
     deadline: Optional[datetime] = None
+    list_id: str = Field(
+        DEFAULT_TASK_LIST,
+        min_length=1,
+        max_length=64,
+        description="Task list of the task. It cannot be changed after creation.",
+    )
 
 
 class TaskCreate(TaskBase):
@@ -38,10 +46,106 @@ class TaskUpdate(BaseModel):
     deadline: Optional[datetime] = None
 
 
+class TaskFilter(BaseModel):
+    """Schema for the filters of the task list. Unset filters match every task.
+
+    Datetimes without a timezone are taken as UTC.
+    """
+
+    priority: Optional[List[Priority]] = None
+    deadline_before: Optional[datetime] = None
+    deadline_after: Optional[datetime] = None
+    created_since: Optional[datetime] = None
+    updated_since: Optional[datetime] = None
+    has_deadline: Optional[bool] = None
+    list_id: Optional[str] = None
+
+
+TASK_READ_FIELDS = tuple(TaskRead.model_fields)
+
+
+def task_row_payload(row: Row) -> dict[str, Any]:
+    """Build the TaskRead payload of a task row without Pydantic validation.
+
+    Rows come straight from the task table, whose columns already satisfy TaskRead.
+    Used by the fast list path: the dict is serialized by orjson as is.
+    """
+    mapping = row._mapping  # pylint: disable=protected-access
+    return {field: mapping[field] for field in TASK_READ_FIELDS}
+
+
 class TaskListResponse(BaseModel):
     """Schema for listing tasks."""
 
     items: List[TaskRead]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
+
+
+class TaskBulkUpdate(TaskUpdate):
+    """Schema for one item of a bulk update: the task ID and the fields to change."""
+
+    id: int
+
+
+class BulkItemError(BaseModel):
+    """Error for one item of a bulk request, identified by its index in the request."""
+
+    index: int
+    id: Optional[int] = None
+    msg: str
+    error_code: ErrorCode
+
+
+class TaskBulkResponse(BaseModel):
+    """Schema for the result of a bulk create or update."""
+
+    items: List[TaskRead]
+    errors: List[BulkItemError]
+
+
+class TaskBulkDeleteResponse(BaseModel):
+    """Schema for the result of a bulk delete."""
+
+    deleted_ids: List[int]
+    errors: List[BulkItemError]
+
+
+class TaskImportError(BaseModel):
+    """Error for one line of an NDJSON import, identified by its line number (from 1)."""
+
+    line: int
+    msg: str
+    error_code: ErrorCode
+
+
+class TaskImportResponse(BaseModel):
+    """Schema for the summary of an NDJSON import.
+
+    errors holds the first rejected lines only; rejected counts all of them.
+    """
+
+    inserted: int = 0
+    rejected: int = 0
+    batches: int = 0
+    errors: List[TaskImportError] = []
+
+
+class TaskChangesResponse(BaseModel):
+    """Schema for a page of task changes since a sync token."""
+
+    items: List[TaskRead]
+    deleted: List[int]
+    token: str
+    has_more: bool
+
+
+class TaskCacheStats(BaseModel):
+    """Schema for the counters of the single task read cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
@@ -2,13 +2,17 @@
 
 import os
 import sys
+from contextlib import contextmanager
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import text
 from sqlmodel import Session, SQLModel, create_engine
 
+from crud.cache import invalidate_task_cache
+from crud.counts import invalidate_total_count
 from main import app
+from observability.statements import add_statement_listener, remove_statement_listener
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
@@ -27,11 +31,31 @@ def get_test_session():
         yield session
 
 
+def get_test_session_factory():
+    """Get a factory of test sessions on the shared connection."""
+    return lambda: Session(bind=connection)
+
+
+def get_test_read_session(
+    read_your_writes: bool = False,
+):  # pylint: disable=unused-argument
+    """Get a test session for reads: the shared connection serves reads and writes."""
+    yield from get_test_session()
+
+
+TEST_DEPENDENCIES = {
+    "get_session": get_test_session,
+    "get_session_factory": get_test_session_factory,
+    "get_read_session": get_test_read_session,
+    "get_read_session_factory": get_test_session_factory,
+}
+
 for route in app.routes:
     if hasattr(route, "dependant"):
         for dep in route.dependant.dependencies:
-            if getattr(dep.call, "__name__", None) == "get_session":
-                dep.call = get_test_session
+            name = getattr(dep.call, "__name__", None)
+            if name in TEST_DEPENDENCIES:
+                dep.call = TEST_DEPENDENCIES[name]
 
 
 @pytest.fixture(scope="function")
@@ -41,6 +65,8 @@ def db():
     for table in reversed(SQLModel.metadata.sorted_tables):
         connection.execute(text(f"DELETE FROM {table.name}"))
     connection.commit()
+    invalidate_total_count()
+    invalidate_task_cache()
     yield
 
 
@@ -48,3 +74,46 @@ def db():
 def client(db):  # pylint: disable=redefined-outer-name, unused-argument
     """Fixture for FastAPI test client using a clean test DB per test."""
     return TestClient(app)
+
+
+@contextmanager
+def _count_queries():
+    """Collect the SQL statements run inside the block, on any engine."""
+    statements = []
+
+    def _record(conn, cursor, statement, *args):  # pylint: disable=unused-argument
+        statements.append(statement)
+
+    add_statement_listener(_record)
+    try:
+        yield statements
+    finally:
+        remove_statement_listener(_record)
+
+
+@pytest.fixture(name="count_queries", scope="function")
+def count_queries_fixture():
+    """Fixture for a context manager collecting the SQL statements run inside the block.
+
+    Usage: with count_queries() as statements: client.get("/tasks/")
+    """
+    return _count_queries
+
+
+@pytest.fixture(scope="function")
+def assert_max_queries():
+    """Fixture for a context manager failing the test past a number of SQL statements.
+
+    Usage: with assert_max_queries(2): client.get("/tasks/")
+    """
+
+    @contextmanager
+    def _assert_max_queries(limit: int):
+        with _count_queries() as statements:
+            yield statements
+        listing = "\n".join(statements)
+        assert (
+            len(statements) <= limit
+        ), f"{len(statements)} SQL statements, over the budget of {limit}:\n{listing}"
+
+    return _assert_max_queries
@@ -0,0 +1,135 @@
+"""Tests for the admission control of the task routes of the Spirited Todo List API."""
+
+import asyncio
+
+from prometheus_client import REGISTRY
+
+from models.error import ErrorCode
+from routers.admission import (
+    ADMISSION_RETRY_AFTER_SECONDS,
+    AdmissionLimiter,
+    read_limiter,
+    write_limiter,
+)
+
+
+def _rejected(kind: str, reason: str) -> float:
+    """Return the number of requests of a kind rejected for a reason so far."""
+    labels = {"kind": kind, "reason": reason}
+    return REGISTRY.get_sample_value("admission_rejected_total", labels) or 0
+
+
+def test_waiters_are_admitted_in_order_as_slots_free_up():
+    """A request past the limit waits for a slot, first come first served."""
+    limiter = AdmissionLimiter("test", limit=1, queue_timeout=5)
+    admitted = []
+
+    async def request(name: str) -> None:
+        async with limiter.admit():
+            admitted.append(name)
+            await asyncio.sleep(0.01)
+
+    async def run() -> None:
+        await asyncio.gather(*(request(name) for name in "abc"))
+
+    asyncio.run(run())
+    assert admitted == ["a", "b", "c"]
+    assert limiter.active == 0
+    assert limiter.queue_depth == 0
+
+
+def test_wait_past_the_queue_timeout_is_rejected():
+    """A request that gets no slot within the queue timeout is rejected."""
+    limiter = AdmissionLimiter("test", limit=1, queue_timeout=0.01)
+    before = _rejected("test", "timeout")
+
+    async def run() -> bool:
+        assert await limiter.acquire()
+        admitted = await limiter.acquire()
+        limiter.release()
+        return admitted
+
+    assert not asyncio.run(run())
+    assert _rejected("test", "timeout") == before + 1
+    assert limiter.active == 0
+    assert limiter.queue_depth == 0
+
+
+def test_full_queue_is_rejected_without_waiting():
+    """A request finding the queue full is rejected at once."""
+    limiter = AdmissionLimiter("test", limit=1, max_queue=0, queue_timeout=5)
+    before = _rejected("test", "queue_full")
+
+    async def run() -> bool:
+        assert await limiter.acquire()
+        admitted = await asyncio.wait_for(limiter.acquire(), 1)
+        limiter.release()
+        return admitted
+
+    assert not asyncio.run(run())
+    assert _rejected("test", "queue_full") == before + 1
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    """A request cancelled while waiting neither keeps nor leaks a slot."""
+    limiter = AdmissionLimiter("test", limit=1, queue_timeout=5)
+
+    async def run() -> None:
+        assert await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 1
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert limiter.queue_depth == 0
+        limiter.release()
+
+    asyncio.run(run())
+    assert limiter.active == 0
+
+
+def test_overloaded_writes_get_a_503_with_retry_after(client, monkeypatch):
+    """Writes past the write limit are shed with a 503, while reads are still served."""
+    task_id = client.post("/tasks/", json={"title": "Task"}).json()["id"]
+    monkeypatch.setattr(write_limiter, "active", write_limiter.limit)
+    monkeypatch.setattr(write_limiter, "queue_timeout", 0.01)
+    for resp in (
+        client.post("/tasks/", json={"title": "New"}),
+        client.patch(f"/tasks/{task_id}", json={"title": "Renamed"}),
+        client.delete(f"/tasks/{task_id}"),
+    ):
+        assert resp.status_code == 503
+        assert resp.headers["retry-after"] == str(ADMISSION_RETRY_AFTER_SECONDS)
+        assert resp.json()["detail"]["error_code"] == ErrorCode.OVERLOADED
+    assert client.get(f"/tasks/{task_id}").json()["title"] == "Task"
+    assert client.get("/tasks/").status_code == 200
+
+
+def test_overloaded_import_gets_a_503(client, monkeypatch):
+    """The NDJSON import takes a write slot, and is shed like the other writes."""
+    monkeypatch.setattr(write_limiter, "active", write_limiter.limit)
+    monkeypatch.setattr(write_limiter, "queue_timeout", 0.01)
+    resp = client.post("/tasks/import", content='{"title": "Imported"}')
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == str(ADMISSION_RETRY_AFTER_SECONDS)
+    assert resp.json()["detail"]["error_code"] == ErrorCode.OVERLOADED
+    monkeypatch.undo()
+    resp = client.post("/tasks/import", content='{"title": "Imported"}')
+    assert resp.json()["inserted"] == 1
+
+
+def test_overloaded_reads_get_a_503(client, monkeypatch):
+    """Reads past the read limit are shed, and served again once a slot is free."""
+    monkeypatch.setattr(read_limiter, "active", read_limiter.limit)
+    monkeypatch.setattr(read_limiter, "queue_timeout", 0.01)
+    assert client.get("/tasks/").status_code == 503
+    assert client.post("/tasks/", json={"title": "Task"}).status_code == 201
+    monkeypatch.undo()
+    assert client.get("/tasks/").status_code == 200
+
+
+def test_zero_limit_turns_admission_control_off(client, monkeypatch):
+    """A limit of 0 admits every request."""
+    monkeypatch.setattr(write_limiter, "limit", 0)
+    assert client.post("/tasks/", json={"title": "Task"}).status_code == 201
+    assert write_limiter.active == 0
@@ -0,0 +1,144 @@
+"""Tests for the bulk task endpoints in the Spirited Todo List API."""
+
+from crud.task import MAX_HIGH_PRIORITY_TASK
+from models.error import ErrorCode
+from models.task import Priority
+
+
+def _high(title: str) -> dict:
+    """Build a HIGH task payload."""
+    return {"title": title, "priority": Priority.HIGH.value}
+
+
+def test_bulk_create(client):
+    """Bulk create inserts every task and returns them in request order."""
+    payload = [
+        {"title": f"Task {i}", "priority": Priority.MID.value} for i in range(50)
+    ]
+    resp = client.post("/tasks/bulk", json=payload)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["errors"] == []
+    assert [t["title"] for t in data["items"]] == [t["title"] for t in payload]
+    assert client.get("/tasks/").json()["total"] == 50
+
+
+def test_bulk_create_returns_the_new_ids(client):
+    """The IDs of a bulk create follow the existing tasks and name the created tasks."""
+    first = client.post("/tasks/", json={"title": "First"}).json()["id"]
+    last = client.post("/tasks/", json={"title": "Last"}).json()["id"]
+    client.delete(f"/tasks/{last}")
+    payload = [{"title": f"Task {i}"} for i in range(5)]
+    items = client.post("/tasks/bulk", json=payload).json()["items"]
+    assert [task["id"] for task in items] == list(range(first + 1, first + 6))
+    for task in items:
+        assert client.get(f"/tasks/{task['id']}").json()["title"] == task["title"]
+
+
+def test_bulk_create_high_priority_limit_per_item(client):
+    """HIGH creates over the limit are rejected per item, the rest of the batch is applied."""
+    client.post("/tasks/", json=_high("Existing"))
+    payload = [_high(f"High {i}") for i in range(MAX_HIGH_PRIORITY_TASK)]
+    payload.insert(1, {"title": "Low"})
+    resp = client.post("/tasks/bulk", json=payload)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert len(data["items"]) == MAX_HIGH_PRIORITY_TASK
+    assert [e["index"] for e in data["errors"]] == [len(payload) - 1]
+    assert data["errors"][0]["error_code"] == ErrorCode.HIGH_PRIORITY_LIMIT
+    high = client.get("/tasks/?limit=100").json()["items"]
+    assert (
+        sum(t["priority"] == Priority.HIGH.value for t in high)
+        == MAX_HIGH_PRIORITY_TASK
+    )
+
+
+def test_bulk_create_high_priority_limit_per_list(client):
+    """Each task list of a batch has its own high priority slots."""
+    payload = [
+        {**_high(f"{list_id} {i}"), "list_id": list_id}
+        for i in range(MAX_HIGH_PRIORITY_TASK + 1)
+        for list_id in ("home", "work")
+    ]
+    data = client.post("/tasks/bulk", json=payload).json()
+    assert len(data["items"]) == 2 * MAX_HIGH_PRIORITY_TASK
+    assert [e["index"] for e in data["errors"]] == [len(payload) - 2, len(payload) - 1]
+
+
+def test_bulk_create_validation(client):
+    """An invalid item or an empty batch rejects the whole request."""
+    resp = client.post("/tasks/bulk", json=[{"title": "Ok"}, {"title": ""}])
+    assert resp.status_code == 422
+    assert client.post("/tasks/bulk", json=[]).status_code == 422
+    assert client.get("/tasks/").json()["total"] == 0
+
+
+def test_bulk_update(client):
+    """Bulk update applies each item and reports unknown or repeated ids."""
+    ids = [
+        t["id"]
+        for t in client.post(
+            "/tasks/bulk", json=[{"title": "A"}, {"title": "B"}]
+        ).json()["items"]
+    ]
+    payload = [
+        {"id": ids[0], "title": "A2"},
+        {"id": 999999, "title": "Missing"},
+        {"id": ids[1], "priority": Priority.MID.value},
+        {"id": ids[0], "title": "A3"},
+    ]
+    resp = client.patch("/tasks/bulk", json=payload)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [(t["id"], t["title"], t["priority"]) for t in data["items"]] == [
+        (ids[0], "A2", Priority.LOW.value),
+        (ids[1], "B", Priority.MID.value),
+    ]
+    assert [(e["index"], e["error_code"]) for e in data["errors"]] == [
+        (1, ErrorCode.TASK_NOT_FOUND),
+        (3, ErrorCode.INVALID_INPUT),
+    ]
+    assert client.get(f"/tasks/{ids[0]}").json()["title"] == "A2"
+
+
+def test_bulk_update_demotion_frees_high_slot(client):
+    """Demoting a HIGH task in the batch frees its slot for a promotion in the same batch."""
+    high_ids = [
+        t["id"]
+        for t in client.post(
+            "/tasks/bulk",
+            json=[_high(f"High {i}") for i in range(MAX_HIGH_PRIORITY_TASK)],
+        ).json()["items"]
+    ]
+    low_ids = [
+        t["id"]
+        for t in client.post(
+            "/tasks/bulk", json=[{"title": "L1"}, {"title": "L2"}]
+        ).json()["items"]
+    ]
+    payload = [
+        {"id": low_ids[0], "priority": Priority.HIGH.value},
+        {"id": high_ids[0], "priority": Priority.LOW.value},
+        {"id": low_ids[1], "priority": Priority.HIGH.value},
+    ]
+    data = client.patch("/tasks/bulk", json=payload).json()
+    assert [t["id"] for t in data["items"]] == [low_ids[0], high_ids[0]]
+    assert [(e["index"], e["error_code"]) for e in data["errors"]] == [
+        (2, ErrorCode.HIGH_PRIORITY_LIMIT)
+    ]
+
+
+def test_bulk_delete(client):
+    """Bulk delete removes existing tasks and reports the missing ones."""
+    ids = [
+        t["id"]
+        for t in client.post(
+            "/tasks/bulk", json=[{"title": "A"}, {"title": "B"}]
+        ).json()["items"]
+    ]
+    resp = client.request("DELETE", "/tasks/bulk", json=[ids[0], 999999, ids[1]])
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["deleted_ids"] == ids
+    assert [(e["index"], e["id"]) for e in data["errors"]] == [(1, 999999)]
+    assert client.get("/tasks/").json()["total"] == 0
@@ -0,0 +1,83 @@
+"""Concurrency tests for the high priority task limit in the Spirited Todo List API."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func
+from sqlmodel import Session, create_engine, select
+
+from crud.task import MAX_HIGH_PRIORITY_TASK, create_task, update_task
+from db.migrations import run_migrations
+from models.task import Priority, Task
+from schemas.task import TaskCreate, TaskUpdate
+
+WRITERS = 16
+
+
+def _file_engine(tmp_path):
+    """Create an engine on a temporary SQLite file shared by several connections."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'concurrency.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        pool_size=WRITERS,
+    )
+    with engine.begin() as connection:
+        run_migrations(connection)
+    return engine
+
+
+def _high_count(engine) -> int:
+    """Count the HIGH tasks stored in the database."""
+    with Session(engine) as session:
+        return session.exec(
+            select(func.count())  # pylint: disable=not-callable
+            .select_from(Task)
+            .where(Task.priority == Priority.HIGH)
+        ).one()
+
+
+def _run_parallel(action, count: int) -> list[bool]:
+    """Run action(i) from count threads released at the same time, return which succeeded."""
+    barrier = threading.Barrier(count)
+
+    def _attempt(i: int) -> bool:
+        barrier.wait()
+        try:
+            action(i)
+            return True
+        except ValueError:
+            return False
+
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        return list(pool.map(_attempt, range(count)))
+
+
+def test_parallel_high_priority_creates_respect_limit(tmp_path):
+    """Parallel HIGH creates never store more than MAX_HIGH_PRIORITY_TASK tasks."""
+    engine = _file_engine(tmp_path)
+
+    def _create(i: int) -> None:
+        with Session(engine) as session:
+            create_task(session, TaskCreate(title=f"High {i}", priority=Priority.HIGH))
+
+    results = _run_parallel(_create, WRITERS)
+    assert sum(results) == MAX_HIGH_PRIORITY_TASK
+    assert _high_count(engine) == MAX_HIGH_PRIORITY_TASK
+
+
+def test_parallel_promotions_respect_limit(tmp_path):
+    """Parallel updates to HIGH never store more than MAX_HIGH_PRIORITY_TASK tasks."""
+    engine = _file_engine(tmp_path)
+    with Session(engine) as session:
+        ids = [
+            create_task(session, TaskCreate(title=f"Low {i}")).id
+            for i in range(WRITERS)
+        ]
+
+    def _promote(i: int) -> None:
+        with Session(engine) as session:
+            update_task(session, ids[i], TaskUpdate(priority=Priority.HIGH))
+
+    results = _run_parallel(_promote, WRITERS)
+    assert sum(results) == MAX_HIGH_PRIORITY_TASK
+    assert _high_count(engine) == MAX_HIGH_PRIORITY_TASK
@@ -0,0 +1,108 @@
+"""Tests for the shared database engine settings of the Spirited Todo List API."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from db.engine import (
+    DATABASE_POOL_SIZE,
+    DATABASE_WRITE_POOL_SIZE,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE,
+    SQLITE_MMAP_SIZE,
+    create_async_db_engine,
+    create_db_engine,
+    get_engine,
+    get_read_engine,
+)
+from db.session import get_read_session
+
+# Values returned by the pragmas for the defaults (NORMAL=1, MEMORY=2)
+EXPECTED_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": 1,
+    "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+    "cache_size": SQLITE_CACHE_SIZE,
+    "mmap_size": SQLITE_MMAP_SIZE,
+    "temp_store": 2,
+}
+
+
+def _read_pragmas(connection) -> dict:
+    """Read the pragmas set on connect back from the connection."""
+    return {
+        pragma: connection.execute(text(f"PRAGMA {pragma}")).scalar_one()
+        for pragma in EXPECTED_PRAGMAS
+    }
+
+
+def test_sync_engine_applies_pragmas(tmp_path):
+    """Every connection of the sync engine gets the configured pragmas."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'sync.db'}")
+    assert not engine.echo
+    assert engine.pool.size() == DATABASE_POOL_SIZE
+    with engine.connect() as connection:
+        assert _read_pragmas(connection) == EXPECTED_PRAGMAS
+    engine.dispose()
+
+
+def test_async_engine_applies_pragmas(tmp_path):
+    """Every connection of the aiosqlite engine gets the configured pragmas."""
+
+    async def scenario():
+        engine = create_async_db_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+        async with engine.connect() as connection:
+            pragmas = await connection.run_sync(_read_pragmas)
+        await engine.dispose()
+        return pragmas
+
+    assert asyncio.run(scenario()) == EXPECTED_PRAGMAS
+
+
+def test_in_memory_engine_has_no_pool_settings():
+    """In-memory databases are supported and skip the pool settings."""
+    engine = create_db_engine("sqlite://")
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT 1")).scalar_one() == 1
+
+
+def test_read_only_engine_rejects_writes(tmp_path):
+    """Connections of a read-only engine read the database but cannot write to it."""
+    url = f"sqlite:///{tmp_path / 'ro.db'}"
+    writer = create_db_engine(url)
+    with writer.begin() as connection:
+        connection.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY)"))
+        connection.execute(text("INSERT INTO item VALUES (1)"))
+    reader = create_db_engine(url, read_only=True)
+    with reader.connect() as connection:
+        assert _read_pragmas(connection) == EXPECTED_PRAGMAS
+        assert connection.execute(text("SELECT id FROM item")).scalar_one() == 1
+        with pytest.raises(OperationalError, match="readonly"):
+            connection.execute(text("INSERT INTO item VALUES (2)"))
+    reader.dispose()
+    writer.dispose()
+
+
+def test_reads_and_writes_use_separate_pools():
+    """The app's writer pool is the small one; reads have their own pool."""
+    assert get_read_engine() is not get_engine()
+    assert get_engine().pool.size() == DATABASE_WRITE_POOL_SIZE
+    assert get_read_engine().pool.size() == DATABASE_POOL_SIZE
+
+
+@pytest.mark.parametrize(
+    "read_your_writes, get_expected_engine",
+    [(False, get_read_engine), (True, get_engine)],
+)
+def test_read_your_writes_reads_from_the_writer(read_your_writes, get_expected_engine):
+    """X-Read-Your-Writes routes a read session to the writer pool."""
+
+    async def scenario():
+        sessions = get_read_session(read_your_writes=read_your_writes)
+        session = await anext(sessions)
+        await sessions.aclose()
+        return session.get_bind()
+
+    assert asyncio.run(scenario()) is get_expected_engine()
@@ -0,0 +1,71 @@
+"""Tests for ETag / conditional GET support in the Spirited Todo List API."""
+
+from crud.task import MAX_HIGH_PRIORITY_TASK
+from models.task import Priority
+
+
+def test_list_not_modified_skips_list_query(client, count_queries):
+    """A matching If-None-Match on the list gets a 304 without running the list query."""
+    client.post("/tasks/", json={"title": "Task"})
+    resp = client.get("/tasks/")
+    etag = resp.headers["ETag"]
+    with count_queries() as statements:
+        resp = client.get("/tasks/", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == etag
+    assert resp.content == b""
+    assert len(statements) == 1
+    assert "task_table_version" in statements[0]
+
+
+def test_list_etag_changes_on_every_write(client):
+    """Creates, updates and deletes each change the list ETag."""
+    etags = [client.get("/tasks/").headers["ETag"]]
+    task_id = client.post("/tasks/", json={"title": "Task"}).json()["id"]
+    etags.append(client.get("/tasks/").headers["ETag"])
+    client.patch(f"/tasks/{task_id}", json={"title": "Renamed"})
+    etags.append(client.get("/tasks/").headers["ETag"])
+    client.post("/tasks/bulk", json=[{"title": "A"}, {"title": "B"}])
+    etags.append(client.get("/tasks/").headers["ETag"])
+    client.delete(f"/tasks/{task_id}")
+    etags.append(client.get("/tasks/").headers["ETag"])
+    assert len(set(etags)) == len(etags)
+    resp = client.get("/tasks/", headers={"If-None-Match": etags[0]})
+    assert resp.status_code == 200
+
+
+def test_rolled_back_write_keeps_list_etag(client):
+    """A write rejected by the high priority limit does not change the list ETag."""
+    for i in range(MAX_HIGH_PRIORITY_TASK):
+        client.post(
+            "/tasks/", json={"title": f"High {i}", "priority": Priority.HIGH.value}
+        )
+    etag = client.get("/tasks/").headers["ETag"]
+    resp = client.post(
+        "/tasks/", json={"title": "Too many", "priority": Priority.HIGH.value}
+    )
+    assert resp.status_code == 400
+    assert client.get("/tasks/", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_task_etag(client):
+    """A task ETag matches until the task is updated."""
+    task_id = client.post("/tasks/", json={"title": "Task"}).json()["id"]
+    resp = client.get(f"/tasks/{task_id}")
+    etag = resp.headers["ETag"]
+    resp = client.get(
+        f"/tasks/{task_id}", headers={"If-None-Match": f'W/{etag}, "other"'}
+    )
+    assert resp.status_code == 304
+    assert resp.content == b""
+    # Writes to other tasks do not change this task's ETag
+    client.post("/tasks/", json={"title": "Other"})
+    assert (
+        client.get(f"/tasks/{task_id}", headers={"If-None-Match": etag}).status_code
+        == 304
+    )
+    client.patch(f"/tasks/{task_id}", json={"title": "Renamed"})
+    resp = client.get(f"/tasks/{task_id}", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["title"] == "Renamed"
+    assert resp.headers["ETag"] != etag
@@ -0,0 +1,114 @@
+"""Tests for the Server-Sent Events change feed of the Spirited Todo List API."""
+
+import asyncio
+
+import httpx
+
+from crud import events
+from crud.changes import ChangeKind, TaskChange
+from main import app
+
+
+async def _open_feed(headers=()):
+    """Start GET /tasks/events on the app; return its body queue and a disconnect."""
+    chunks: asyncio.Queue = asyncio.Queue()
+    disconnected = asyncio.Event()
+
+    async def receive():
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            await chunks.put(message["body"])
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/tasks/events",
+        "raw_path": b"/tasks/events",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), *headers],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    response = asyncio.create_task(app(scope, receive, send))
+    assert (await asyncio.wait_for(chunks.get(), 5)).startswith(b"retry: ")
+
+    async def close():
+        disconnected.set()
+        await asyncio.wait_for(response, 5)
+
+    return chunks, close
+
+
+async def _next_event(chunks) -> tuple[str, str]:
+    """Return the (event, data) fields of the next message of the feed."""
+    message = (await asyncio.wait_for(chunks.get(), 5)).decode()
+    fields = dict(line.split(": ", 1) for line in message.strip().split("\n"))
+    return fields["event"], fields["data"]
+
+
+def test_feed_streams_committed_changes(client):  # pylint: disable=unused-argument
+    """Creates, updates and deletes are streamed to the subscribers, in order."""
+
+    async def scenario():
+        chunks, close = await _open_feed()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as api:
+            task_id = (await api.post("/tasks/", json={"title": "Live"})).json()["id"]
+            await api.patch(f"/tasks/{task_id}", json={"title": "Edited"})
+            await api.delete(f"/tasks/{task_id}")
+            await api.post("/tasks/", json={"title": ""})  # rejected: no event
+        data = f'{{"id":{task_id}}}'
+        assert await _next_event(chunks) == ("created", data)
+        assert await _next_event(chunks) == ("updated", data)
+        assert await _next_event(chunks) == ("deleted", data)
+        assert chunks.empty()
+        await close()
+        assert events.subscriber_count() == 0
+
+    asyncio.run(scenario())
+
+
+def test_reconnect_starts_with_resync():
+    """A client reconnecting with Last-Event-ID is told to refetch first."""
+
+    async def scenario():
+        chunks, close = await _open_feed([(b"last-event-id", b"12")])
+        assert (await _next_event(chunks))[0] == events.RESYNC
+        await close()
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_gets_a_resync_instead_of_a_backlog():
+    """Past the queue size, the backlog is dropped for one resync event."""
+
+    async def scenario():
+        async with events.subscribe(max_size=2) as subscription:
+            events.publish([TaskChange(ChangeKind.CREATED, i) for i in range(4)])
+            await asyncio.sleep(0)
+            received = [subscription.queue.get_nowait() for _ in range(2)]
+        assert [event.kind for event in received] == [events.RESYNC, "created"]
+        assert received[1].task_id == 3
+        assert subscription.resyncs == 1
+
+    asyncio.run(scenario())
+
+
+def test_keepalive_comment_when_idle():
+    """An idle stream sends a comment every keepalive period."""
+
+    async def scenario():
+        stream = events.stream_events(keepalive=0.01)
+        assert (await anext(stream)).startswith(b"retry: ")
+        assert await anext(stream) == b": keepalive\n\n"
+        await stream.aclose()
+        assert events.subscriber_count() == 0
+
+    asyncio.run(scenario())
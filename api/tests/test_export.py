@@ -0,0 +1,77 @@
+"""Tests for the streaming export of tasks in the Spirited Todo List API."""
+
+import csv
+import io
+import json
+
+from sqlmodel import Session, SQLModel, create_engine
+
+from crud.export import export_tasks
+from models.task import Task
+
+
+def test_export_ndjson(client):
+    """The NDJSON export has one task per line, in the same form as the list items."""
+    client.post("/tasks/bulk", json=[{"title": f"Task {i}"} for i in range(3)])
+    resp = client.get("/tasks/export", params={"sort_by": "id", "sort_order": "asc"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    listed = client.get("/tasks/", params={"sort_by": "id", "sort_order": "asc"})
+    assert lines == listed.json()["items"]
+
+
+def test_export_csv(client):
+    """The CSV export has a header line, then one task per line, quoted as needed."""
+    client.post(
+        "/tasks/",
+        json={"title": 'Say "hi", then leave', "description": "Line 1\nLine 2"},
+    )
+    resp = client.get("/tasks/export", params={"format": "csv"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "text/csv; charset=utf-8"
+    assert 'filename="tasks.csv"' in resp.headers["content-disposition"]
+    (row,) = csv.DictReader(io.StringIO(resp.text))
+    assert row["title"] == 'Say "hi", then leave'
+    assert row["description"] == "Line 1\nLine 2"
+    assert row["priority"] == "1"
+    assert row["deadline"] == ""
+
+
+def test_export_empty_csv_has_header(client):
+    """Exporting no task still gives the CSV header."""
+    resp = client.get("/tasks/export", params={"format": "csv"})
+    assert (
+        resp.text.strip()
+        == "title,description,priority,deadline,list_id,id,created_at,updated_at"
+    )
+
+
+def test_export_sort_and_filters(client):
+    """The export accepts the sort and filter options of the list."""
+    client.post(
+        "/tasks/bulk",
+        json=[{"title": f"Task {i}", "priority": 1 + i % 2} for i in range(6)],
+    )
+    resp = client.get(
+        "/tasks/export",
+        params={"priority": 2, "sort_by": "title", "sort_order": "desc"},
+    )
+    titles = [json.loads(line)["title"] for line in resp.text.splitlines()]
+    assert titles == ["Task 5", "Task 3", "Task 1"]
+
+
+def test_export_invalid_format(client):
+    """Unknown export formats are rejected."""
+    assert client.get("/tasks/export", params={"format": "xml"}).status_code == 422
+
+
+def test_export_streams_one_chunk_per_batch():
+    """Rows are read and formatted batch by batch."""
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(Task(title=f"Task {i}") for i in range(5))
+        session.commit()
+    chunks = list(export_tasks(lambda: Session(engine), "ndjson", batch_size=2))
+    assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 1]
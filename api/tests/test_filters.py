@@ -0,0 +1,103 @@
+"""Tests for the filters of the task list in the Spirited Todo List API."""
+
+from models.task import Priority
+
+
+def _titles(resp):
+    """Return the titles of the items of a list response."""
+    return [item["title"] for item in resp.json()["items"]]
+
+
+def _seed(client):
+    """Create tasks with various priorities and deadlines."""
+    client.post(
+        "/tasks/bulk",
+        json=[
+            {"title": "Overdue", "priority": 3, "deadline": "2024-01-01T00:00:00"},
+            {"title": "Soon", "priority": 2, "deadline": "2030-01-01T00:00:00"},
+            {"title": "Later", "priority": 3, "deadline": "2040-01-01T00:00:00"},
+            {"title": "Someday", "priority": 1},
+        ],
+    )
+
+
+def test_filter_priority_in_set(client):
+    """priority can be repeated to match any of several priorities."""
+    _seed(client)
+    resp = client.get("/tasks/", params={"priority": Priority.HIGH.value})
+    assert sorted(_titles(resp)) == ["Later", "Overdue"]
+    assert resp.json()["total"] == 2
+    resp = client.get("/tasks/", params=[("priority", 1), ("priority", 2)])
+    assert sorted(_titles(resp)) == ["Someday", "Soon"]
+
+
+def test_filter_deadline_range(client):
+    """deadline_before and deadline_after bound the deadline, and exclude no deadline."""
+    _seed(client)
+    resp = client.get("/tasks/", params={"deadline_before": "2025-01-01T00:00:00"})
+    assert _titles(resp) == ["Overdue"]
+    resp = client.get(
+        "/tasks/",
+        params={
+            "deadline_after": "2025-01-01T00:00:00",
+            "deadline_before": "2035-01-01T00:00:00",
+        },
+    )
+    assert _titles(resp) == ["Soon"]
+    # Datetimes with a timezone are converted to UTC
+    resp = client.get(
+        "/tasks/", params={"deadline_before": "2024-01-01T04:00:00+03:00"}
+    )
+    assert _titles(resp) == ["Overdue"]
+    resp = client.get(
+        "/tasks/", params={"deadline_before": "2024-01-01T02:00:00+03:00"}
+    )
+    assert _titles(resp) == []
+
+
+def test_filter_has_deadline(client):
+    """has_deadline keeps the tasks with, or without, a deadline."""
+    _seed(client)
+    assert _titles(client.get("/tasks/", params={"has_deadline": "false"})) == [
+        "Someday"
+    ]
+    resp = client.get("/tasks/", params={"has_deadline": "true"})
+    assert resp.json()["total"] == 3
+
+
+def test_filter_created_and_updated_since(client):
+    """created_since and updated_since keep the tasks created or updated since then."""
+    old_id = client.post("/tasks/", json={"title": "Old"}).json()["id"]
+    new = client.post("/tasks/", json={"title": "New"}).json()
+    resp = client.get("/tasks/", params={"created_since": new["created_at"]})
+    assert _titles(resp) == ["New"]
+    updated = client.patch(f"/tasks/{old_id}", json={"title": "Old edited"}).json()
+    resp = client.get("/tasks/", params={"updated_since": updated["updated_at"]})
+    assert _titles(resp) == ["Old edited"]
+
+
+def test_filters_with_cursor_pagination(client):
+    """Filters apply to every cursor page, with every sort option."""
+    client.post(
+        "/tasks/bulk",
+        json=[{"title": f"Task {i:02}", "priority": 1 + i % 3} for i in range(15)],
+    )
+    expected = sorted(f"Task {i:02}" for i in range(15) if i % 3 != 1)
+    for sort_by in ("priority", "created_at", "updated_at", "title", "id"):
+        titles, cursor = [], None
+        while True:
+            params = [("priority", 1), ("priority", 3), ("sort_by", sort_by)]
+            params += [("limit", 4)] + ([("cursor", cursor)] if cursor else [])
+            body = client.get("/tasks/", params=params).json()
+            titles += [item["title"] for item in body["items"]]
+            assert body["total"] == len(expected)
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+        assert sorted(titles) == expected
+
+
+def test_invalid_filter(client):
+    """Invalid filter values are rejected."""
+    assert client.get("/tasks/", params={"priority": 7}).status_code == 422
+    assert client.get("/tasks/", params={"deadline_before": "soon"}).status_code == 422
@@ -0,0 +1,79 @@
+"""Tests for the group commit of single task writes in the Spirited Todo List API."""
+
+import pytest
+
+from crud import group_commit
+from crud.task import MAX_HIGH_PRIORITY_TASK, stage_create_task, stage_update_task
+from models.task import Priority
+from schemas.task import TaskCreate, TaskUpdate
+from tests.conftest import get_test_session_factory
+
+
+@pytest.fixture(name="batcher")
+def batcher_fixture(db):  # pylint: disable=unused-argument
+    """Run the routes' single writes through a write batcher on the test database."""
+    group_commit.start_write_batcher(get_test_session_factory(), window_ms=20)
+    yield group_commit.get_write_batcher()
+    group_commit.stop_write_batcher()
+
+
+def test_routes_write_through_the_batcher(client, batcher):
+    """Creates, updates and deletes behave as with one commit per request."""
+    task = client.post("/tasks/", json={"title": "Batched"})
+    assert task.status_code == 201
+    task_id = task.json()["id"]
+    assert (
+        task.json()["created_at"]
+        == client.get(f"/tasks/{task_id}").json()["created_at"]
+    )
+    updated = client.patch(f"/tasks/{task_id}", json={"title": "Edited"})
+    assert updated.json()["title"] == "Edited"
+    assert client.get(f"/tasks/{task_id}").json()["title"] == "Edited"
+    assert client.patch("/tasks/999", json={"title": "x"}).status_code == 404
+    assert client.delete(f"/tasks/{task_id}").status_code == 204
+    assert client.get(f"/tasks/{task_id}").status_code == 404
+    assert batcher.batches >= 3
+
+
+def test_batch_commits_once_and_keeps_the_high_priority_limit(batcher):
+    """Concurrent writes share one commit; past the limit, HIGH writes fail alone."""
+    batcher.window, batcher.max_size = 10.0, MAX_HIGH_PRIORITY_TASK + 3
+    futures = [
+        batcher.submit(
+            stage_create_task, TaskCreate(title=f"High {i}", priority=Priority.HIGH)
+        )
+        for i in range(MAX_HIGH_PRIORITY_TASK + 2)
+    ]
+    futures.append(batcher.submit(stage_create_task, TaskCreate(title="Low")))
+    outcomes = [future.exception() or future.result() for future in futures]
+    errors = [outcome for outcome in outcomes if isinstance(outcome, ValueError)]
+    created = [outcome for outcome in outcomes if not isinstance(outcome, Exception)]
+    assert len(errors) == 2
+    assert len(created) == MAX_HIGH_PRIORITY_TASK + 1
+    assert [task.title for task in created][-1] == "Low"
+    assert batcher.batches == 1
+
+
+def test_failed_write_does_not_undo_the_others(client, batcher):
+    """A promotion past the limit is rolled back alone, in its savepoint."""
+    ids = [
+        client.post("/tasks/", json={"title": f"T{i}", "priority": 3}).json()["id"]
+        for i in range(MAX_HIGH_PRIORITY_TASK)
+    ]
+    low = client.post("/tasks/", json={"title": "Low"}).json()["id"]
+    batcher.window, batcher.max_size = 10.0, 2
+    promote = batcher.submit(stage_update_task, low, TaskUpdate(priority=Priority.HIGH))
+    rename = batcher.submit(stage_update_task, ids[0], TaskUpdate(title="Renamed"))
+    assert isinstance(promote.exception(), ValueError)
+    assert rename.result().title == "Renamed"
+    assert client.get(f"/tasks/{low}").json()["priority"] == Priority.LOW
+    assert client.get(f"/tasks/{ids[0]}").json()["title"] == "Renamed"
+
+
+def test_stop_commits_the_queued_writes(batcher):
+    """Stopping the batcher commits what is queued before returning."""
+    batcher.window = 10.0
+    future = batcher.submit(stage_create_task, TaskCreate(title="Queued"))
+    group_commit.stop_write_batcher()
+    assert future.result(timeout=0).title == "Queued"
+    assert group_commit.get_write_batcher() is None
@@ -0,0 +1,94 @@
+"""Tests for the streaming NDJSON import of tasks in the Spirited Todo List API."""
+
+import asyncio
+import json
+
+from crud import task_import
+from crud.task import MAX_HIGH_PRIORITY_TASK
+from models.task import Priority
+
+
+def _ndjson(*items):
+    """Build an NDJSON body from JSON-serializable items (str items are kept as is)."""
+    return "\n".join(
+        item if isinstance(item, str) else json.dumps(item) for item in items
+    )
+
+
+def test_import_in_batches(client):
+    """Every valid line is inserted, one commit per batch."""
+    body = _ndjson(*({"title": f"Task {i}"} for i in range(5)))
+    resp = client.post("/tasks/import", params={"batch_size": 2}, content=body)
+    assert resp.status_code == 200
+    assert resp.json() == {"inserted": 5, "rejected": 0, "batches": 3, "errors": []}
+    assert client.get("/tasks/").json()["total"] == 5
+
+
+def test_import_reports_invalid_lines(client):
+    """Invalid lines are rejected with their line number; blank lines are skipped."""
+    body = _ndjson({"title": "Ok"}, "", "{not json", {"priority": 2}, {"title": "Ok 2"})
+    summary = client.post("/tasks/import", content=body).json()
+    assert summary["inserted"] == 2
+    assert summary["rejected"] == 2
+    assert [error["line"] for error in summary["errors"]] == [3, 4]
+    assert all(error["error_code"] == "INVALID_INPUT" for error in summary["errors"])
+    assert "title" in summary["errors"][1]["msg"]
+
+
+def test_import_enforces_high_priority_limit_across_batches(client):
+    """The high priority limit holds across batches and counts existing tasks."""
+    client.post("/tasks/", json={"title": "Existing", "priority": Priority.HIGH.value})
+    body = _ndjson(
+        *(
+            {"title": f"High {i}", "priority": Priority.HIGH.value}
+            for i in range(MAX_HIGH_PRIORITY_TASK + 1)
+        )
+    )
+    summary = client.post("/tasks/import", params={"batch_size": 2}, content=body)
+    summary = summary.json()
+    assert summary["inserted"] == MAX_HIGH_PRIORITY_TASK - 1
+    assert summary["rejected"] == 2
+    assert [error["line"] for error in summary["errors"]] == [
+        MAX_HIGH_PRIORITY_TASK,
+        MAX_HIGH_PRIORITY_TASK + 1,
+    ]
+    assert summary["errors"][0]["error_code"] == "HIGH_PRIORITY_LIMIT"
+    resp = client.get("/tasks/", params={"priority": Priority.HIGH.value})
+    assert resp.json()["total"] == MAX_HIGH_PRIORITY_TASK
+
+
+def test_import_rejects_too_long_lines(client, monkeypatch):
+    """Lines longer than the limit are rejected without being buffered whole."""
+    monkeypatch.setattr(task_import, "MAX_IMPORT_LINE_BYTES", 64)
+    body = _ndjson({"title": "x" * 200}, {"title": "Short"})
+    summary = client.post("/tasks/import", content=body).json()
+    assert summary["inserted"] == 1
+    assert summary["errors"][0]["line"] == 1
+    assert "longer than 64 bytes" in summary["errors"][0]["msg"]
+
+
+def test_import_caps_reported_errors(client, monkeypatch):
+    """Only the first errors are reported, but every rejected line is counted."""
+    monkeypatch.setattr(task_import, "MAX_IMPORT_ERRORS", 2)
+    summary = client.post("/tasks/import", content=_ndjson(*["{}"] * 5)).json()
+    assert summary["rejected"] == 5
+    assert len(summary["errors"]) == 2
+
+
+def test_ndjson_lines_across_chunks():
+    """Lines split across chunks are reassembled; a last line needs no newline."""
+
+    async def chunks():
+        for chunk in (b'{"a"', b": 1}\n{", b'"b": 2}\n\n', b"last"):
+            yield chunk
+
+    async def collect():
+        # pylint: disable=protected-access
+        return [line async for line in task_import._ndjson_lines(chunks())]
+
+    assert asyncio.run(collect()) == [
+        (1, b'{"a": 1}'),
+        (2, b'{"b": 2}'),
+        (3, b""),
+        (4, b"last"),
+    ]
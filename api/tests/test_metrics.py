@@ -0,0 +1,88 @@
+"""Tests for the Prometheus metrics of the Spirited Todo List API."""
+
+from prometheus_client import REGISTRY
+
+from db.engine import create_db_engine
+from observability.metrics import statement_kind
+
+
+def _sample(name, **labels):
+    """Return the current value of a metric sample (0 if it was never recorded)."""
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_request_latency_by_route_and_status(client):
+    """Requests are counted by method, route template and status."""
+    labels = {"method": "GET", "route": "/tasks/{task_id}"}
+    found = _sample("http_request_duration_seconds_count", status="200", **labels)
+    missing = _sample("http_request_duration_seconds_count", status="404", **labels)
+    task_id = client.post("/tasks/", json={"title": "Task"}).json()["id"]
+    client.get(f"/tasks/{task_id}")
+    client.get(f"/tasks/{task_id + 1}")
+    assert (
+        _sample("http_request_duration_seconds_count", status="200", **labels)
+        == found + 1
+    )
+    assert (
+        _sample("http_request_duration_seconds_count", status="404", **labels)
+        == missing + 1
+    )
+
+
+def test_unmatched_paths_share_a_label(client):
+    """Paths that match no route do not create a series each."""
+    before = _sample(
+        "http_request_duration_seconds_count",
+        method="GET",
+        route="unmatched",
+        status="404",
+    )
+    client.get("/no/such/path")
+    client.get("/another/one")
+    assert (
+        _sample(
+            "http_request_duration_seconds_count",
+            method="GET",
+            route="unmatched",
+            status="404",
+        )
+        == before + 2
+    )
+
+
+def test_metrics_endpoint(client):
+    """GET /metrics renders the request, in-flight and SQL metrics as Prometheus text."""
+    client.get("/tasks/")
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert (
+        'http_request_duration_seconds_bucket{le="0.005",method="GET",route="/tasks/"'
+        in body
+    )
+    # The scrape itself is in flight while the metrics are rendered
+    assert 'http_requests_in_progress{method="GET"} 1.0' in body
+    assert 'db_statement_duration_seconds_count{statement="SELECT task"}' in body
+
+
+def test_pool_wait_and_checkouts(tmp_path):
+    """Connections taken from a file database pool are counted and their wait timed."""
+    waits = _sample("db_pool_wait_seconds_count")
+    checkouts = _sample("db_pool_checkouts_total")
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    with engine.connect():
+        assert _sample("db_pool_checked_out_connections") >= 1
+    assert _sample("db_pool_wait_seconds_count") == waits + 1
+    assert _sample("db_pool_checkouts_total") == checkouts + 1
+    engine.dispose()
+
+
+def test_statement_kind():
+    """Statements are labelled by verb and main table, whatever their parameters."""
+    assert statement_kind("SELECT task.id FROM task WHERE task.id IN (?, ?)") == (
+        "SELECT task"
+    )
+    assert statement_kind("INSERT INTO task (title) VALUES (?)") == "INSERT task"
+    assert statement_kind("UPDATE task SET id=id WHERE 0=1") == "UPDATE task"
+    assert statement_kind("PRAGMA user_version") == "PRAGMA"
@@ -0,0 +1,145 @@
+"""Tests for the versioned schema migrations of the Spirited Todo List API."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from sqlalchemy import inspect, text
+from sqlmodel import create_engine
+
+from db.migrations import (
+    SCHEMA_VERSION,
+    ensure_schema,
+    get_schema_version,
+    run_migrations,
+)
+from models.task import Task
+
+# Table shape created by the old create_all at startup: no secondary indexes
+LEGACY_TASK_TABLE = (
+    "CREATE TABLE task (id INTEGER NOT NULL, title VARCHAR NOT NULL, "
+    "description VARCHAR, priority INTEGER, created_at DATETIME NOT NULL, "
+    "updated_at DATETIME NOT NULL, deadline DATETIME, PRIMARY KEY (id))"
+)
+
+# Worker startup: wait until every worker is ready, then bring the schema up to date
+STARTUP_SCRIPT = """
+import sys, time
+from pathlib import Path
+from db.engine import create_db_engine
+from db.migrations import ensure_schema
+url, ready_dir, workers, index = sys.argv[1], Path(sys.argv[2]), int(sys.argv[3]), sys.argv[4]
+engine = create_db_engine(url)
+(ready_dir / index).touch()
+while len(list(ready_dir.iterdir())) < workers:
+    time.sleep(0.001)
+print(ensure_schema(engine)[1])
+"""
+
+
+def test_migrations_create_schema_on_new_database():
+    """A new database gets every table and index, and the latest schema version."""
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        assert run_migrations(connection) == SCHEMA_VERSION
+        assert get_schema_version(connection) == SCHEMA_VERSION
+        index_names = {ix["name"] for ix in inspect(connection).get_indexes("task")}
+    assert {ix.name for ix in Task.__table__.indexes} <= index_names
+
+
+def test_migrations_upgrade_legacy_database():
+    """A database created before migrations existed gets the indexes and keeps its rows."""
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text(LEGACY_TASK_TABLE))
+        connection.execute(
+            text(
+                "INSERT INTO task (title, priority, created_at, updated_at) "
+                "VALUES ('Legacy', 3, '2024-01-01 00:00:00', '2024-01-01 00:00:00')"
+            )
+        )
+        assert get_schema_version(connection) == 0
+        run_migrations(connection)
+        index_names = {ix["name"] for ix in inspect(connection).get_indexes("task")}
+        assert "ix_task_priority_id" in index_names
+        assert (
+            connection.execute(text("SELECT title FROM task")).scalar_one() == "Legacy"
+        )
+        # Existing rows are backfilled into the full-text index
+        assert (
+            connection.execute(
+                text("SELECT rowid FROM task_fts WHERE task_fts MATCH 'legacy'")
+            ).scalar_one()
+            == 1
+        )
+        # Existing rows get change version 0 and deletes write tombstones
+        assert (
+            connection.execute(text("SELECT change_version FROM task")).scalar_one()
+            == 0
+        )
+        # Existing rows go to the default task list
+        assert (
+            connection.execute(text("SELECT list_id FROM task")).scalar_one()
+            == "default"
+        )
+        connection.execute(text("DELETE FROM task"))
+        assert (
+            connection.execute(text("SELECT id FROM task_tombstone")).scalar_one() == 1
+        )
+
+
+def test_migrations_are_applied_once():
+    """Running the migrations again on an up-to-date database is a no-op."""
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        run_migrations(connection)
+        assert run_migrations(connection) == SCHEMA_VERSION
+
+
+def test_ensure_schema_skips_ddl_when_up_to_date(tmp_path, count_queries):
+    """Once migrated, starting again only reads the stored schema version."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+    assert ensure_schema(engine) == (SCHEMA_VERSION, True)
+    with count_queries() as statements:
+        assert ensure_schema(engine) == (SCHEMA_VERSION, False)
+    assert statements == ["PRAGMA user_version"]
+    engine.dispose()
+
+
+def test_concurrent_workers_migrate_once(tmp_path):
+    """Workers starting together on a legacy database migrate it one at a time."""
+    path = tmp_path / "legacy.db"
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        # Already served by the app, so in WAL mode: workers connect without waiting
+        connection.exec_driver_sql("PRAGMA journal_mode=WAL")
+        connection.execute(text(LEGACY_TASK_TABLE))
+    engine.dispose()
+    ready_dir = tmp_path / "ready"
+    ready_dir.mkdir()
+    workers = 6
+    processes = [
+        subprocess.Popen(  # pylint: disable=consider-using-with
+            [
+                sys.executable,
+                "-c",
+                STARTUP_SCRIPT,
+                f"sqlite:///{path}",
+                str(ready_dir),
+                str(workers),
+                str(index),
+            ],
+            cwd=Path(__file__).parent.parent,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        for index in range(workers)
+    ]
+    results = [process.communicate(timeout=60) for process in processes]
+    assert [process.returncode for process in processes] == [0] * workers, results
+    assert sorted(out.strip() for out, _ in results) == ["False"] * 5 + ["True"]
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.connect() as connection:
+        assert get_schema_version(connection) == SCHEMA_VERSION
+    engine.dispose()
@@ -0,0 +1,99 @@
+"""Tests for keyset (cursor) pagination of the task list in the Spirited Todo List API."""
+
+import pytest
+
+from crud.pagination import encode_cursor
+from models.error import ErrorCode
+from models.task import Priority
+
+SORT_FIELDS = ["priority", "created_at", "updated_at", "title", "id"]
+
+
+def _seed(client):
+    """Create tasks with duplicated sort keys so that the id tiebreaker matters."""
+    titles = ["B", "A", "C", "A", "B", "D", "A"]
+    priorities = [Priority.LOW, Priority.MID, Priority.LOW, Priority.MID] * 2
+    for title, priority in zip(titles, priorities):
+        resp = client.post("/tasks/", json={"title": title, "priority": priority.value})
+        assert resp.status_code == 201
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.parametrize("sort_by", SORT_FIELDS)
+def test_cursor_walk_matches_offset_order(client, sort_by, sort_order):
+    """Walking next_cursor pages returns every task once, in the same order as offset mode."""
+    _seed(client)
+    params = f"sort_by={sort_by}&sort_order={sort_order}"
+    expected = [
+        t["id"] for t in client.get(f"/tasks/?limit=100&{params}").json()["items"]
+    ]
+    assert len(expected) == 7
+
+    seen = []
+    resp = client.get(f"/tasks/?limit=2&{params}")
+    while True:
+        assert resp.status_code == 200
+        data = resp.json()
+        seen.extend(t["id"] for t in data["items"])
+        if data["next_cursor"] is None:
+            break
+        resp = client.get(f"/tasks/?limit=2&{params}&cursor={data['next_cursor']}")
+    assert seen == expected
+
+
+def test_last_page_has_no_next_cursor(client):
+    """A page that reaches the end of the table does not return a cursor."""
+    _seed(client)
+    data = client.get("/tasks/?limit=7").json()
+    assert len(data["items"]) == 7
+    assert data["next_cursor"] is None
+    data = client.get("/tasks/?limit=6").json()
+    assert data["next_cursor"] is not None
+
+
+def test_cursor_ignores_offset(client):
+    """The offset parameter is ignored when a cursor is given."""
+    _seed(client)
+    first = client.get("/tasks/?limit=3").json()
+    with_offset = client.get(f"/tasks/?limit=3&offset=5&cursor={first['next_cursor']}")
+    without_offset = client.get(f"/tasks/?limit=3&cursor={first['next_cursor']}")
+    assert with_offset.json()["items"] == without_offset.json()["items"]
+
+
+def test_invalid_cursor(client):
+    """A malformed cursor is rejected with INVALID_INPUT."""
+    resp = client.get("/tasks/?cursor=not-a-cursor")
+    assert resp.status_code == 400
+    assert resp.json()["detail"]["error_code"] == ErrorCode.INVALID_INPUT
+
+
+@pytest.mark.parametrize(
+    "sort_by, value, last_id",
+    [
+        ("priority", [1, 2], 1),
+        ("priority", {"a": 1}, 1),
+        ("priority", True, 1),
+        ("title", 3, 1),
+        ("created_at", 3, 1),
+        ("id", 1, 10**30),
+        ("id", 1, "1"),
+    ],
+)
+def test_cursor_with_invalid_values(client, sort_by, value, last_id):
+    """A cursor whose value or id does not fit the sort column is rejected, not run."""
+    _seed(client)
+    cursor = encode_cursor(sort_by, "desc", value, last_id)
+    resp = client.get(f"/tasks/?sort_by={sort_by}&cursor={cursor}")
+    assert resp.status_code == 400
+    assert resp.json()["detail"]["error_code"] == ErrorCode.INVALID_INPUT
+
+
+def test_cursor_sort_mismatch(client):
+    """A cursor cannot be reused with a different sort."""
+    _seed(client)
+    cursor = client.get("/tasks/?limit=2&sort_by=title").json()["next_cursor"]
+    resp = client.get(f"/tasks/?limit=2&sort_by=priority&cursor={cursor}")
+    assert resp.status_code == 400
+    assert resp.json()["detail"]["error_code"] == ErrorCode.INVALID_INPUT
+    resp = client.get(f"/tasks/?limit=2&sort_by=title&sort_order=asc&cursor={cursor}")
+    assert resp.status_code == 400
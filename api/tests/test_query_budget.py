@@ -0,0 +1,79 @@
+"""Tests for the SQL statement budget of each task endpoint.
+
+Each endpoint must stay within its number of statements, so an N+1 pattern or an extra
+round-trip fails here. Raise a budget only along with the change that needs it.
+"""
+
+import pytest
+
+from observability.context import QUERY_COUNT_HEADER
+
+
+@pytest.fixture(name="task_id")
+def task_id_fixture(client):
+    """Create a task and return its id."""
+    return client.post("/tasks/", json={"title": "Budget"}).json()["id"]
+
+
+@pytest.mark.parametrize(
+    "method, url, kwargs, budget",
+    [
+        ("GET", "/tasks/", {}, 3),  # table version, total, page
+        ("GET", "/tasks/?include_total=false", {}, 2),
+        ("GET", "/tasks/?priority=1&deadline_after=2020-01-01T00:00:00Z", {}, 3),
+        ("GET", "/tasks/search?q=budget", {}, 2),
+        ("GET", "/tasks/export", {}, 1),
+        ("GET", "/tasks/changes", {}, 2),  # table version, tasks (no tombstones)
+        ("POST", "/tasks/", {"json": {"title": "New"}}, 3),
+        ("POST", "/tasks/", {"json": {"title": "New", "priority": 3}}, 4),
+        ("PATCH", "/tasks/{id}", {"json": {"title": "Renamed"}}, 4),
+        ("PATCH", "/tasks/{id}", {"json": {"priority": 3}}, 5),
+        ("DELETE", "/tasks/{id}", {}, 3),
+    ],
+)
+def test_endpoint_query_budget(
+    client, task_id, assert_max_queries, method, url, kwargs, budget
+):  # pylint: disable=too-many-arguments
+    """Every endpoint runs at most its budget of SQL statements."""
+    with assert_max_queries(budget):
+        resp = client.request(method, url.format(id=task_id), **kwargs)
+    assert resp.status_code < 400
+
+
+def test_read_task_budget(client, task_id, assert_max_queries):
+    """A task read costs one statement, and none once cached."""
+    with assert_max_queries(1):
+        client.get(f"/tasks/{task_id}")
+    with assert_max_queries(0):
+        client.get(f"/tasks/{task_id}")
+
+
+@pytest.mark.parametrize("size", [2, 20])
+def test_bulk_budget_does_not_grow_with_size(client, assert_max_queries, size):
+    """Bulk creates, updates and deletes run a fixed number of statements, whatever their
+    size: the tasks are written with one executemany statement."""
+    with assert_max_queries(4):
+        created = client.post(
+            "/tasks/bulk", json=[{"title": f"Task {i}"} for i in range(size)]
+        ).json()["items"]
+    ids = [task["id"] for task in created]
+    with assert_max_queries(4):
+        client.patch("/tasks/bulk", json=[{"id": i, "title": "Edit"} for i in ids])
+    with assert_max_queries(4):
+        client.request("DELETE", "/tasks/bulk", json=ids)
+
+
+def test_import_budget_is_per_batch(client, assert_max_queries):
+    """An import runs a fixed number of statements per batch, not per line."""
+    body = "\n".join(f'{{"title": "Task {i}"}}' for i in range(2000))
+    with assert_max_queries(6):
+        resp = client.post("/tasks/import", params={"batch_size": 1000}, content=body)
+    assert resp.json()["inserted"] == 2000
+
+
+def test_query_count_header_in_debug_mode(client, task_id, monkeypatch):
+    """With DEBUG_ENDPOINTS=true responses tell how many statements they ran."""
+    assert QUERY_COUNT_HEADER not in client.get("/tasks/").headers
+    monkeypatch.setenv("DEBUG_ENDPOINTS", "true")
+    assert client.get("/tasks/").headers[QUERY_COUNT_HEADER] == "2"
+    assert client.get(f"/tasks/{task_id}").headers[QUERY_COUNT_HEADER] == "1"
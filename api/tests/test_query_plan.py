@@ -0,0 +1,128 @@
+"""EXPLAIN QUERY PLAN assertions so the task indexes don't quietly stop being used."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine
+
+from crud.sync import get_changes
+from crud.task import VALID_SORT_FIELDS, create_task, get_tasks
+from models.task import Priority, Task
+from schemas.task import TaskCreate, TaskFilter
+
+
+@pytest.fixture(name="plan_session")
+def plan_session_fixture():
+    """Yield a session on a private in-memory DB, with the task SELECTs it runs recorded."""
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(
+        conn, cursor, statement, parameters, context, executemany
+    ):  # pylint: disable=unused-argument,too-many-arguments
+        if statement.startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    with Session(engine) as session:
+        for i in range(6):
+            session.add(Task(title=f"Task {i % 2}", priority=Priority(1 + i % 3)))
+        session.commit()
+        statements.clear()
+        session.info["statements"] = statements
+        yield session
+
+
+def _plans(session: Session, marker: str) -> list[list[str]]:
+    """Return the query plan of the recorded statements containing marker, and reset the recording."""
+    statements = [s for s in session.info["statements"] if marker in s[0]]
+    plans = [
+        [
+            row[3]
+            for row in session.connection().exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            )
+        ]
+        for statement, parameters in statements
+    ]
+    session.info["statements"].clear()
+    return plans
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.parametrize("sort_by", VALID_SORT_FIELDS)
+def test_list_queries_use_sort_index(plan_session, sort_by, sort_order):
+    """Offset pages scan the sort index in order, cursor pages seek into it."""
+    _, _, next_cursor = get_tasks(
+        plan_session, limit=2, sort_by=sort_by, sort_order=sort_order
+    )
+    (offset_plan,) = _plans(plan_session, "ORDER BY")
+    get_tasks(
+        plan_session,
+        limit=2,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        cursor=next_cursor,
+    )
+    (cursor_plan,) = _plans(plan_session, "ORDER BY")
+
+    if sort_by == "id":
+        assert offset_plan == ["SCAN task"]
+        assert cursor_plan[0].startswith("SEARCH task USING INTEGER PRIMARY KEY")
+        return
+    index = f"ix_task_{sort_by}_id"
+    op = "<" if sort_order == "desc" else ">"
+    assert offset_plan == [f"SCAN task USING INDEX {index}"]
+    assert f"SEARCH task USING INDEX {index} ({sort_by}=? AND id{op}?)" in cursor_plan
+    assert f"SEARCH task USING INDEX {index} ({sort_by}{op}?)" in cursor_plan
+    assert not any(step.startswith("SCAN task") for step in cursor_plan)
+
+
+def test_high_priority_check_uses_list_priority_index(plan_session):
+    """The high priority limit check of a list searches the (list_id, priority) index."""
+    create_task(plan_session, TaskCreate(title="High", priority=Priority.HIGH))
+    plans = _plans(plan_session, "WHERE task.list_id =")
+    assert plans
+    for plan in plans:
+        assert any(
+            "USING" in step and "ix_task_list_id_priority_id" in step for step in plan
+        )
+        assert not any(step.startswith("SCAN task") for step in plan)
+
+
+@pytest.mark.parametrize(
+    "filters, index",
+    [
+        (TaskFilter(priority=[Priority.HIGH]), "ix_task_priority_id"),
+        (TaskFilter(deadline_before=datetime(2025, 1, 1)), "ix_task_deadline_id"),
+        (TaskFilter(has_deadline=False), "ix_task_deadline_id"),
+        (TaskFilter(created_since=datetime(2025, 1, 1)), "ix_task_created_at_id"),
+        (TaskFilter(updated_since=datetime(2025, 1, 1)), "ix_task_updated_at_id"),
+    ],
+)
+def test_filtered_total_uses_index(plan_session, filters, index):
+    """The count of the tasks matching a filter searches the index of the filter."""
+    get_tasks(plan_session, filters=filters)
+    (count_plan,) = _plans(plan_session, "count(*)")
+    assert len(count_plan) == 1
+    assert count_plan[0].startswith(f"SEARCH task USING COVERING INDEX {index} ")
+
+
+def test_priority_filter_uses_priority_index(plan_session):
+    """A page filtered and sorted on priority searches the priority index."""
+    get_tasks(plan_session, filters=TaskFilter(priority=[Priority.HIGH]))
+    (page_plan,) = _plans(plan_session, "ORDER BY")
+    assert page_plan == ["SEARCH task USING INDEX ix_task_priority_id (priority=?)"]
+
+
+def test_sync_queries_seek_change_version_index(plan_session):
+    """Delta sync seeks the (change_version, id) indexes of tasks and tombstones."""
+    since = get_changes(plan_session, limit=2).token
+    plan_session.info["statements"].clear()
+    get_changes(plan_session, since=since)
+    task_plan, tombstone_plan = _plans(plan_session, "change_version <=")
+    assert any("ix_task_change_version_id" in step for step in task_plan)
+    assert any("ix_task_tombstone_change_version_id" in step for step in tombstone_plan)
+    assert not any("TEMP B-TREE" in step for step in task_plan + tombstone_plan)
@@ -0,0 +1,66 @@
+"""Tests for the full-text search of tasks in the Spirited Todo List API."""
+
+
+def _titles(resp):
+    """Return the titles of the items of a search response."""
+    return [item["title"] for item in resp.json()["items"]]
+
+
+def test_search_ranks_title_matches_first(client):
+    """Matches in the title rank above matches in the description only."""
+    client.post("/tasks/", json={"title": "Call mom", "description": "About milk"})
+    client.post("/tasks/", json={"title": "Buy milk", "description": "At the shop"})
+    client.post("/tasks/", json={"title": "Walk the dog"})
+    resp = client.get("/tasks/search", params={"q": "milk"})
+    assert resp.status_code == 200
+    assert _titles(resp) == ["Buy milk", "Call mom"]
+    assert resp.json()["total"] == 2
+
+
+def test_search_matches_prefixes_of_every_word(client):
+    """Every word must match, as a word prefix, case and accent insensitively."""
+    client.post("/tasks/", json={"title": "Écrire le rapport trimestriel"})
+    client.post("/tasks/", json={"title": "Lire le rapport"})
+    assert _titles(client.get("/tasks/search", params={"q": "ecri RAPP"})) == [
+        "Écrire le rapport trimestriel"
+    ]
+
+
+def test_search_follows_updates_and_deletes(client):
+    """The index is kept in sync with updates, bulk updates and deletes."""
+    task_id = client.post("/tasks/", json={"title": "Old title"}).json()["id"]
+    client.patch(f"/tasks/{task_id}", json={"title": "New title"})
+    assert _titles(client.get("/tasks/search", params={"q": "old"})) == []
+    assert _titles(client.get("/tasks/search", params={"q": "new"})) == ["New title"]
+    client.patch("/tasks/bulk", json=[{"id": task_id, "description": "Bulk text"}])
+    assert _titles(client.get("/tasks/search", params={"q": "bulk"})) == ["New title"]
+    client.delete(f"/tasks/{task_id}")
+    assert _titles(client.get("/tasks/search", params={"q": "new"})) == []
+
+
+def test_search_pagination(client):
+    """Search results are paginated with limit and offset."""
+    client.post("/tasks/bulk", json=[{"title": f"Report {i}"} for i in range(5)])
+    resp = client.get("/tasks/search", params={"q": "report", "limit": 2, "offset": 4})
+    body = resp.json()
+    assert len(body["items"]) == 1
+    assert body["total"] == 5
+    assert body["page"] == 3
+    resp = client.get("/tasks/search", params={"q": "report", "include_total": "false"})
+    assert resp.json()["total"] is None
+
+
+def test_search_query_syntax_is_text(client):
+    """FTS5 operators and punctuation in q do not cause errors."""
+    client.post("/tasks/", json={"title": "Fix bug OR feature"})
+    resp = client.get("/tasks/search", params={"q": 'bug" OR (feat*'})
+    assert resp.status_code == 200
+    assert _titles(resp) == ["Fix bug OR feature"]
+
+
+def test_search_invalid_query(client):
+    """A query without any word is rejected."""
+    resp = client.get("/tasks/search", params={"q": "?!"})
+    assert resp.status_code == 400
+    assert resp.json()["detail"]["error_code"] == "INVALID_INPUT"
+    assert client.get("/tasks/search").status_code == 422
@@ -0,0 +1,166 @@
+"""Tests for the sharding of tasks across SQLite databases in the Spirited Todo List API."""
+
+import pytest
+from sqlalchemy import text
+
+from crud.task import MAX_HIGH_PRIORITY_TASK
+from db.shards import SHARD_ID_STRIDE, HashRing, ShardSet, get_task_shards
+from main import app
+from models.error import ErrorCode
+from models.task import Priority
+
+LISTS = ("home", "work", "errands", "books", "garden", "travel")
+
+
+@pytest.fixture(name="shards")
+def shards_fixture(tmp_path, client):  # pylint: disable=unused-argument
+    """Serve the task routes from three fresh shard databases."""
+    shard_set = ShardSet([f"sqlite:///{tmp_path / f'shard{i}.db'}" for i in range(3)])
+    shard_set.migrate()
+    app.dependency_overrides[get_task_shards] = lambda: shard_set
+    yield shard_set
+    app.dependency_overrides.pop(get_task_shards)
+    shard_set.dispose()
+
+
+def _shard_titles(shards: ShardSet, index: int) -> set[str]:
+    """Read the titles of the tasks stored in a shard database."""
+    with shards.engines[index].connect() as connection:
+        return set(connection.execute(text("SELECT title FROM task")).scalars())
+
+
+def _create_tasks(client) -> list[dict]:
+    """Create tasks of mixed priorities and titles in every list."""
+    created = []
+    for i in range(12):
+        payload = {
+            "title": f"Task {(i * 7) % 12:02d}",
+            "priority": 1 + i % 3,
+            "list_id": LISTS[i % len(LISTS)],
+        }
+        resp = client.post("/tasks/", json=payload)
+        assert resp.status_code == 201
+        created.append(resp.json())
+    return created
+
+
+def test_hash_ring_moves_few_lists_when_a_shard_is_added():
+    """Adding a shard only moves lists to the new shard, about 1/N of them."""
+    keys = [f"list-{i}" for i in range(2000)]
+    before, after = HashRing(4), HashRing(5)
+    moved = [key for key in keys if before.shard_for(key) != after.shard_for(key)]
+    assert all(after.shard_for(key) == 4 for key in moved)
+    assert 0.1 < len(moved) / len(keys) < 0.3
+    for index in range(5):
+        share = sum(after.shard_for(key) == index for key in keys) / len(keys)
+        assert 0.1 < share < 0.3
+
+
+def test_tasks_are_stored_in_the_shard_of_their_list(client, shards):
+    """A task is written to the shard of its list, and its ID names that shard."""
+    created = _create_tasks(client)
+    for task in created:
+        index = shards.shard_for_list(task["list_id"])
+        assert shards.shard_for_task(task["id"]) == index
+        assert (task["id"] - 1) % SHARD_ID_STRIDE == index
+        assert task["title"] in _shard_titles(shards, index)
+    assert len({task["id"] for task in created}) == len(created)
+    assert len({shards.shard_for_task(task["id"]) for task in created}) > 1
+
+
+def test_sharded_get_update_delete(client, shards):
+    """Single task routes find the task on its shard from the ID alone."""
+    task = _create_tasks(client)[0]
+    task_url = f"/tasks/{task['id']}"
+    assert client.get(task_url).json()["title"] == task["title"]
+    resp = client.patch(task_url, json={"title": "Renamed"})
+    assert resp.status_code == 200
+    assert client.get(task_url).json()["title"] == "Renamed"
+    assert client.delete(task_url).status_code == 204
+    assert client.get(task_url).status_code == 404
+    assert client.delete(task_url).status_code == 404
+    # An ID past the configured shards belongs to none of them
+    assert client.get(f"/tasks/{len(shards) + 1}").status_code == 404
+
+
+@pytest.mark.parametrize("sort_by", ["priority", "title", "created_at", "id"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.usefixtures("shards")
+def test_sharded_list_is_merged_in_sort_order(client, sort_by, sort_order):
+    """The list gathers every shard in sort order, by offset and by cursor pages."""
+    created = _create_tasks(client)
+    expected = [
+        task["id"]
+        for task in sorted(
+            created,
+            key=lambda task: (task[sort_by], task["id"]),
+            reverse=sort_order == "desc",
+        )
+    ]
+    params = {"sort_by": sort_by, "sort_order": sort_order}
+    listed = client.get("/tasks/", params={**params, "limit": 100}).json()
+    assert [task["id"] for task in listed["items"]] == expected
+    assert listed["total"] == len(created)
+    assert listed["next_cursor"] is None
+
+    offset_ids = []
+    for offset in range(0, len(created), 5):
+        page = client.get("/tasks/", params={**params, "limit": 5, "offset": offset})
+        offset_ids += [task["id"] for task in page.json()["items"]]
+    assert offset_ids == expected
+
+    page = client.get("/tasks/", params={**params, "limit": 5}).json()
+    cursor_ids = [task["id"] for task in page["items"]]
+    while page["next_cursor"] is not None:
+        cursor = page["next_cursor"]
+        page = client.get(
+            "/tasks/", params={**params, "limit": 5, "cursor": cursor}
+        ).json()
+        cursor_ids += [task["id"] for task in page["items"]]
+    assert cursor_ids == expected
+
+
+@pytest.mark.usefixtures("shards")
+def test_sharded_list_filtered_by_list(client):
+    """A list filter is answered by the shard of that list alone."""
+    created = _create_tasks(client)
+    listed = client.get("/tasks/", params={"list_id": "work", "sort_by": "id"}).json()
+    expected = [task["id"] for task in created if task["list_id"] == "work"]
+    assert sorted(task["id"] for task in listed["items"]) == expected
+    assert listed["total"] == len(expected)
+
+
+@pytest.mark.usefixtures("shards")
+def test_sharded_list_etag_changes_with_any_shard(client):
+    """The list ETag holds the version of every shard."""
+    _create_tasks(client)
+    etag = client.get("/tasks/").headers["etag"]
+    assert client.get("/tasks/", headers={"If-None-Match": etag}).status_code == 304
+    client.post("/tasks/", json={"title": "New", "list_id": "travel"})
+    assert client.get("/tasks/", headers={"If-None-Match": etag}).status_code == 200
+
+
+@pytest.mark.usefixtures("shards")
+def test_sharded_high_priority_limit_is_per_list(client):
+    """The high priority limit of a list is enforced on its shard."""
+    high = {"priority": Priority.HIGH.value}
+    for i in range(MAX_HIGH_PRIORITY_TASK):
+        resp = client.post(
+            "/tasks/", json={"title": f"H{i}", "list_id": "home", **high}
+        )
+        assert resp.status_code == 201
+    resp = client.post("/tasks/", json={"title": "Over", "list_id": "home", **high})
+    assert resp.status_code == 400
+    assert resp.json()["detail"]["error_code"] == ErrorCode.HIGH_PRIORITY_LIMIT
+    resp = client.post("/tasks/", json={"title": "Work", "list_id": "work", **high})
+    assert resp.status_code == 201
+
+
+@pytest.mark.usefixtures("shards")
+def test_routes_not_spanning_shards_are_rejected(client):
+    """Routes that read a single database answer 501 when sharding is on."""
+    resp = client.get("/tasks/search", params={"q": "task"})
+    assert resp.status_code == 501
+    assert resp.json()["detail"]["error_code"] == ErrorCode.NOT_SUPPORTED_WITH_SHARDING
+    assert client.post("/tasks/bulk", json=[{"title": "A"}]).status_code == 501
+    assert client.get("/tasks/changes").status_code == 501
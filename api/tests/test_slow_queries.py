@@ -0,0 +1,63 @@
+"""Tests for the slow query log of the Spirited Todo List API."""
+
+import logging
+
+import pytest
+
+from observability import slow_queries
+from observability.slow_queries import statement_shape
+
+
+@pytest.fixture(name="log_every_query")
+def log_every_query_fixture(monkeypatch):
+    """Log every statement as slow, with fresh statistics."""
+    monkeypatch.setattr(slow_queries, "SLOW_QUERY_THRESHOLD_MS", 0)
+    slow_queries.reset_statement_stats()
+
+
+@pytest.mark.usefixtures("log_every_query")
+def test_slow_query_is_logged_with_route_and_plan(client, caplog):
+    """A slow statement is logged with its parameters, route and query plan."""
+    task_id = client.post("/tasks/", json={"title": "Task"}).json()["id"]
+    with caplog.at_level(logging.WARNING, logger=slow_queries.__name__):
+        client.get(f"/tasks/{task_id}")
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(
+        "route GET /tasks/{task_id})" in msg
+        and f"parameters: ({task_id},)" in msg
+        and "plan: SEARCH task USING INTEGER PRIMARY KEY" in msg
+        for msg in messages
+    )
+
+
+def test_fast_queries_are_not_logged(client, monkeypatch, caplog):
+    """Statements under the threshold are only counted."""
+    monkeypatch.setattr(slow_queries, "SLOW_QUERY_THRESHOLD_MS", 60_000)
+    with caplog.at_level(logging.WARNING, logger=slow_queries.__name__):
+        client.get("/tasks/")
+    assert not caplog.records
+
+
+def test_statement_shape_collapses_in_lists():
+    """IN lists of any length and whitespace give one shape."""
+    assert statement_shape("SELECT *\n FROM task WHERE id IN (?, ?, ?)") == (
+        statement_shape("SELECT * FROM task WHERE id IN (?,?)")
+    )
+
+
+@pytest.mark.usefixtures("log_every_query")
+def test_debug_endpoint_lists_slowest_shapes(client, monkeypatch):
+    """GET /debug/slow-queries lists the slowest shapes, only when enabled."""
+    slow_queries.reset_statement_stats()
+    client.get("/tasks/")
+    assert client.get("/debug/slow-queries").status_code == 404
+    monkeypatch.setenv("DEBUG_ENDPOINTS", "true")
+    resp = client.get("/debug/slow-queries", params={"limit": 2})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["threshold_ms"] == 0
+    assert 0 < len(body["items"]) <= 2
+    durations = [item["max_ms"] for item in body["items"]]
+    assert durations == sorted(durations, reverse=True)
+    assert body["items"][0]["slow_calls"] >= 1
+    assert body["items"][0]["last_slow_route"] == "GET /tasks/"
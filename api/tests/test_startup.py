@@ -0,0 +1,22 @@
+"""Tests for the startup timing report of the Spirited Todo List API."""
+
+from observability.startup import startup_phase, startup_report
+
+
+def test_startup_phases_are_timed_in_order():
+    """Each phase is recorded in milliseconds, after the app imports."""
+    with startup_phase("test phase"):
+        pass
+    phases = startup_report()
+    assert list(phases)[0] == "imports"
+    assert phases["imports"] > 0
+    assert 0 <= phases["test phase"] < 1000
+
+
+def test_debug_endpoint_serves_the_startup_report(client, monkeypatch):
+    """GET /debug/startup serves the report only with DEBUG_ENDPOINTS on."""
+    assert client.get("/debug/startup").status_code == 404
+    monkeypatch.setenv("DEBUG_ENDPOINTS", "true")
+    report = client.get("/debug/startup").json()
+    assert "imports" in report["phases"]
+    assert report["total_ms"] == sum(report["phases"].values())
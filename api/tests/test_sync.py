@@ -0,0 +1,103 @@
+"""Tests for the delta sync endpoint of the Spirited Todo List API."""
+
+from sqlalchemy import text
+
+from db.tombstones import compact_tombstones
+from tests.conftest import connection
+
+
+def _sync(client, since=None, **params):
+    """Call GET /tasks/changes and return the JSON body."""
+    if since is not None:
+        params["since"] = since
+    resp = client.get("/tasks/changes", params=params)
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def test_full_sync_then_deltas(client):
+    """A sync returns the tasks written and deleted since the token, once."""
+    first = client.post("/tasks/", json={"title": "First"}).json()
+    second = client.post("/tasks/", json={"title": "Second"}).json()
+    full = _sync(client)
+    assert [task["id"] for task in full["items"]] == [first["id"], second["id"]]
+    assert full["deleted"] == [] and not full["has_more"]
+    assert _sync(client, full["token"])["items"] == []
+
+    client.patch(f"/tasks/{second['id']}", json={"title": "Edited"})
+    client.delete(f"/tasks/{first['id']}")
+    third = client.post("/tasks/", json={"title": "Third"}).json()
+    delta = _sync(client, full["token"])
+    assert [(task["id"], task["title"]) for task in delta["items"]] == [
+        (second["id"], "Edited"),
+        (third["id"], "Third"),
+    ]
+    assert delta["deleted"] == [first["id"]]
+    assert "change_version" not in delta["items"][0]
+    after = _sync(client, delta["token"])
+    assert after["items"] == [] and after["deleted"] == []
+
+
+def test_sync_pages_through_tasks_and_tombstones(client):
+    """Changes come in pages of limit, in commit order, with has_more."""
+    token = _sync(client)["token"]
+    ids = [
+        task["id"]
+        for task in client.post(
+            "/tasks/bulk", json=[{"title": f"Task {i}"} for i in range(3)]
+        ).json()["items"]
+    ]
+    client.request("DELETE", "/tasks/bulk", json=ids[:2])
+    client.patch(f"/tasks/{ids[2]}", json={"title": "Edited"})
+    seen_items, seen_deleted = [], []
+    for _ in range(5):
+        page = _sync(client, token, limit=2)
+        assert len(page["items"]) + len(page["deleted"]) <= 2
+        seen_items += [task["id"] for task in page["items"]]
+        seen_deleted += page["deleted"]
+        token = page["token"]
+        if not page["has_more"]:
+            break
+    assert seen_deleted == ids[:2]
+    assert seen_items == [ids[2]]
+
+
+def test_recreated_id_replaces_its_tombstone(client):
+    """SQLite reuses the ID of the last deleted task: the new task wins."""
+    client.post("/tasks/", json={"title": "Kept"})
+    doomed = client.post("/tasks/", json={"title": "Doomed"}).json()["id"]
+    token = _sync(client)["token"]
+    client.delete(f"/tasks/{doomed}")
+    reborn = client.post("/tasks/", json={"title": "Reborn"}).json()
+    assert reborn["id"] == doomed
+    delta = _sync(client, token)
+    assert [task["title"] for task in delta["items"]] == ["Reborn"]
+    assert delta["deleted"] == []
+
+
+def test_invalid_token(client):
+    """A malformed token is rejected."""
+    resp = client.get("/tasks/changes", params={"since": "not-a-token"})
+    assert resp.status_code == 400
+    assert resp.json()["detail"]["error_code"] == "INVALID_INPUT"
+
+
+def test_compacted_tombstones_expire_old_tokens(client):
+    """Tokens from before compacted tombstones must sync from scratch."""
+    kept = client.post("/tasks/", json={"title": "Kept"}).json()["id"]
+    doomed = client.post("/tasks/", json={"title": "Doomed"}).json()["id"]
+    old_token = _sync(client)["token"]
+    client.delete(f"/tasks/{doomed}")
+    connection.execute(
+        text("UPDATE task_tombstone SET deleted_at = '2000-01-01 00:00:00.000000'")
+    )
+    assert compact_tombstones(connection, retention_days=30) == 1
+    connection.commit()
+    assert compact_tombstones(connection, retention_days=30) == 0
+
+    resp = client.get("/tasks/changes", params={"since": old_token})
+    assert resp.status_code == 410
+    assert resp.json()["detail"]["error_code"] == "SYNC_TOKEN_EXPIRED"
+    full = _sync(client)
+    assert [task["id"] for task in full["items"]] == [kept]
+    assert _sync(client, full["token"])["items"] == []
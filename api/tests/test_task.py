@@ -161,6 +161,22 @@ def test_high_priority_task_limit(client):
     assert "high priority tasks" in response.text
 
 
+def test_high_priority_task_limit_is_per_list(client):
+    """Each task list has its own high priority limit."""
+    max_high = int(os.getenv("MAX_HIGH_PRIORITY_TASK", "5"))
+    high = {"priority": Priority.HIGH.value}
+    for i in range(max_high):
+        response = client.post("/tasks/", json={"title": f"Home {i}", **high})
+        assert response.status_code == 201
+        assert response.json()["list_id"] == "default"
+    response = client.post("/tasks/", json={"title": "Work", "list_id": "work", **high})
+    assert response.status_code == 201
+    assert response.json()["list_id"] == "work"
+    listed = client.get("/tasks/", params={"list_id": "work"}).json()
+    assert [task["title"] for task in listed["items"]] == ["Work"]
+    assert listed["total"] == 1
+
+
 def test_task_pagination_and_sorting(client):
     """Test pagination and sorting of tasks."""
     # Clean up all tasks first
@@ -311,3 +327,23 @@ def test_invalid_limit_parameters(client):
     response = client.get("/tasks/?limit=abc")
     assert response.status_code == 422
     assert "limit" in response.text.lower()
+
+
+def test_list_items_match_single_task_payload(client):
+    """List items (fast serialization path) are identical to the single task payload."""
+    client.post(
+        "/tasks/",
+        json={
+            "title": "Full",
+            "description": "With every field",
+            "priority": Priority.MID.value,
+            "deadline": "2030-01-01T12:30:00Z",
+        },
+    )
+    client.post("/tasks/", json={"title": "Minimal"})
+    response = client.get("/tasks/")
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == 2
+    for item in items:
+        assert item == client.get(f"/tasks/{item['id']}").json()
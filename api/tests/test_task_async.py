@@ -0,0 +1,73 @@
+"""Tests for the async (aiosqlite) database path of the Spirited Todo List API."""
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from crud import task_async
+from crud.task import MAX_HIGH_PRIORITY_TASK
+from models.task import Priority
+from schemas.task import TaskBulkUpdate, TaskCreate, TaskUpdate
+
+
+async def _with_session(scenario):
+    """Run scenario(session) with an AsyncSession on a fresh in-memory aiosqlite DB."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            await scenario(session)
+    finally:
+        await engine.dispose()
+
+
+def test_async_crud_round_trip():
+    """Create, read, list, update and delete a task on the async path."""
+
+    async def scenario(session):
+        task = await task_async.create_task(session, TaskCreate(title="Async"))
+        assert (await task_async.get_task(session, task.id)).title == "Async"
+        items, total, _ = await task_async.get_tasks(session, limit=10)
+        assert [item.id for item in items] == [task.id]
+        assert total is not None
+        updated = await task_async.update_task(
+            session, task.id, TaskUpdate(priority=Priority.MID)
+        )
+        assert updated.priority == Priority.MID
+        assert await task_async.delete_task(session, task.id)
+        assert await task_async.get_task(session, task.id) is None
+
+    asyncio.run(_with_session(scenario))
+
+
+def test_async_high_priority_limit():
+    """The high priority limit is enforced on the async path, including bulk writes."""
+
+    async def scenario(session):
+        tasks, errors = await task_async.create_tasks(
+            session,
+            [
+                TaskCreate(title=f"High {i}", priority=Priority.HIGH)
+                for i in range(MAX_HIGH_PRIORITY_TASK)
+            ],
+        )
+        assert len(tasks) == MAX_HIGH_PRIORITY_TASK and not errors
+        first_id = tasks[0].id
+        with pytest.raises(ValueError):
+            await task_async.create_task(
+                session, TaskCreate(title="Too many", priority=Priority.HIGH)
+            )
+        low = await task_async.create_task(session, TaskCreate(title="Low"))
+        _, errors = await task_async.update_tasks(
+            session, [TaskBulkUpdate(id=low.id, priority=Priority.HIGH)]
+        )
+        assert len(errors) == 1
+        deleted, _ = await task_async.delete_tasks(session, [first_id])
+        assert deleted == [first_id]
+
+    asyncio.run(_with_session(scenario))
@@ -0,0 +1,107 @@
+"""Tests for the single task read cache of the Spirited Todo List API."""
+
+import json
+
+from crud.cache import LRUCache, get_cache_backend, set_cache_backend
+
+
+def test_read_task_is_cached(client, count_queries):
+    """The second read of a task is served from the cache, without a query."""
+    task = client.post("/tasks/", json={"title": "Cached"}).json()
+    with count_queries() as statements:
+        first = client.get(f"/tasks/{task['id']}")
+    assert first.json() == task
+    assert len(statements) == 1
+    with count_queries() as statements:
+        second = client.get(f"/tasks/{task['id']}")
+    assert second.json() == task
+    assert second.headers["ETag"] == first.headers["ETag"]
+    assert not statements
+
+
+def test_update_and_delete_invalidate(client):
+    """Updates, bulk updates and deletes drop the cached task."""
+    task_id = client.post("/tasks/", json={"title": "Task"}).json()["id"]
+    client.get(f"/tasks/{task_id}")
+    client.patch(f"/tasks/{task_id}", json={"title": "Renamed"})
+    assert client.get(f"/tasks/{task_id}").json()["title"] == "Renamed"
+    client.patch("/tasks/bulk", json=[{"id": task_id, "title": "Bulk"}])
+    assert client.get(f"/tasks/{task_id}").json()["title"] == "Bulk"
+    client.delete(f"/tasks/{task_id}")
+    assert client.get(f"/tasks/{task_id}").status_code == 404
+
+
+def test_cache_stats(client):
+    """GET /tasks/cache reports the hits and misses of the reads."""
+    task_id = client.post("/tasks/", json={"title": "Task"}).json()["id"]
+    before = client.get("/tasks/cache").json()
+    client.get(f"/tasks/{task_id}")
+    client.get(f"/tasks/{task_id}")
+    after = client.get("/tasks/cache").json()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+    assert after["size"] == 1
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """Past max_size the least recently used entry is evicted and counted."""
+    cache = LRUCache(max_size=2, ttl=60)
+    cache.set(1, {"id": 1})
+    cache.set(2, {"id": 2})
+    assert cache.get(1) == {"id": 1}
+    cache.set(3, {"id": 3})
+    assert cache.get(2) is None
+    assert cache.get(1) == {"id": 1}
+    assert cache.get(3) == {"id": 3}
+    assert cache.stats() == (3, 1, 1, 2)
+
+
+def test_lru_cache_expires_entries():
+    """Entries older than the TTL are misses."""
+    cache = LRUCache(max_size=2, ttl=0)
+    cache.set(1, {"id": 1})
+    assert cache.get(1) is None
+    assert cache.stats().size == 0
+
+
+def test_cache_backend_is_pluggable(client):
+    """Reads go through the installed backend."""
+    previous = get_cache_backend()
+    backend = LRUCache(max_size=10, ttl=60)
+    set_cache_backend(backend)
+    try:
+        task_id = client.post("/tasks/", json={"title": "Task"}).json()["id"]
+        client.get(f"/tasks/{task_id}")
+        assert backend.get(task_id)["title"] == "Task"
+    finally:
+        set_cache_backend(previous)
+
+
+class JSONCache(LRUCache):
+    """Backend storing payloads as JSON, like a shared cache (e.g. Redis) would."""
+
+    def set(self, task_id, payload):
+        super().set(task_id, json.dumps(payload))
+
+    def get(self, task_id):
+        payload = super().get(task_id)
+        return None if payload is None else json.loads(payload)
+
+
+def test_cache_backend_may_store_json(client):
+    """Payloads round-trip through JSON, and are then served like uncached reads."""
+    previous = get_cache_backend()
+    set_cache_backend(JSONCache(max_size=10, ttl=60))
+    try:
+        payload = {"title": "Task", "priority": 3, "deadline": "2030-01-02T03:04:05"}
+        task_id = client.post("/tasks/", json=payload).json()["id"]
+        uncached = client.get(f"/tasks/{task_id}")
+        cached = client.get(f"/tasks/{task_id}")
+        assert get_cache_backend().stats().hits == 1
+        assert cached.status_code == 200
+        assert cached.json() == uncached.json()
+        assert cached.headers["etag"] == uncached.headers["etag"]
+        etag = {"If-None-Match": cached.headers["etag"]}
+        assert client.get(f"/tasks/{task_id}", headers=etag).status_code == 304
+    finally:
+        set_cache_backend(previous)
@@ -0,0 +1,48 @@
+"""Tests for the cached total count of the task list in the Spirited Todo List API."""
+
+from crud.task import MAX_HIGH_PRIORITY_TASK
+from models.task import Priority
+
+
+def _counts(statements: list[str]) -> list[str]:
+    """Keep the count(*) statements of the recorded ones."""
+    return [statement for statement in statements if "count(*)" in statement]
+
+
+def test_total_is_counted_once_then_maintained(client, count_queries):
+    """The total is counted by the first list call only, then follows creates and deletes."""
+    for i in range(3):
+        client.post("/tasks/", json={"title": f"Task {i}"})
+    with count_queries() as statements:
+        assert client.get("/tasks/").json()["total"] == 3
+        assert client.get("/tasks/").json()["total"] == 3
+        task_id = client.post("/tasks/", json={"title": "New"}).json()["id"]
+        assert client.get("/tasks/").json()["total"] == 4
+        client.delete(f"/tasks/{task_id}")
+        client.patch(f"/tasks/{task_id - 1}", json={"title": "Renamed"})
+        assert client.get("/tasks/").json()["total"] == 3
+    assert len(_counts(statements)) == 1
+
+
+def test_total_ignores_rolled_back_writes(client):
+    """A create rolled back by the high priority limit does not change the total."""
+    for i in range(MAX_HIGH_PRIORITY_TASK):
+        client.post(
+            "/tasks/", json={"title": f"High {i}", "priority": Priority.HIGH.value}
+        )
+    assert client.get("/tasks/").json()["total"] == MAX_HIGH_PRIORITY_TASK
+    resp = client.post(
+        "/tasks/", json={"title": "Too many", "priority": Priority.HIGH.value}
+    )
+    assert resp.status_code == 400
+    assert client.get("/tasks/").json()["total"] == MAX_HIGH_PRIORITY_TASK
+
+
+def test_include_total_false_skips_count(client, count_queries):
+    """include_total=false returns no total and runs no count query."""
+    client.post("/tasks/", json={"title": "Task"})
+    with count_queries() as statements:
+        data = client.get("/tasks/?include_total=false").json()
+    assert data["total"] is None
+    assert len(data["items"]) == 1
+    assert not _counts(statements)
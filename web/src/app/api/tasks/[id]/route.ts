@@ -2,15 +2,23 @@ import { NextRequest, NextResponse } from "next/server";
 
 import { API_BASE } from "@/constants/api";
 import { ErrorCode } from "@/constants/error";
-import { extractError } from "@/utils/helper";
+import {
+  cacheHeaders,
+  conditionalHeaders,
+  extractError,
+  notModified,
+} from "@/utils/helper";
 
 export async function GET(
-  _req: NextRequest,
+  req: NextRequest,
   { params }: { params: { id: string } },
 ) {
   const url = `${API_BASE}/tasks/${params.id}`;
   try {
-    const res = await fetch(url);
+    const res = await fetch(url, { headers: conditionalHeaders(req) });
+    if (res.status === 304) {
+      return notModified(res);
+    }
     if (!res.ok) {
       return NextResponse.json(
         await extractError(res, "Failed to fetch task"),
@@ -18,7 +26,7 @@ export async function GET(
       );
     }
     const data = await res.json();
-    return NextResponse.json(data);
+    return NextResponse.json(data, { headers: cacheHeaders(res) });
   } catch {
     return NextResponse.json(
       {
@@ -2,17 +2,27 @@ import { NextRequest, NextResponse } from "next/server";
 
 import { API_BASE } from "@/constants/api";
 import { ErrorCode } from "@/constants/error";
-import { extractError } from "@/utils/helper";
+import {
+  cacheHeaders,
+  conditionalHeaders,
+  extractError,
+  notModified,
+} from "@/utils/helper";
 
 // Use Docker service name for internal calls, or env for prod
 
 export async function GET(req: NextRequest) {
   const url = new URL("/tasks", API_BASE);
   req.nextUrl.searchParams.forEach((value, key) => {
-    url.searchParams.set(key, value);
+    url.searchParams.append(key, value);
   });
   try {
-    const res = await fetch(url.toString());
+    const res = await fetch(url.toString(), {
+      headers: conditionalHeaders(req),
+    });
+    if (res.status === 304) {
+      return notModified(res);
+    }
     if (!res.ok) {
       return NextResponse.json(
         await extractError(res, "Failed to fetch tasks"),
@@ -20,7 +30,7 @@ export async function GET(req: NextRequest) {
       );
     }
     const data = await res.json();
-    return NextResponse.json(data);
+    return NextResponse.json(data, { headers: cacheHeaders(res) });
   } catch {
     return NextResponse.json(
       {
@@ -39,6 +39,7 @@ export interface TaskListParams {
   offset?: number;
   sort_by?: TaskSortBy;
   sort_order?: "asc" | "desc";
+  cursor?: string;
 }
 
 export interface TaskListResponse {
@@ -46,4 +47,5 @@ export interface TaskListResponse {
   total: number;
   page: number;
   page_size: number;
+  next_cursor?: string | null;
 }
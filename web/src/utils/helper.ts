@@ -1,3 +1,5 @@
+import { NextResponse } from "next/server";
+
 import { ErrorCode } from "@/constants/error";
 
 // Helper to extract error from FastAPI response
@@ -33,3 +35,23 @@ export async function extractError(res: Response, fallbackMsg: string) {
     return { error: { msg: fallbackMsg, error_code: ErrorCode.INVALID_INPUT } };
   }
 }
+
+// Forward the browser's If-None-Match to the API so unchanged data gets a 304
+export function conditionalHeaders(req: Request): HeadersInit {
+  const ifNoneMatch = req.headers.get("if-none-match");
+  return ifNoneMatch ? { "If-None-Match": ifNoneMatch } : {};
+}
+
+// Pass the API validators through so the browser can revalidate next time
+export function cacheHeaders(res: Response): HeadersInit {
+  const headers: Record<string, string> = {};
+  const etag = res.headers.get("etag");
+  const cacheControl = res.headers.get("cache-control");
+  if (etag) headers.ETag = etag;
+  if (cacheControl) headers["Cache-Control"] = cacheControl;
+  return headers;
+}
+
+export function notModified(res: Response) {
+  return new NextResponse(null, { status: 304, headers: cacheHeaders(res) });
+}